@@ -1,46 +1,152 @@
 """
-FastAPI endpoints: predict-difficulty, generate-roadmap, update-market-trends.
+FastAPI endpoints: predict-difficulty (single and batch), generate-roadmap, personalized-roadmap,
+update-market-trends, market-trends/related-skills, market-trends/history and learning-paths.
 Structured JSON responses with error handling.
+
+Service modules are imported on first use (inside the get_* dependencies), so
+importing the app does not pull in numpy/torch and deployments that only use
+some subsystems never pay for the others.
 """
 
-from typing import Any
+import asyncio
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Any
+
+from fastapi import APIRouter, Body, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, ValidationError
 
-from fastapi import APIRouter, Body, HTTPException, Depends
-from pydantic import BaseModel, Field
+from config import get_settings
 
-from services.personalization_service import PersonalizationService
-from services.roadmap_service import RoadmapService
-from services.job_market_service import JobMarketService
+if TYPE_CHECKING:
+    from services.job_market_service import JobMarketService
+    from services.learning_path_search import LearningPathSearchIndex
+    from services.learning_paths import LearningPathCatalog
+    from services.personalization_service import PersonalizationService
+    from services.response_cache import EncodedResponse
+    from services.roadmap_service import RoadmapService
 
 router = APIRouter(tags=["personalization"])
 
 # Singleton-style service instances (in production use dependency injection with lifespan)
-_personalization: PersonalizationService | None = None
-_roadmap_service: RoadmapService | None = None
-_job_market_service: JobMarketService | None = None
+_personalization: "PersonalizationService | None" = None
+_roadmap_service: "RoadmapService | None" = None
+_job_market_service: "JobMarketService | None" = None
+_learning_path_catalog: "LearningPathCatalog | None" = None
+_learning_path_search: "LearningPathSearchIndex | None" = None
 
 
-def get_personalization() -> PersonalizationService:
+def get_personalization() -> "PersonalizationService":
     global _personalization
     if _personalization is None:
+        from services.personalization_service import PersonalizationService
+
         _personalization = PersonalizationService()
     return _personalization
 
 
-def get_roadmap_service() -> RoadmapService:
+def peek_personalization() -> "PersonalizationService | None":
+    """Return the personalization service only if something already created it."""
+    return _personalization
+
+
+def get_roadmap_service() -> "RoadmapService":
     global _roadmap_service
     if _roadmap_service is None:
+        from services.roadmap_service import RoadmapService
+
         _roadmap_service = RoadmapService()
     return _roadmap_service
 
 
-def get_job_market_service() -> JobMarketService:
+def get_job_market_service() -> "JobMarketService":
     global _job_market_service
     if _job_market_service is None:
+        from services.job_market_service import JobMarketService
+
         _job_market_service = JobMarketService()
     return _job_market_service
 
 
+def get_learning_path_catalog() -> "LearningPathCatalog":
+    global _learning_path_catalog
+    if _learning_path_catalog is None:
+        from services.learning_paths import LearningPathCatalog
+
+        _learning_path_catalog = LearningPathCatalog.from_file()
+    return _learning_path_catalog
+
+
+def get_learning_path_search() -> "LearningPathSearchIndex":
+    global _learning_path_search
+    if _learning_path_search is None:
+        from services.learning_path_search import load_or_build
+
+        _learning_path_search = load_or_build(
+            get_learning_path_catalog(),
+            get_settings().learning_paths_search_index_path,
+        )
+    return _learning_path_search
+
+
+def close_services() -> None:
+    """Release background resources held by the service singletons (called on shutdown)."""
+    if _personalization is not None:
+        _personalization.close()
+
+
+def reset_after_fork() -> None:
+    """Re-initialize per-process state of preloaded service singletons in a forked worker."""
+    if _personalization is not None:
+        _personalization.after_fork()
+    if _roadmap_service is not None:
+        _roadmap_service.after_fork()
+    if _job_market_service is not None:
+        _job_market_service.after_fork()
+    if _learning_path_catalog is not None:
+        _learning_path_catalog.after_fork()
+
+
+def encoded_json_response(
+    encoded: "EncodedResponse",
+    if_none_match: str | None = None,
+    accept_encoding: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Send a pre-encoded JSON body: 304 if If-None-Match names it, otherwise the
+    best precompressed variant the client accepts, with its strong ETag.
+    """
+    headers = dict(headers or {})
+    body, etag, coding = encoded.body, encoded.etag, None
+    negotiate = getattr(encoded, "negotiate", None)
+    if negotiate is not None:
+        coding, body, etag = negotiate(accept_encoding)
+        headers["Vary"] = "Accept-Encoding"
+    headers["ETag"] = etag
+    headers["Cache-Control"] = "no-cache"
+    if encoded.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _timed(timings: dict[str, float], stage: str, fn: Any, *args: Any, **kwargs: Any) -> Any:
+    """Call fn and record its wall time in milliseconds under timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[stage] = (time.perf_counter() - start) * 1000
+
+
+def server_timing(timings: dict[str, float]) -> str:
+    """Server-Timing header value for stage -> milliseconds."""
+    return ", ".join(f"{stage};dur={ms:.3f}" for stage, ms in timings.items())
+
+
 # --- Request/Response schemas ---
 
 
@@ -54,19 +160,49 @@ class PredictDifficultyRequest(BaseModel):
     experience_level: int = Field(..., ge=0, le=2, description="0=beginner, 1=intermediate, 2=advanced")
 
 
+class PredictDifficultyBatchRequest(BaseModel):
+    """Batch of metric rows; each item is validated individually like PredictDifficultyRequest."""
+
+    items: list[dict[str, Any]] = Field(..., min_length=1, description="Metric rows to score")
+
+
 class GenerateRoadmapRequest(BaseModel):
     """Input for generating a roadmap config."""
 
     roadmap_difficulty: int = Field(..., ge=0, le=2)
     topic: str | None = Field(default=None, description="Optional topic/career path")
     include_market_skills: bool = Field(default=False, description="Include job market skill priority")
+    step_order: str = Field(
+        default="catalog",
+        pattern="^(catalog|market)$",
+        description="With include_market_skills and a catalog topic: list roadmap_steps in catalog "
+        "order or sorted by market demand",
+    )
+
+
+class PersonalizedRoadmapRequest(PredictDifficultyRequest):
+    """User metrics plus the roadmap topic: prediction and market-driven roadmap in one call."""
+
+    topic: str | None = Field(default=None, description="Optional topic/career path")
+    step_order: str = Field(
+        default="catalog",
+        pattern="^(catalog|market)$",
+        description="For a catalog topic: list roadmap_steps in catalog order or sorted by market demand",
+    )
 
 
 class UpdateMarketTrendsRequest(BaseModel):
     """Optional parameters for market trends refresh."""
 
-    job_listings_limit: int = Field(default=200, ge=1, le=1000)
+    job_listings_limit: int = Field(
+        default=200,
+        ge=1,
+        le=1000,
+        description="Deprecated: skill demand is read from the market snapshot "
+        "(size set by market_snapshot_listings)",
+    )
     top_skills: int = Field(default=30, ge=1, le=100)
+    topic: str | None = Field(default=None, description="Rank within this learning path topic's listings")
 
 
 # --- Endpoints ---
@@ -81,9 +217,9 @@ class UpdateMarketTrendsRequest(BaseModel):
 )
 def predict_difficulty(
     body: PredictDifficultyRequest,
-    svc: PersonalizationService = Depends(get_personalization),
+    svc: "PersonalizationService" = Depends(get_personalization),
 ) -> dict[str, Any]:
-    """Predict roadmap difficulty using the PyTorch personalization model."""
+    """Predict roadmap difficulty using the personalization model (torch or NumPy backend)."""
     try:
         result = svc.predict(
             engagement=body.engagement,
@@ -105,55 +241,406 @@ def predict_difficulty(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/predict-difficulty/batch",
+    name="predict_difficulty_batch",
+    response_model=dict,
+    summary="Predict roadmap difficulty for many users",
+    description="Scores up to predict_batch_max_size metric rows in one forward pass. "
+    "Results are returned in input order; invalid rows carry their validation errors.",
+)
+def predict_difficulty_batch(
+    body: PredictDifficultyBatchRequest,
+    svc: "PersonalizationService" = Depends(get_personalization),
+) -> dict[str, Any]:
+    """Validate each row, then predict difficulty for all valid rows at once."""
+    max_size = get_settings().predict_batch_max_size
+    if len(body.items) > max_size:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch too large: {len(body.items)} items (max {max_size})",
+        )
+
+    results: list[dict[str, Any] | None] = [None] * len(body.items)
+    valid_indices: list[int] = []
+    rows: list[list[float]] = []
+    for i, item in enumerate(body.items):
+        try:
+            row = PredictDifficultyRequest.model_validate(item)
+        except ValidationError as e:
+            results[i] = {
+                "index": i,
+                "success": False,
+                "errors": e.errors(include_url=False, include_context=False),
+            }
+            continue
+        valid_indices.append(i)
+        rows.append([
+            row.engagement,
+            row.velocity,
+            row.mastery,
+            row.credibility,
+            float(row.experience_level),
+        ])
+
+    try:
+        predictions = svc.predict_batch(rows) if rows else []
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    for i, result in zip(valid_indices, predictions):
+        results[i] = {
+            "index": i,
+            "success": True,
+            "roadmap_difficulty": result["roadmap_difficulty"],
+            "difficulty": result["difficulty"],
+            "label": result["label"],
+            "probabilities": result["probabilities"],
+        }
+    return {
+        "success": True,
+        "results": results,
+        "count": len(results),
+        "failed": len(results) - len(valid_indices),
+    }
+
+
+@router.get(
+    "/predict-difficulty/stats",
+    name="predict_difficulty_stats",
+    response_model=dict,
+    summary="Inference statistics",
+    description="Micro-batching batch-size distribution and queue-wait latency for tuning.",
+)
+def predict_difficulty_stats(
+    svc: "PersonalizationService" = Depends(get_personalization),
+) -> dict[str, Any]:
+    """Return inference scheduler statistics."""
+    return {"success": True, **svc.inference_stats()}
+
+
 @router.post(
     "/generate-roadmap",
     response_model=dict,
     summary="Generate roadmap config",
-    description="Returns roadmap config JSON (quiz frequency, project complexity, peer review weight, optional skill priority).",
+    description="Returns roadmap config JSON (quiz frequency, project complexity, peer review weight, optional skill priority). "
+    "Responses carry a strong ETag; send it back in If-None-Match to get 304 Not Modified while the "
+    "difficulty, topic and market snapshot are unchanged.",
+    responses={304: {"description": "Not modified (If-None-Match matched the current ETag)"}},
 )
 def generate_roadmap(
     body: GenerateRoadmapRequest,
-    roadmap_svc: RoadmapService = Depends(get_roadmap_service),
-    job_svc: JobMarketService = Depends(get_job_market_service),
-) -> dict[str, Any]:
+    if_none_match: str | None = Header(default=None),
+    roadmap_svc: "RoadmapService" = Depends(get_roadmap_service),
+    job_svc: "JobMarketService" = Depends(get_job_market_service),
+) -> Response:
     """Generate roadmap configuration from difficulty and optionally market trends."""
     try:
+        headers: dict[str, str] = {}
         if body.include_market_skills:
-            config = job_svc.update_roadmap_based_on_market(
-                roadmap_difficulty=body.roadmap_difficulty,
-                topic=body.topic,
-                top_skills=25,
+            snapshot = job_svc.snapshot
+
+            def build() -> dict[str, Any]:
+                config = job_svc.update_roadmap_based_on_market(
+                    roadmap_difficulty=body.roadmap_difficulty,
+                    topic=body.topic,
+                    top_skills=25,
+                    snapshot=snapshot,
+                    step_order=body.step_order,
+                )
+                return {
+                    "success": True,
+                    "roadmap_config": config,
+                    "market_snapshot": snapshot.metadata(include_age=False),
+                }
+
+            encoded = roadmap_svc.encoded_response(
+                ("market", body.roadmap_difficulty, body.topic, body.step_order),
+                build,
+                snapshot_version=snapshot.version,
             )
+            # The age changes on every request, so it is a header rather than part of the cached body
+            headers["X-Market-Snapshot-Age"] = f"{snapshot.age_seconds():.3f}"
         else:
-            config = roadmap_svc.generate_roadmap_config(
-                roadmap_difficulty=body.roadmap_difficulty,
-                skill_priority_override=None,
-                topic=body.topic,
+            encoded = roadmap_svc.encoded_response(
+                ("static", body.roadmap_difficulty, body.topic),
+                lambda: {
+                    "success": True,
+                    "roadmap_config": roadmap_svc.generate_roadmap_config(
+                        roadmap_difficulty=body.roadmap_difficulty,
+                        skill_priority_override=None,
+                        topic=body.topic,
+                    ),
+                },
             )
-        return {"success": True, "roadmap_config": config}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if encoded.matches(if_none_match):
+        roadmap_svc.record_not_modified()
+    return encoded_json_response(encoded, if_none_match, headers=headers)
+
+
+@router.get(
+    "/generate-roadmap/stats",
+    response_model=dict,
+    summary="Roadmap response cache statistics",
+    description="Hits, misses, 304s and invalidations of the encoded /generate-roadmap response cache.",
+)
+def generate_roadmap_stats(
+    roadmap_svc: "RoadmapService" = Depends(get_roadmap_service),
+) -> dict[str, Any]:
+    """Return roadmap response cache statistics."""
+    return {"success": True, "cache": roadmap_svc.cache_stats()}
+
+
+@router.post(
+    "/personalized-roadmap",
+    response_model=dict,
+    summary="Predict difficulty and generate the market-driven roadmap",
+    description="One call for /predict-difficulty followed by /generate-roadmap with market skills: "
+    "the model prediction and the market snapshot/topic lookup run concurrently, then the roadmap "
+    "config is built for the predicted difficulty. Per-stage durations are in the Server-Timing header.",
+)
+async def personalized_roadmap(
+    body: PersonalizedRoadmapRequest,
+    svc: "PersonalizationService" = Depends(get_personalization),
+    job_svc: "JobMarketService" = Depends(get_job_market_service),
+) -> Response:
+    """Predict difficulty and build the market-driven roadmap config for it."""
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+
+    def market() -> tuple[Any, dict[str, Any]]:
+        snapshot = job_svc.snapshot
+        return snapshot, job_svc.market_roadmap_fields(
+            topic=body.topic,
+            top_skills=25,
+            snapshot=snapshot,
+            step_order=body.step_order,
+        )
+
+    try:
+        result, (snapshot, fields) = await asyncio.gather(
+            asyncio.to_thread(
+                _timed,
+                timings,
+                "predict",
+                svc.predict,
+                engagement=body.engagement,
+                velocity=body.velocity,
+                mastery=body.mastery,
+                credibility=body.credibility,
+                experience_level=body.experience_level,
+            ),
+            asyncio.to_thread(_timed, timings, "market", market),
+        )
+        config = _timed(
+            timings,
+            "config",
+            job_svc.apply_market_fields,
+            result["roadmap_difficulty"],
+            fields,
+            topic=body.topic,
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    timings["total"] = (time.perf_counter() - start) * 1000
+    return JSONResponse(
+        {
+            "success": True,
+            "prediction": {
+                "roadmap_difficulty": result["roadmap_difficulty"],
+                "difficulty": result["difficulty"],
+                "label": result["label"],
+                "probabilities": result["probabilities"],
+            },
+            "roadmap_config": config,
+            "market_snapshot": snapshot.metadata(include_age=False),
+        },
+        headers={
+            "Server-Timing": server_timing(timings),
+            "X-Market-Snapshot-Age": f"{snapshot.age_seconds():.3f}",
+        },
+    )
 
 
 @router.post(
     "/update-market-trends",
     response_model=dict,
     summary="Update market trends",
-    description="Fetches job listing data (simulated), ranks skills by demand, returns trend data.",
+    description="Returns skills ranked by demand from the latest market snapshot "
+    "(refreshed in the background), with the snapshot version and age.",
 )
 def update_market_trends(
     body: UpdateMarketTrendsRequest | None = Body(default=None),
-    job_svc: JobMarketService = Depends(get_job_market_service),
+    job_svc: "JobMarketService" = Depends(get_job_market_service),
 ) -> dict[str, Any]:
-    """Refresh skill demand from job market and return ranked skills."""
+    """Return ranked skills from the current market snapshot."""
     try:
-        limit = body.job_listings_limit if body is not None else 200
         top = body.top_skills if body is not None else 30
-        ranking = job_svc.get_skill_demand_ranking(limit=limit, top_skills=top)
+        snapshot = job_svc.snapshot
+        topic = job_svc.market_topic(body.topic if body is not None else None, snapshot)
+        ranking = snapshot.top(top, topic=topic)
         return {
             "success": True,
             "skill_demand": ranking,
             "count": len(ranking),
+            "topic": topic,
+            **snapshot.metadata(),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/market-trends/related-skills",
+    response_model=dict,
+    summary="Related skills",
+    description="Skills that most often appear in the same job listings as the given skill "
+    "(from the current market snapshot's co-occurrence matrix).",
+)
+def related_skills(
+    skill: str = Query(..., min_length=1, description="Skill name or alias, e.g. 'python' or 'k8s'"),
+    limit: int = Query(default=10, ge=1, le=100),
+    measure: str = Query(default="jaccard", pattern="^(count|conditional|jaccard|lift)$"),
+    job_svc: "JobMarketService" = Depends(get_job_market_service),
+) -> dict[str, Any]:
+    """Return the top co-occurring skills for one skill."""
+    try:
+        snapshot = job_svc.snapshot
+        related = job_svc.get_related_skills(skill, top_n=limit, measure=measure, snapshot=snapshot)
+        return {
+            "success": True,
+            "skill": skill,
+            "measure": measure,
+            "related": related,
+            "count": len(related),
+            **snapshot.metadata(),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/market-trends/history",
+    response_model=dict,
+    summary="Skill demand history",
+    description="Daily count of job listings requiring a skill over a date range, with its "
+    "moving average, growth over the last window and momentum (from the current market snapshot).",
+)
+def skill_history(
+    skill: str = Query(..., min_length=1, description="Skill name or alias, e.g. 'kubernetes' or 'k8s'"),
+    days: int = Query(default=90, ge=1, le=3650, description="Days in the range"),
+    window: int = Query(default=7, ge=1, le=365, description="Moving-average and growth window in days"),
+    end: date | None = Query(default=None, description="Last day of the range (default: today)"),
+    job_svc: "JobMarketService" = Depends(get_job_market_service),
+) -> dict[str, Any]:
+    """Return the daily demand series and trend statistics for one skill."""
+    try:
+        snapshot = job_svc.snapshot
+        history = job_svc.get_skill_history(skill, days=days, window=window, end=end, snapshot=snapshot)
+        return {
+            "success": True,
+            "days": days,
+            "window": window,
+            **history,
+            **snapshot.metadata(),
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/learning-paths",
+    response_model=dict,
+    summary="Learning path topics",
+    description="Every learning path topic with its step and resource counts and step titles. "
+    "Served precompressed (gzip/br) with a strong ETag.",
+    responses={304: {"description": "Not modified (If-None-Match matched the current ETag)"}},
+)
+def list_learning_paths(
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+) -> Response:
+    """Return the learning path topic index."""
+    try:
+        catalog = get_learning_path_catalog()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return encoded_json_response(catalog.index_response(), if_none_match, accept_encoding)
+
+
+@router.get(
+    "/learning-paths/search",
+    response_model=dict,
+    summary="Search learning paths",
+    description="BM25-ranked roadmap steps matching a query over step titles, descriptions and resource "
+    "titles; the last word also matches as a prefix. Optionally limited to one topic.",
+)
+def search_learning_paths(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text, e.g. 'docker compose'"),
+    topic: str | None = Query(default=None, description="Only search this topic's steps"),
+    limit: int = Query(default=10, ge=1, le=100),
+    prefix: bool = Query(default=True, description="Match the last word as a prefix"),
+) -> dict[str, Any]:
+    """Return the best matching learning path steps."""
+    try:
+        index = get_learning_path_search()
+        name = get_learning_path_catalog().resolve(topic) if topic else None
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if topic and name is None:
+        raise HTTPException(status_code=404, detail=f"Unknown learning path topic: {topic}")
+    try:
+        results = index.search(q, topic=name, limit=limit, prefix=prefix)
+        return {"success": True, "query": q, "topic": name, "results": results, "count": len(results)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/learning-paths/{topic:path}",
+    response_model=dict,
+    summary="Learning path steps",
+    description="Roadmap steps (with resources) of one topic, optionally only steps start..end (1-based, inclusive). "
+    "Topic names may contain \"/\" (e.g. UI/UX Design). Served precompressed (gzip/br) with a strong ETag.",
+    responses={
+        304: {"description": "Not modified (If-None-Match matched the current ETag)"},
+        404: {"description": "Unknown topic"},
+        416: {"description": "start is past the topic's last step"},
+    },
+)
+def get_learning_path(
+    topic: str,
+    start: int = Query(default=1, ge=1, description="First step (1-based)"),
+    end: int | None = Query(default=None, ge=1, description="Last step, inclusive (default: the last step)"),
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+) -> Response:
+    """Return one topic's roadmap steps."""
+    if end is not None and end < start:
+        raise HTTPException(status_code=422, detail="end must be >= start")
+    from services.learning_paths import StepRangeError
+
+    try:
+        catalog = get_learning_path_catalog()
+        encoded = catalog.topic_response(topic, start=start, end=end)
+    except StepRangeError as e:
+        raise HTTPException(status_code=416, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if encoded is None:
+        raise HTTPException(status_code=404, detail=f"Unknown learning path topic: {topic}")
+    if encoded.matches(if_none_match):
+        catalog.record_not_modified()
+    return encoded_json_response(encoded, if_none_match, accept_encoding)
@@ -0,0 +1 @@
+"""Benchmark scripts for the PathWise backend (run as python benchmarks/<name>.py)."""
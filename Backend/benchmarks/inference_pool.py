@@ -0,0 +1,92 @@
+"""
+Throughput of the inference process pool versus the in-thread inference path.
+
+Several client threads (standing in for FastAPI's threadpool) call
+PersonalizationService.predict_batch concurrently; the script reports rows/sec
+for the in-thread path and for pools of increasing size.
+
+Usage:
+    python benchmarks/inference_pool.py --backend torch --clients 16 --batch 64
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import get_settings
+from services.personalization_service import PersonalizationService
+
+
+def make_service(backend: str, pool_size: int, threads: int) -> PersonalizationService:
+    os.environ["INFERENCE_POOL_SIZE"] = str(pool_size)
+    os.environ["INFERENCE_POOL_THREADS_PER_WORKER"] = str(threads)
+    get_settings.cache_clear()
+    svc = PersonalizationService(backend=backend, cache_size=0)
+    svc.warm_up()
+    return svc
+
+
+def measure(svc: PersonalizationService, clients: int, batch: int, duration_s: float) -> float:
+    """Rows per second with `clients` threads each calling predict_batch for duration_s."""
+    rng = np.random.default_rng(0)
+    x = np.column_stack((
+        rng.uniform(0, 100, size=(batch, 4)),
+        rng.integers(0, 3, size=batch),
+    )).astype(np.float32)
+    deadline = time.perf_counter() + duration_s
+
+    def client() -> int:
+        rows = 0
+        while time.perf_counter() < deadline:
+            svc.predict_batch(x)
+            rows += batch
+        return rows
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as ex:
+        total = sum(ex.map(lambda _: client(), range(clients)))
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark the inference process pool")
+    parser.add_argument("--backend", type=str, default="torch", choices=["torch", "numpy", "compiled"])
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client threads")
+    parser.add_argument("--batch", type=int, default=64, help="Rows per predict_batch call")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per configuration")
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument(
+        "--pool-sizes",
+        type=str,
+        default=",".join(str(n) for n in sorted({1, 2, 4, cores}) if n <= cores),
+        help="Comma-separated worker counts to test",
+    )
+    args = parser.parse_args()
+
+    print(f"backend={args.backend} clients={args.clients} batch={args.batch} cores={cores}")
+    svc = make_service(args.backend, 0, args.threads_per_worker)
+    baseline = measure(svc, args.clients, args.batch, args.duration)
+    svc.close()
+    print(f"{'mode':<16}{'rows/s':>14}{'speedup':>10}")
+    print(f"{'in-thread':<16}{baseline:>14,.0f}{1.0:>9.2f}x")
+
+    for size in (int(s) for s in args.pool_sizes.split(",") if s.strip()):
+        svc = make_service(args.backend, size, args.threads_per_worker)
+        try:
+            tput = measure(svc, args.clients, args.batch, args.duration)
+            blas_threads = svc.inference_stats()["process_pool"]["blas_threads_per_worker"]
+        finally:
+            svc.close()
+        print(f"{f'pool x{size}':<16}{tput:>14,.0f}{tput / baseline:>9.2f}x  (BLAS threads/worker: {blas_threads})")
+
+
+if __name__ == "__main__":
+    main()
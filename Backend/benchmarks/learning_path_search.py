@@ -0,0 +1,79 @@
+"""
+Learning path search benchmark: grows the real catalog to a target number of
+steps (copies of every topic, plus synthetic filler words so the vocabulary
+grows too), builds the BM25 index and reports build time and per-query latency
+percentiles for exact, prefix and topic-filtered queries.
+
+Usage:
+    python benchmarks/learning_path_search.py
+    python benchmarks/learning_path_search.py --steps 50000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.learning_path_search import LearningPathSearchIndex
+from services.learning_paths import LearningPathCatalog, load_learning_paths
+
+QUERIES = ("flexbox", "docker compose", "react hooks", "sql joins", "machine learning", "kubern", "deploy", "c++")
+
+
+def grown_catalog(steps: int, seed: int = 0) -> LearningPathCatalog:
+    rng = random.Random(seed)
+    base = load_learning_paths()
+    base_steps = sum(len(p.get("roadmap") or []) for p in base)
+    paths = []
+    for copy in range(max(1, -(-steps // base_steps))):
+        for path in base:
+            roadmap = [
+                {**step, "description": f"{step.get('description', '')} term{rng.randrange(steps)}"}
+                for step in path.get("roadmap") or []
+            ]
+            paths.append({"topic": f"{path['topic']} {copy}", "roadmap": roadmap})
+    return LearningPathCatalog(paths)
+
+
+def percentiles(samples: list[float]) -> str:
+    p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return f"p50 {p50:7.3f} ms  p95 {p95:7.3f} ms  p99 {p99:7.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark learning path BM25 search")
+    parser.add_argument("--steps", type=int, default=20000, help="Approximate number of indexed steps")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries per scenario")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = grown_catalog(args.steps)
+    print(f"catalog: {len(catalog)} topics in {(time.perf_counter() - start) * 1000:.0f} ms")
+    start = time.perf_counter()
+    index = LearningPathSearchIndex.from_catalog(catalog)
+    print(f"index: {len(index)} steps, {index.vocabulary_size} terms in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    topics = catalog.topics
+    scenarios = {
+        "exact": lambda q: index.search(q, prefix=False),
+        "prefix": lambda q: index.search(q),
+        "topic filter": lambda q: index.search(q, topic=random.choice(topics)),
+    }
+    for name, run in scenarios.items():
+        samples = []
+        for i in range(args.queries):
+            query = QUERIES[i % len(QUERIES)]
+            t = time.perf_counter()
+            run(query)
+            samples.append(time.perf_counter() - t)
+        print(f"{name:<14}{percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
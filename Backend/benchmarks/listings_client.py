@@ -0,0 +1,81 @@
+"""
+Job listings client benchmark against the local stub server
+(benchmarks/stub_listings_server.py): a cold full pull, a warm pull where every
+page revalidates to 304, and a pull after churning part of the feed, streaming
+changed pages into a SkillFrequencyIndex as they arrive.
+
+Usage:
+    python benchmarks/listings_client.py
+    python benchmarks/listings_client.py --listings 50000 --page-size 200 --concurrency 8 --latency-ms 20 --fail-rate 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_listings_server import start_stub_server
+from services.job_listings_client import JobListingsClient
+from services.skill_demand_analyzer import SkillFrequencyIndex, listing_skills, to_timestamp
+
+
+async def pull(client: JobListingsClient, index: SkillFrequencyIndex) -> dict:
+    start = time.perf_counter()
+    pages = changed = listings = 0
+    async for page in client.iter_pages():
+        pages += 1
+        if page.listings is None:
+            continue
+        changed += 1
+        for listing in page.listings:
+            index.add(str(listing["id"]), listing_skills(listing), to_timestamp(listing.get("posted_at")))
+            listings += 1
+    elapsed = time.perf_counter() - start
+    return {"pages": pages, "changed": changed, "listings": listings, "elapsed_s": elapsed}
+
+
+async def run(args: argparse.Namespace) -> None:
+    server, feed, server_stats = start_stub_server(
+        args.listings, latency_ms=args.latency_ms, fail_rate=args.fail_rate
+    )
+    index = SkillFrequencyIndex(decay_days=30)
+    async with JobListingsClient(
+        server.url,
+        page_size=args.page_size,
+        concurrency=args.concurrency,
+        max_retries=5,
+        backoff_s=0.01,
+    ) as client:
+        for label in ("cold", "warm (unchanged)", "after churn"):
+            if label == "after churn":
+                feed.churn(args.churn_fraction)
+                time.sleep(1.1)  # Last-Modified has one-second resolution
+            r = await pull(client, index)
+            print(
+                f"{label:<18} pages {r['pages']:>5}  changed {r['changed']:>5}  listings parsed {r['listings']:>7}  "
+                f"{r['elapsed_s'] * 1000:>8.1f} ms  ({r['pages'] / r['elapsed_s']:.0f} pages/s)"
+            )
+        print("client:", client.stats())
+    print("server:", server_stats)
+    print("indexed listings:", len(index), "top:", index.top_k(3))
+    server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the async job listings client against the stub server")
+    parser.add_argument("--listings", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--fail-rate", type=float, default=0.02)
+    parser.add_argument("--churn-fraction", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Sparse skill matrix benchmark: builds a synthetic listings x skills CSR matrix
+(Zipf-distributed skill popularity) and times demand column sums, decay-weighted
+demand, the co-occurrence matrix X^T X and related-skill queries.
+
+Usage:
+    python benchmarks/skill_matrix.py
+    python benchmarks/skill_matrix.py --listings 1000000 --skills 5000 --skills-per-listing 6
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.skill_matrix import SkillMatrix
+
+
+def synthetic_matrix(n_listings: int, n_skills: int, per_listing: int, seed: int = 0) -> SkillMatrix:
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, n_skills + 1) ** 1.1
+    popularity /= popularity.sum()
+    cols = rng.choice(n_skills, size=(n_listings, per_listing), p=popularity).astype(np.int32)
+    rows = np.repeat(np.arange(n_listings, dtype=np.int64), per_listing)
+    x = sparse.csr_matrix(
+        (np.ones(cols.size, dtype=np.float32), (rows, cols.ravel())),
+        shape=(n_listings, n_skills),
+    )
+    x.data[:] = 1.0  # duplicate picks within a listing were summed; keep the matrix binary
+    now = time.time()
+    posted_at = now - rng.uniform(0, 60 * 86400, size=n_listings)
+    return SkillMatrix(x, [f"skill_{j}" for j in range(n_skills)], posted_at)
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the sparse skill matrix engine")
+    parser.add_argument("--listings", type=int, default=1_000_000)
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--skills-per-listing", type=int, default=6)
+    parser.add_argument("--decay-days", type=float, default=30.0)
+    args = parser.parse_args()
+
+    m = timed("build synthetic CSR", lambda: synthetic_matrix(args.listings, args.skills, args.skills_per_listing))
+    print(f"shape {m.shape}, nnz {m.matrix.nnz}")
+    timed("demand (column sums)", m.demand)
+    timed("decayed demand (X^T w)", lambda: m.demand(decay_days=args.decay_days))
+    timed("top-50 ranking", lambda: m.ranking(50, decay_days=args.decay_days))
+    assoc = timed("co-occurrence X^T X", m.associations)
+    print(f"co-occurrence nnz {assoc.cooccurrence.nnz}")
+    start = time.perf_counter()
+    for j in range(100):
+        assoc.related(f"skill_{j}", top_n=10)
+    print(f"{'related() x100':<40}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    print("related to skill_0:", [r["skill"] for r in assoc.related("skill_0", 5)])
+
+    skill_lists = [[m.vocabulary[j] for j in m.matrix.indices[m.matrix.indptr[i]:m.matrix.indptr[i + 1]]] for i in range(100_000)]
+    timed("from_skill_lists (100k listings)", lambda: SkillMatrix.from_skill_lists(skill_lists))
+
+
+if __name__ == "__main__":
+    main()
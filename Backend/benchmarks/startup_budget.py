@@ -0,0 +1,118 @@
+"""
+Startup-time budget check.
+
+Imports each module in a fresh interpreter with `python -X importtime`, and
+reports the module's cumulative import time, peak RSS, the slowest imports
+underneath it, and whether heavy dependencies (numpy, torch, ...) got pulled in.
+Exits with status 1 if any module exceeds the configured budget
+(Settings.startup_import_budget_ms / startup_rss_budget_mb).
+
+Usage:
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --modules main services.job_market_service --budget-ms 800
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import get_settings
+
+DEFAULT_MODULES = (
+    "main",
+    "api.routes",
+    "services.job_market_service",
+    "services.roadmap_service",
+    "services.personalization_service",
+)
+HEAVY_MODULES = ("numpy", "torch", "scipy", "sklearn", "sqlalchemy")
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{
+    "wall_ms": elapsed * 1000,
+    "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy": heavy,
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse `-X importtime` output into (module, self_us, cumulative_us) tuples."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def measure_module(module: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    cumulative = {name: cum for name, _, cum in rows}
+    result["importtime_ms"] = cumulative.get(module, 0) / 1000
+    result["slowest"] = sorted(rows, key=lambda r: -r[1])[:5]
+    result["rss_mb"] = result["maxrss_kb"] / 1024
+    return result
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Measure import time and RSS against a startup budget")
+    parser.add_argument("--modules", nargs="+", default=list(DEFAULT_MODULES))
+    parser.add_argument("--budget-ms", type=float, default=settings.startup_import_budget_ms)
+    parser.add_argument("--budget-rss-mb", type=float, default=settings.startup_rss_budget_mb)
+    parser.add_argument("--verbose", action="store_true", help="Show the slowest imports per module")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"budget: {args.budget_ms:.0f} ms, {args.budget_rss_mb:.0f} MB RSS")
+    print(f"{'module':<36}{'wall ms':>9}{'import ms':>11}{'RSS MB':>9}  heavy deps")
+    for module in args.modules:
+        r = measure_module(module)
+        over = []
+        if r["wall_ms"] > args.budget_ms:
+            over.append("time")
+        if r["rss_mb"] > args.budget_rss_mb:
+            over.append("rss")
+        flag = f"  OVER BUDGET ({', '.join(over)})" if over else ""
+        print(
+            f"{module:<36}{r['wall_ms']:>9.1f}{r['importtime_ms']:>11.1f}{r['rss_mb']:>9.1f}"
+            f"  {','.join(r['heavy']) or '-'}{flag}"
+        )
+        if args.verbose:
+            for name, self_us, cum_us in r["slowest"]:
+                print(f"    {name:<40} self {self_us / 1000:>7.1f} ms  cumulative {cum_us / 1000:>7.1f} ms")
+        if over:
+            failures.append(module)
+
+    if failures:
+        print(f"FAILED: {', '.join(failures)} exceeded the startup budget")
+        sys.exit(1)
+    print("OK: all modules within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Local stub of a paginated job listings API, for offline tests and benchmarks of
+services/job_listings_client.py.
+
+Serves GET /listings?page=N&per_page=M -> {"listings", "page", "per_page",
+"total", "total_pages"} from a deterministic synthetic feed. Every page has a
+strong ETag and a Last-Modified time and answers 304 to matching conditional
+requests. Optional latency, injected 503s and periodic churn (pages whose
+content changes) exercise the client's concurrency, retries and revalidation.
+
+Usage:
+    python benchmarks/stub_listings_server.py --listings 20000 --port 8765
+    JOB_MARKET_API_URL=http://127.0.0.1:8765/listings uvicorn main:app
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.skill_matcher import SKILL_ALIASES
+
+
+class StubFeed:
+    """Deterministic listings; `churn()` regenerates a fraction of them with new content."""
+
+    def __init__(self, n_listings: int, seed: int = 0) -> None:
+        self._rng = random.Random(seed)
+        self._skills = list(SKILL_ALIASES)
+        self._lock = threading.Lock()
+        self._generation = 0
+        now = datetime.now(timezone.utc)
+        self.listings = [self._make(i, now) for i in range(n_listings)]
+        self.modified_at = [time.time()] * n_listings
+
+    def _make(self, i: int, now: datetime) -> dict:
+        skills = self._rng.sample(self._skills, self._rng.randint(2, 6))
+        return {
+            "id": f"stub_{i}",
+            "title": f"Engineer {i}",
+            "description": f"Looking for experience with {', '.join(skills)}.",
+            "skills": skills,
+            "posted_at": (now - timedelta(days=self._rng.randint(0, 60))).isoformat(),
+            "generation": self._generation,
+        }
+
+    def churn(self, fraction: float) -> int:
+        with self._lock:
+            self._generation += 1
+            now = datetime.now(timezone.utc)
+            changed = self._rng.sample(range(len(self.listings)), int(len(self.listings) * fraction))
+            for i in changed:
+                self.listings[i] = self._make(i, now)
+                self.modified_at[i] = time.time()
+            return len(changed)
+
+    def page(self, page: int, per_page: int) -> tuple[bytes, str, float]:
+        """(body, etag, last_modified epoch) of one page."""
+        with self._lock:
+            start = (page - 1) * per_page
+            items = self.listings[start:start + per_page]
+            modified = max(self.modified_at[start:start + per_page], default=0.0)
+            total = len(self.listings)
+        body = json.dumps({
+            "listings": items,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "total_pages": max(1, -(-total // per_page)),
+        }).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return body, etag, modified
+
+
+def make_handler(feed: StubFeed, latency_ms: float, fail_rate: float, stats: dict):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes = b"", headers: dict | None = None) -> None:
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            if url.path != "/listings":
+                self._send(404)
+                return
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            stats["requests"] += 1
+            if fail_rate and random.random() < fail_rate:
+                stats["injected_failures"] += 1
+                self._send(503, headers={"Retry-After": "0"})
+                return
+            query = parse_qs(url.query)
+            page = max(1, int(query.get("page", ["1"])[0]))
+            per_page = max(1, min(1000, int(query.get("per_page", ["100"])[0])))
+            body, etag, modified = feed.page(page, per_page)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": formatdate(modified, usegmt=True),
+                "Content-Type": "application/json",
+            }
+            if self.headers.get("If-None-Match") == etag:
+                stats["not_modified"] += 1
+                self._send(304, headers=headers)
+                return
+            since = self.headers.get("If-Modified-Since")
+            if since and not self.headers.get("If-None-Match"):
+                try:
+                    if int(modified) <= parsedate_to_datetime(since).timestamp():
+                        stats["not_modified"] += 1
+                        self._send(304, headers=headers)
+                        return
+                except (TypeError, ValueError):
+                    pass
+            self._send(200, body, headers)
+
+    return Handler
+
+
+def start_stub_server(
+    n_listings: int = 10000,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency_ms: float = 0.0,
+    fail_rate: float = 0.0,
+    seed: int = 0,
+) -> tuple[ThreadingHTTPServer, StubFeed, dict]:
+    """Start the stub in a daemon thread; returns (server, feed, stats). URL: server.url."""
+    feed = StubFeed(n_listings, seed=seed)
+    stats = {"requests": 0, "not_modified": 0, "injected_failures": 0}
+    server = ThreadingHTTPServer((host, port), make_handler(feed, latency_ms, fail_rate, stats))
+    server.daemon_threads = True
+    server.url = f"http://{host}:{server.server_address[1]}/listings"
+    threading.Thread(target=server.serve_forever, name="stub-listings", daemon=True).start()
+    return server, feed, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a stub paginated job listings API")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--listings", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added delay per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--churn-every", type=float, default=0.0, help="Seconds between feed changes (0 = static)")
+    parser.add_argument("--churn-fraction", type=float, default=0.01)
+    args = parser.parse_args()
+
+    server, feed, stats = start_stub_server(
+        args.listings, args.host, args.port, args.latency_ms, args.fail_rate
+    )
+    print(f"Serving {args.listings} listings at {server.url}")
+    try:
+        while True:
+            if args.churn_every > 0:
+                time.sleep(args.churn_every)
+                print(f"churned {feed.churn(args.churn_fraction)} listings; stats {stats}")
+            else:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Per-worker memory of serve.py with and without preload-and-fork.
+
+Starts the server in each mode, waits until it answers /ready, sends some
+prediction traffic, then reads RSS, PSS and unique (USS) memory of every worker
+from /proc. Linux only.
+
+Usage:
+    python benchmarks/worker_memory.py --workers 4
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from serve import proc_memory_kb
+
+
+def child_pids(pid: int) -> list[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def wait_ready(port: int, timeout_s: float) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError("Server did not become ready")
+
+
+def send_traffic(port: int, requests: int) -> None:
+    body = json.dumps({
+        "engagement": 50, "velocity": 60, "mastery": 40, "credibility": 70, "experience_level": 1,
+    }).encode()
+    for _ in range(requests):
+        req = urllib.request.Request(
+            f"http://127.0.0.1:{port}/predict-difficulty",
+            data=body,
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(req, timeout=5):
+            pass
+
+
+def measure(workers: int, port: int, preload: bool, settle_s: float) -> list[dict[str, int]]:
+    cmd = [sys.executable, os.path.join(ROOT, "serve.py"), "--workers", str(workers), "--port", str(port)]
+    if not preload:
+        cmd.append("--no-preload")
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, timeout_s=180)
+        # Every worker runs its own lifespan; wait until all of them are up
+        deadline = time.monotonic() + 180
+        while len(child_pids(proc.pid)) < workers and time.monotonic() < deadline:
+            time.sleep(0.2)
+        time.sleep(settle_s)
+        send_traffic(port, requests=50 * workers)
+        return [proc_memory_kb(pid) for pid in child_pids(proc.pid)]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-worker memory with and without preload")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--settle", type=float, default=5.0, help="Seconds to wait after workers start")
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'workers':>8}{'avg RSS MB':>12}{'avg PSS MB':>12}{'avg USS MB':>12}{'sum USS MB':>12}")
+    for preload in (False, True):
+        mems = measure(args.workers, args.port, preload, args.settle)
+        n = len(mems) or 1
+        rss = sum(m["rss_kb"] for m in mems) / n / 1024
+        pss = sum(m["pss_kb"] for m in mems) / n / 1024
+        uss = sum(m["uss_kb"] for m in mems) / 1024
+        print(
+            f"{'preload' if preload else 'no-preload':<12}{len(mems):>8}"
+            f"{rss:>12.1f}{pss:>12.1f}{uss / n:>12.1f}{uss:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Build the learning path search index from the catalog and save it, so the API
+loads it at startup (Settings.learning_paths_search_index_path) instead of
+indexing the catalog.
+
+Usage:
+    python build_search_index.py --out learning_path_search.npz
+    python build_search_index.py --catalog ../Frontend/data/learningPath.json --out search.npz --query "docker compose"
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add Backend root to path for imports when running as script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from services.learning_path_search import LearningPathSearchIndex
+from services.learning_paths import LearningPathCatalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build and save the learning path BM25 search index")
+    parser.add_argument("--catalog", type=str, default=None, help="learningPath.json (default: Settings.learning_paths_path)")
+    parser.add_argument("--out", type=str, required=True, help="Output .npz file")
+    parser.add_argument("--query", type=str, default=None, help="Run one query against the saved index")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = LearningPathSearchIndex.from_catalog(LearningPathCatalog.from_file(args.catalog))
+    tmp = args.out + ".tmp"
+    with open(tmp, "wb") as f:
+        index.save(f)
+    os.replace(tmp, args.out)
+    print(
+        f"Indexed {len(index)} steps, {index.vocabulary_size} terms in "
+        f"{(time.perf_counter() - start) * 1000:.1f} ms -> {args.out} ({os.path.getsize(args.out)} bytes)"
+    )
+    if args.query:
+        for hit in LearningPathSearchIndex.load(args.out).search(args.query):
+            print(f"{hit['score']:>8.3f}  {hit['topic']} / step {hit['step']}: {hit['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,28 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False, description="Enable debug mode")
     environment: str = Field(default="development", description="Environment name")
 
+    # Preload-and-fork server (serve.py)
+    server_host: str = Field(default="127.0.0.1", description="Bind address for serve.py")
+    server_port: int = Field(default=8000, description="Bind port for serve.py")
+    server_workers: int = Field(default=2, ge=1, description="Worker processes forked by serve.py")
+    server_graceful_timeout_s: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds workers get to finish in-flight requests on shutdown before SIGKILL",
+    )
+
+    # Startup budget (benchmarks/startup_budget.py)
+    startup_import_budget_ms: float = Field(
+        default=1000.0,
+        gt=0,
+        description="Max wall time to import a measured module (e.g. main) in a fresh interpreter",
+    )
+    startup_rss_budget_mb: float = Field(
+        default=150.0,
+        gt=0,
+        description="Max peak RSS after importing a measured module in a fresh interpreter",
+    )
+
     # Database (Supabase PostgreSQL)
     database_url: Optional[str] = Field(
         default=None,
@@ -34,16 +56,205 @@ class Settings(BaseSettings):
         default="scaler.pt",
         description="Path to saved feature scaler state",
     )
+    numpy_weights_path: str = Field(
+        default="roadmap_model.npz",
+        description="Path to model weights exported for the NumPy inference backend",
+    )
+
+    # Model lifecycle (hot-swap and shadow scoring)
+    model_watch_enabled: bool = Field(
+        default=False,
+        description="Poll the model artifact and hot-swap new versions without a restart",
+    )
+    model_watch_interval_s: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds between model artifact polls",
+    )
+    shadow_model_path: Optional[str] = Field(
+        default=None,
+        description="Candidate model artifact scored in shadow mode (same backend/format as the active model)",
+    )
+    shadow_scaler_path: Optional[str] = Field(
+        default=None,
+        description="Scaler state for a torch shadow model (default: scaler.pt next to shadow_model_path, "
+        "else the active scaler)",
+    )
+    shadow_sample_rate: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="Fraction of prediction batches also scored by the shadow model",
+    )
+
+    # Inference
+    model_warmup_on_startup: bool = Field(
+        default=True,
+        description="Load the model and run a warm-up batch during app startup",
+    )
+    inference_backend: str = Field(
+        default="torch",
+        description="Inference backend: 'torch' (PyTorch checkpoint), 'numpy' (torch-free, exported weights) "
+        "or 'compiled' (NumPy with scaler folded into fc1 and a single logits pass)",
+    )
+    inference_int8_weights: bool = Field(
+        default=False,
+        description="Use int8-quantized weights with the 'compiled' backend",
+    )
+    predict_batch_max_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum number of metric rows accepted by /predict-difficulty/batch",
+    )
+    inference_batching_enabled: bool = Field(
+        default=False,
+        description="Coalesce concurrent /predict-difficulty calls into micro-batches",
+    )
+    inference_batch_max_size: int = Field(
+        default=32,
+        ge=1,
+        description="Maximum rows per micro-batch forward pass",
+    )
+    inference_batch_max_wait_us: int = Field(
+        default=2000,
+        ge=0,
+        description="Longest a queued request waits for its micro-batch to fill (microseconds)",
+    )
+    inference_batch_result_timeout_s: float = Field(
+        default=30.0,
+        gt=0,
+        description="Longest a request waits for its micro-batch result before failing",
+    )
+    inference_pool_size: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes for model inference (0 = run in the request thread)",
+    )
+    inference_pool_threads_per_worker: int = Field(
+        default=1,
+        ge=1,
+        description="torch/BLAS intra-op threads pinned in each inference worker process",
+    )
+    inference_pool_max_batch: int = Field(
+        default=1024,
+        ge=1,
+        description="Rows per shared-memory buffer; larger batches are split across workers",
+    )
+    prediction_cache_size: int = Field(
+        default=10000,
+        ge=0,
+        description="Max entries in the LRU prediction cache (0 disables it)",
+    )
+    prediction_cache_quantum: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Opt-in: snap metric scores to multiples of this before cache lookup and prediction "
+        "(more hits, slightly different probabilities); unset caches exact metric values",
+    )
+
+    roadmap_response_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Max encoded /generate-roadmap responses cached per process (0 disables caching)",
+    )
+
+    # Learning paths
+    learning_paths_path: str = Field(
+        default="../Frontend/data/learningPath.json",
+        description="Learning path catalog (topics, roadmap steps, resources); relative paths resolve from Backend/",
+    )
+    learning_paths_response_cache_size: int = Field(
+        default=512,
+        ge=1,
+        description="Max encoded /learning-paths/{topic} step-range responses cached per process",
+    )
+    learning_paths_search_index_path: Optional[str] = Field(
+        default=None,
+        description="Prebuilt learning path search index (build_search_index.py); used when it matches "
+        "the catalog, otherwise the index is built at startup",
+    )
 
     # Job market (simulated API)
     job_market_api_url: Optional[str] = Field(
         default=None,
-        description="Optional external job listings API URL",
+        description="Optional external job listings API URL (paginated); simulated listings are used if unset",
+    )
+    job_market_api_page_size: int = Field(default=100, ge=1, description="Listings requested per page")
+    job_market_api_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Concurrent page requests (also the connection pool size)",
+    )
+    job_market_api_max_retries: int = Field(
+        default=3,
+        ge=0,
+        description="Retries per page on transport errors, 429 and 5xx",
+    )
+    job_market_api_backoff_s: float = Field(
+        default=0.2,
+        ge=0,
+        description="Base delay of the exponential retry backoff (jittered; Retry-After wins)",
+    )
+    job_market_api_timeout_s: float = Field(default=10.0, gt=0, description="Per-request timeout")
+    job_market_api_max_pages: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Stop after this many pages per refresh (None = all pages)",
     )
-    market_trend_decay_days: int = Field(
+    market_trend_decay_days: float = Field(
         default=30,
-        description="Days over which trend weight decays",
+        ge=0,
+        description="Time constant (days) of exponential demand decay, exp(-age/decay_days); 0 disables decay",
+    )
+    skill_dictionary_path: Optional[str] = Field(
+        default=None,
+        description="JSON file of extra skills, {canonical: [aliases]}, merged into the built-in skill dictionary",
+    )
+    market_topic_min_score: float = Field(
+        default=1.0,
+        gt=0,
+        description="Listings join a learning path topic when their skills in its profile weigh this much "
+        "(a skill in only that topic's profile weighs 1; broad skills shared by many topics weigh less)",
+    )
+    market_snapshot_listings: int = Field(
+        default=1000,
+        ge=1,
+        description="Job listings fetched per market snapshot rebuild",
+    )
+    market_snapshot_refresh_interval_s: float = Field(
+        default=300.0,
+        ge=0,
+        description="Seconds between background market snapshot rebuilds (0 = build once, on first use)",
     )
+    market_history_days: int = Field(
+        default=365,
+        ge=1,
+        description="Days of per-skill daily demand history kept for /market-trends/history",
+    )
+    market_snapshot_path: Optional[str] = Field(
+        default="market_snapshot.bin",
+        description="Binary file each market snapshot is persisted to and loaded (mmap) from at startup; "
+        "relative paths resolve from Backend/ (None = keep snapshots in memory only)",
+    )
+    market_snapshot_max_age_s: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Persisted market snapshots older than this are ignored at startup and rebuilt",
+    )
+    market_snapshot_follow_interval_s: float = Field(
+        default=5.0,
+        gt=0,
+        description="How often serve.py workers that do not run the refresher check market_snapshot_path "
+        "for a newer snapshot",
+    )
+
+    @field_validator("inference_backend")
+    @classmethod
+    def validate_inference_backend(cls, v: str) -> str:
+        v = v.strip().lower()
+        if v not in ("torch", "numpy", "compiled"):
+            raise ValueError("inference_backend must be 'torch', 'numpy' or 'compiled'")
+        return v
 
     @field_validator("database_url", mode="before")
     @classmethod
@@ -0,0 +1,72 @@
+"""
+Ingest job listing dumps (JSONL, optionally .gz) into skill demand counts.
+
+Streams the files in chunks through a process pool with bounded memory, merges
+the partial counts, and reports rows/sec and peak RSS. Optionally writes a
+SkillFrequencyIndex checkpoint (see SkillFrequencyIndex.to_bytes).
+
+Usage:
+    python ingest_listings.py dumps/listings-2024-*.jsonl.gz --workers 4
+    python ingest_listings.py listings.jsonl --index-out skill_index.bin --top 30
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add Backend root to path for imports when running as script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from config import get_settings
+from services.listing_ingest import ingest_listings
+from services.skill_demand_analyzer import SkillFrequencyIndex, rank_skills_by_demand
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Stream JSONL job listing dumps into skill demand counts")
+    parser.add_argument("paths", nargs="+", help="JSONL dump files (.gz is detected automatically)")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (0 = in-process; default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Lines per work unit")
+    parser.add_argument("--decay-days", type=float, default=settings.market_trend_decay_days)
+    parser.add_argument("--top", type=int, default=20, help="Skills to print")
+    parser.add_argument("--index-out", type=str, default=None, help="Write a SkillFrequencyIndex checkpoint here")
+    parser.add_argument("--json", action="store_true", help="Print stats and ranking as JSON")
+    args = parser.parse_args()
+
+    index = SkillFrequencyIndex(decay_days=args.decay_days or None) if args.index_out else None
+    result = ingest_listings(
+        args.paths,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        decay_days=args.decay_days or None,
+        index=index,
+    )
+    ranking = rank_skills_by_demand(result.counts, top_n=args.top, decayed=result.decayed)
+
+    if index is not None:
+        tmp = args.index_out + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(index.to_bytes())
+        os.replace(tmp, args.index_out)
+
+    if args.json:
+        print(json.dumps({"stats": result.stats(), "skill_demand": ranking}))
+        return
+    stats = result.stats()
+    print(
+        f"rows: {stats['rows']}  skipped: {stats['skipped']}  skills: {stats['skills']}  "
+        f"elapsed: {stats['elapsed_s']:.2f}s  rows/s: {stats['rows_per_s']:.0f}"
+    )
+    print(f"peak RSS: parent {stats['peak_rss_mb']:.1f} MB, largest worker {stats['peak_worker_rss_mb']:.1f} MB")
+    if index is not None:
+        print(f"index checkpoint: {args.index_out} ({len(index)} listings)")
+    for r in ranking:
+        print(f"{r['rank']:>4}  {r['skill']:<24} {r['demand_score']:.6f}")
+
+
+if __name__ == "__main__":
+    main()
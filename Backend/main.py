@@ -3,26 +3,43 @@ PathWise Backend: production-ready personalization engine, roadmap adaptation,
 and job market recommendation system. FastAPI app with modular structure.
 """
 
+import asyncio
+import logging
 import os
 import sys
+import time
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from config import get_settings
-from api.routes import router as personalization_router
+from api.routes import (
+    close_services,
+    get_job_market_service,
+    get_personalization,
+    peek_personalization,
+    router as personalization_router,
+)
 
 # Add Backend root to path for imports when running as script
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("pathwise")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup: init DB if configured. Shutdown: cleanup."""
+    """
+    Startup: init DB if configured, load and warm up the model, start the market
+    snapshot refresher. Shutdown: cleanup.
+    """
+    startup_start = time.perf_counter()
     settings = get_settings()
     if settings.database_url:
         try:
@@ -31,9 +48,42 @@ async def lifespan(app: FastAPI):
             await init_db()
         except Exception:
             pass  # DB optional for personalization-only usage
+    if settings.model_warmup_on_startup:
+        svc = get_personalization()
+        try:
+            timings = svc.warm_up()
+            status = svc.status()
+            logger.info(
+                "Model warm-up: backend=%s load_ms=%.1f warmup_ms=%.1f sha256=%s",
+                status["backend"],
+                timings["load_ms"],
+                timings["warmup_ms"],
+                (status["artifact_sha256"] or "")[:12],
+            )
+        except FileNotFoundError as e:
+            logger.warning("Model warm-up skipped: %s", e)
+    refresher: asyncio.Task | None = None
+    if settings.market_snapshot_refresh_interval_s > 0:
+        if getattr(app.state, "market_snapshot_follower", False):
+            # serve.py worker: another process rebuilds and persists; load its snapshots
+            refresher = asyncio.create_task(
+                get_job_market_service().run_follower(settings.market_snapshot_follow_interval_s),
+                name="market-snapshot-follower",
+            )
+        else:
+            refresher = asyncio.create_task(
+                get_job_market_service().run_refresher(settings.market_snapshot_refresh_interval_s),
+                name="market-snapshot-refresher",
+            )
+    logger.info("Startup completed in %.1f ms", (time.perf_counter() - startup_start) * 1000)
     yield
-    # Shutdown: close pools etc. if needed
-    pass
+    # Shutdown: stop background workers, close pools etc.
+    if refresher is not None:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+        await get_job_market_service().aclose()
+    close_services()
 
 
 app = FastAPI(
@@ -49,6 +99,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-Market-Snapshot-Age"],
 )
 
 app.include_router(personalization_router)
@@ -60,6 +111,24 @@ def health():
     return {"status": "ok", "service": "pathwise-api"}
 
 
+@app.get("/ready")
+def ready():
+    """
+    Readiness check: 200 once the model is loaded (or when startup warm-up is disabled
+    and the model loads lazily), 503 otherwise. Includes load time and artifact hash.
+    """
+    warmup = get_settings().model_warmup_on_startup
+    svc = get_personalization() if warmup else peek_personalization()
+    model_status = svc.status() if svc is not None else {"loaded": False}
+    is_ready = model_status["loaded"] or not warmup
+    body = {
+        "status": "ready" if is_ready else "not_ready",
+        "service": "pathwise-api",
+        "model": model_status,
+    }
+    return JSONResponse(status_code=200 if is_ready else 503, content=body)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
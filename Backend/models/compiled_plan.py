@@ -0,0 +1,116 @@
+"""
+Compiled inference plan for the roadmap difficulty MLP.
+
+Compared with scaling features and calling predict_proba / predict_class separately,
+the plan:
+    - folds the feature scaler (mean, scale) into fc1's weights and bias, so raw
+      metrics go straight into the first matmul;
+    - computes logits once and derives both probabilities and classes from them;
+    - optionally stores weights as per-output-channel symmetric int8.
+
+Operates on NumPy arrays only (no torch import).
+"""
+
+import numpy as np
+
+from models.numpy_model import LAYER_NAMES, SCALER_EPS, SCALER_MEAN_KEY, SCALER_SCALE_KEY, softmax
+
+
+def fold_scaler(
+    weight: np.ndarray,
+    bias: np.ndarray,
+    mean: np.ndarray,
+    scale: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fold x_std = (x - mean) / (scale + eps) into a linear layer (weight: (out, in)).
+
+    Returns (weight', bias') such that x @ weight'.T + bias' == x_std @ weight.T + bias.
+    """
+    inv = 1.0 / (np.asarray(scale, dtype=np.float64) + SCALER_EPS)
+    w = np.asarray(weight, dtype=np.float64) * inv
+    b = np.asarray(bias, dtype=np.float64) - w @ np.asarray(mean, dtype=np.float64)
+    return w, b
+
+
+def quantize_int8(weight: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-output-channel int8 quantization; returns (int8 weight, float32 scales)."""
+    max_abs = np.abs(weight).max(axis=1)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0)
+    q = np.clip(np.round(weight / scales[:, None]), -127, 127).astype(np.int8)
+    return q, scales.astype(np.float32)
+
+
+class CompiledInferencePlan:
+    """
+    Single-pass inference over raw (unscaled) metric rows.
+
+    With int8 weights, each layer keeps its int8 matrix plus per-channel scales;
+    the matmul runs on the int8 values in float32 and is rescaled per output channel.
+    """
+
+    def __init__(
+        self,
+        weights: list[np.ndarray],
+        biases: list[np.ndarray],
+        scaler_mean: np.ndarray | None = None,
+        scaler_scale: np.ndarray | None = None,
+        int8: bool = False,
+    ) -> None:
+        n_in = weights[0].shape[1]
+        mean = scaler_mean if scaler_mean is not None else np.zeros(n_in)
+        scale = scaler_scale if scaler_scale is not None else np.ones(n_in)
+        w1, b1 = fold_scaler(weights[0], biases[0], mean, scale)
+        folded_w = [w1] + [np.asarray(w, dtype=np.float64) for w in weights[1:]]
+        folded_b = [b1] + [np.asarray(b, dtype=np.float64) for b in biases[1:]]
+
+        self.int8 = int8
+        self._biases = [b.astype(np.float32) for b in folded_b]
+        self._int8_weights: list[np.ndarray] = []
+        self._channel_scales: list[np.ndarray | None] = []
+        self._weights_t: list[np.ndarray] = []
+        for w in folded_w:
+            if int8:
+                q, s = quantize_int8(w)
+                self._int8_weights.append(q)
+                self._channel_scales.append(s)
+                # int8 values are exact in float32; keep the transposed matmul operand
+                self._weights_t.append(np.ascontiguousarray(q.T, dtype=np.float32))
+            else:
+                self._channel_scales.append(None)
+                self._weights_t.append(np.ascontiguousarray(w.T, dtype=np.float32))
+
+    @classmethod
+    def from_npz(cls, path: str, int8: bool = False) -> "CompiledInferencePlan":
+        """Build a plan from weights (and scaler) exported by training/export_numpy.py."""
+        with np.load(path) as data:
+            weights = [data[f"{name}.weight"] for name in LAYER_NAMES]
+            biases = [data[f"{name}.bias"] for name in LAYER_NAMES]
+            mean = data[SCALER_MEAN_KEY] if SCALER_MEAN_KEY in data else None
+            scale = data[SCALER_SCALE_KEY] if SCALER_SCALE_KEY in data else None
+        return cls(weights, biases, mean, scale, int8=int8)
+
+    @property
+    def weight_bytes(self) -> int:
+        """Size of the stored weight matrices (int8 or float32)."""
+        if self.int8:
+            return sum(q.nbytes + s.nbytes for q, s in zip(self._int8_weights, self._channel_scales))
+        return sum(w.nbytes for w in self._weights_t)
+
+    def logits(self, x: np.ndarray) -> np.ndarray:
+        """Logits for raw (n, 5) metric rows."""
+        h = np.asarray(x, dtype=np.float32)
+        last = len(self._weights_t) - 1
+        for i, (w, s, b) in enumerate(zip(self._weights_t, self._channel_scales, self._biases)):
+            h = h @ w
+            if s is not None:
+                h *= s
+            h += b
+            if i < last:
+                np.maximum(h, 0, out=h)
+        return h
+
+    def run(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """One pass over raw metric rows; return (classes, probabilities)."""
+        logits = self.logits(x)
+        return logits.argmax(axis=-1), softmax(logits)
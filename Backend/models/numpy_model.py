@@ -0,0 +1,81 @@
+"""
+Pure NumPy implementation of the roadmap difficulty MLP for torch-free inference.
+Architecture mirrors RoadmapDifficultyModel: 5 -> 32 (ReLU) -> 16 (ReLU) -> 3 (Softmax).
+Weights are exported from the PyTorch checkpoint by training/export_numpy.py.
+
+This module must not import torch.
+"""
+
+import numpy as np
+
+# Array names inside the exported .npz archive
+LAYER_NAMES = ("fc1", "fc2", "fc3")
+SCALER_MEAN_KEY = "scaler_mean"
+SCALER_SCALE_KEY = "scaler_scale"
+# Standardization is (x - mean) / (scale + SCALER_EPS) in every backend and in the compiled plan's folded fc1
+SCALER_EPS = 1e-8
+VERSION_KEY = "version"
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable softmax over the last axis."""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class NumpyRoadmapModel:
+    """
+    Inference-only MLP with the same interface as RoadmapDifficultyModel
+    (forward / predict_class / predict_proba), operating on float32 ndarrays.
+    """
+
+    def __init__(
+        self,
+        weights: list[np.ndarray],
+        biases: list[np.ndarray],
+    ) -> None:
+        if len(weights) != len(LAYER_NAMES) or len(biases) != len(LAYER_NAMES):
+            raise ValueError(f"Expected {len(LAYER_NAMES)} layers, got {len(weights)}")
+        # Store transposed (in, out) so forward is a plain x @ W
+        self._weights_t = [np.ascontiguousarray(w.T, dtype=np.float32) for w in weights]
+        self._biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def from_npz(cls, path: str) -> tuple["NumpyRoadmapModel", np.ndarray | None, np.ndarray | None]:
+        """
+        Load weights exported by training/export_numpy.py.
+
+        Returns:
+            (model, scaler_mean, scaler_scale); scaler arrays are None if not exported.
+        """
+        with np.load(path) as data:
+            weights = [data[f"{name}.weight"] for name in LAYER_NAMES]
+            biases = [data[f"{name}.bias"] for name in LAYER_NAMES]
+            mean = data[SCALER_MEAN_KEY] if SCALER_MEAN_KEY in data else None
+            scale = data[SCALER_SCALE_KEY] if SCALER_SCALE_KEY in data else None
+        return cls(weights, biases), mean, scale
+
+    @staticmethod
+    def read_version(path: str) -> str | None:
+        """Model version recorded at export time, or None for unversioned exports."""
+        with np.load(path) as data:
+            return str(data[VERSION_KEY]) if VERSION_KEY in data else None
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        """Forward pass. Returns logits (softmax applied at inference)."""
+        h = np.asarray(x, dtype=np.float32)
+        last = len(self._weights_t) - 1
+        for i, (w, b) in enumerate(zip(self._weights_t, self._biases)):
+            h = h @ w + b
+            if i < last:
+                np.maximum(h, 0, out=h)
+        return h
+
+    def predict_class(self, x: np.ndarray) -> np.ndarray:
+        """Return class indices (0, 1, or 2) for input batch."""
+        return self.forward(x).argmax(axis=-1)
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        """Return class probabilities via softmax."""
+        return softmax(self.forward(x))
@@ -0,0 +1,261 @@
+"""
+Preload-and-fork server entry point.
+
+The master process imports the app, loads settings, the model/scaler and other
+static data once, freezes the GC heap, binds the listening socket, and then forks
+worker processes that serve main:app with uvicorn. Workers share the preloaded
+pages copy-on-write instead of each importing torch and loading its own model.
+
+Exactly one worker runs the market snapshot refresher and persists each snapshot
+to market_snapshot_path; the others reload that file when it changes, so every
+worker serves the same snapshot versions (without a snapshot path, every worker
+refreshes on its own).
+
+The master supervises workers: crashed workers are re-forked from the preloaded
+state (a replacement for the refresher worker takes over refreshing), SIGTERM/SIGINT shut everything down gracefully, and SIGUSR1 logs
+per-worker memory (RSS, PSS and unique/USS).
+
+Usage:
+    python serve.py --workers 4 --port 8000
+    python serve.py --workers 4 --no-preload   # each worker loads its own copy (baseline)
+"""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+# Add Backend root to path for imports when running as script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from config import get_settings
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("pathwise.serve")
+
+# A worker that exits sooner than this after being forked is considered crash-looping
+_MIN_WORKER_LIFETIME_S = 1.0
+
+
+def proc_memory_kb(pid: int) -> dict[str, int]:
+    """RSS, PSS and USS (Private_Clean + Private_Dirty) of a process in kB (Linux /proc)."""
+    fields = {"Rss": 0, "Pss": 0, "Private_Clean": 0, "Private_Dirty": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in fields:
+                    fields[key] = int(rest.split()[0])
+    except OSError:
+        return {"rss_kb": 0, "pss_kb": 0, "uss_kb": 0}
+    return {
+        "rss_kb": fields["Rss"],
+        "pss_kb": fields["Pss"],
+        "uss_kb": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def preload_app_state() -> None:
+    """Import the app and load everything workers should share copy-on-write."""
+    start = time.perf_counter()
+    import main  # noqa: F401 - imports FastAPI app, routes and services
+    from api.routes import (
+        get_job_market_service,
+        get_learning_path_catalog,
+        get_learning_path_search,
+        get_personalization,
+        get_roadmap_service,
+    )
+
+    settings = get_settings()
+    get_roadmap_service()
+    try:
+        get_learning_path_search()
+    except FileNotFoundError as e:
+        logger.warning("Learning path catalog preload skipped: %s", e)
+    get_job_market_service().refresh_snapshot(if_missing=True)
+    svc = get_personalization()
+    if settings.inference_pool_size > 0:
+        # Inference pools are per worker (dropped after fork), so one started here would only sit idle;
+        # each worker starts its own during its startup warm-up and the pool processes load the model.
+        logger.info("Model preload skipped: inference runs in per-worker process pools")
+    else:
+        try:
+            svc.warm_up()
+        except FileNotFoundError as e:
+            logger.warning("Model preload skipped: %s", e)
+    logger.info(
+        "Preloaded app state in %.1f ms (model loaded: %s, environment: %s)",
+        (time.perf_counter() - start) * 1000,
+        svc.is_loaded,
+        settings.environment,
+    )
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, preloaded: bool, market_follower: bool = False) -> None:
+    """
+    Child process body: reset per-process state and serve until told to stop.
+    A market_follower worker loads persisted market snapshots instead of building them.
+    """
+    import uvicorn
+
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGUSR1, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    random.seed()
+    if preloaded:
+        from api.routes import reset_after_fork
+
+        reset_after_fork()
+    from main import app
+
+    app.state.market_snapshot_follower = market_follower
+    config = uvicorn.Config(app, lifespan="on", log_level="info", access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Master:
+    """Forks and supervises worker processes sharing one listening socket."""
+
+    def __init__(self, sock: socket.socket, workers: int, preload: bool, graceful_timeout_s: float) -> None:
+        self._sock = sock
+        self._n_workers = workers
+        self._preload = preload
+        self._graceful_timeout = graceful_timeout_s
+        self._workers: dict[int, float] = {}  # pid -> fork time
+        self._stopping = False
+        # Worker running the market snapshot refresher; the rest follow the persisted file
+        self._refresher_pid: int | None = None
+        self._can_follow = bool(get_settings().market_snapshot_path)
+
+    def spawn(self) -> int:
+        follower = self._can_follow and self._refresher_pid is not None
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self._sock, self._preload, market_follower=follower)
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self._workers[pid] = time.monotonic()
+        if not follower:
+            self._refresher_pid = pid
+        logger.info("Started worker pid=%d%s", pid, "" if follower else " (market snapshot refresher)")
+        return pid
+
+    def log_memory(self, *_: object) -> None:
+        master = proc_memory_kb(os.getpid())
+        logger.info(
+            "master pid=%d rss=%.1fMB uss=%.1fMB",
+            os.getpid(), master["rss_kb"] / 1024, master["uss_kb"] / 1024,
+        )
+        for pid in sorted(self._workers):
+            mem = proc_memory_kb(pid)
+            logger.info(
+                "worker pid=%d rss=%.1fMB pss=%.1fMB uss=%.1fMB",
+                pid, mem["rss_kb"] / 1024, mem["pss_kb"] / 1024, mem["uss_kb"] / 1024,
+            )
+
+    def _request_stop(self, signum: int, _frame: object) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info("Received %s, stopping %d workers", signal.Signals(signum).name, len(self._workers))
+        for pid in list(self._workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGUSR1, self.log_memory)
+        for _ in range(self._n_workers):
+            self.spawn()
+
+        while self._workers and not self._stopping:
+            try:
+                pid, status = os.wait()
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+            started = self._workers.pop(pid, None)
+            if pid == self._refresher_pid:
+                self._refresher_pid = None
+            if started is None or self._stopping:
+                continue
+            logger.warning("Worker pid=%d exited (status %d); restarting", pid, status)
+            if time.monotonic() - started < _MIN_WORKER_LIFETIME_S:
+                time.sleep(_MIN_WORKER_LIFETIME_S)
+            self.spawn()
+
+        deadline = time.monotonic() + self._graceful_timeout
+        while self._workers and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self._workers.pop(pid, None)
+            else:
+                time.sleep(0.05)
+        for pid in list(self._workers):
+            logger.warning("Worker pid=%d did not stop in time; killing", pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self._sock.close()
+        logger.info("Server stopped")
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run PathWise API with preloaded, forked workers")
+    parser.add_argument("--host", type=str, default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument("--workers", type=int, default=settings.server_workers)
+    parser.add_argument("--graceful-timeout", type=float, default=settings.server_graceful_timeout_s)
+    parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="Do not load the app in the master; every worker imports and loads its own copy",
+    )
+    args = parser.parse_args()
+
+    preload = not args.no_preload
+    if preload:
+        preload_app_state()
+        # Move everything allocated so far out of the collector's reach so GC passes
+        # in workers don't write to (and un-share) the preloaded objects' pages.
+        gc.collect()
+        gc.freeze()
+    sock = bind_socket(args.host, args.port)
+    logger.info(
+        "Listening on %s:%d with %d workers (preload=%s)",
+        args.host, args.port, args.workers, preload,
+    )
+    Master(sock, args.workers, preload, args.graceful_timeout).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,35 @@
-"""Business logic services."""
+"""Business logic services.
 
-from services.personalization_service import PersonalizationService
-from services.roadmap_service import RoadmapService
-from services.job_market_service import JobMarketService
+Service classes are resolved lazily on attribute access so that importing one
+subsystem (e.g. job market) does not import the others' heavy dependencies
+(numpy, torch).
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from services.personalization_service import PersonalizationService
+    from services.roadmap_service import RoadmapService
+    from services.job_market_service import JobMarketService
+
+_LAZY_EXPORTS = {
+    "PersonalizationService": "services.personalization_service",
+    "RoadmapService": "services.roadmap_service",
+    "JobMarketService": "services.job_market_service",
+}
 
 __all__ = [
     "PersonalizationService",
     "RoadmapService",
     "JobMarketService",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'services' has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,295 @@
+"""
+Dedicated inference process pool. Each worker process loads its own model copy,
+pins its torch and BLAS thread counts, and exchanges batches with the API process
+through preallocated shared-memory buffers; only the row count and a status
+word go over the pipe.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context, shared_memory
+from typing import Any
+
+import numpy as np
+
+from services.model_manager import NUM_FEATURES
+
+NUM_CLASSES = 3
+# Output row layout in shared memory: [class, p0, p1, p2]
+_OUT_WIDTH = 1 + NUM_CLASSES
+_CMD_RELOAD = -1
+_CMD_STOP = -2
+# BLAS/OpenMP read these once, when numpy is first imported, so they must be in the
+# worker's environment at spawn (numpy is imported while unpickling _worker_main)
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+_spawn_env_lock = threading.Lock()
+
+
+@contextmanager
+def _thread_env(num_threads: int):
+    """Set the BLAS thread-count variables in this process's environment while a worker is started."""
+    with _spawn_env_lock:
+        saved = {name: os.environ.get(name) for name in _THREAD_ENV_VARS}
+        os.environ.update({name: str(num_threads) for name in _THREAD_ENV_VARS})
+        try:
+            yield
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def _blas_threads() -> int | None:
+    """Threads of the BLAS library numpy uses in this process (None without threadpoolctl)."""
+    try:
+        from threadpoolctl import threadpool_info
+    except ImportError:
+        return None
+    counts = [info["num_threads"] for info in threadpool_info() if info.get("user_api") == "blas"]
+    return max(counts) if counts else None
+
+
+def _worker_main(
+    conn: Any,
+    in_name: str,
+    out_name: str,
+    max_batch: int,
+    load_kwargs: dict[str, Any],
+    num_threads: int,
+) -> None:
+    """Worker loop: wait for a row count, run the model on shared input, write shared output."""
+    if load_kwargs["backend"] == "torch":
+        import torch
+
+        torch.set_num_threads(num_threads)
+        torch.set_num_interop_threads(1)
+
+    from services.model_manager import load_model
+
+    # Spawned workers share the parent's resource tracker, so attaching here does
+    # not take ownership; the parent unlinks both blocks in _Worker.close().
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    x_buf = np.ndarray((max_batch, NUM_FEATURES), dtype=np.float32, buffer=in_shm.buf)
+    out_buf = np.ndarray((max_batch, _OUT_WIDTH), dtype=np.float32, buffer=out_shm.buf)
+    try:
+        try:
+            model = load_model(**load_kwargs)
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+            return
+        conn.send(("ready", {"model": model.describe(), "blas_threads": _blas_threads()}))
+        while True:
+            n = conn.recv()
+            if n == _CMD_STOP:
+                break
+            if n == _CMD_RELOAD:
+                try:
+                    model = load_model(**load_kwargs)
+                    conn.send(("ok", model.describe()))
+                except Exception as e:
+                    conn.send(("error", f"{type(e).__name__}: {e}"))
+                continue
+            try:
+                pred, probs = model.run(x_buf[:n])
+                out_buf[:n, 0] = pred
+                out_buf[:n, 1:] = probs
+                conn.send(("ok", None))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del x_buf, out_buf
+        in_shm.close()
+        out_shm.close()
+
+
+class _Worker:
+    def __init__(self, ctx: Any, max_batch: int, load_kwargs: dict[str, Any], num_threads: int) -> None:
+        self.in_shm = shared_memory.SharedMemory(create=True, size=max_batch * NUM_FEATURES * 4)
+        self.out_shm = shared_memory.SharedMemory(create=True, size=max_batch * _OUT_WIDTH * 4)
+        self.x = np.ndarray((max_batch, NUM_FEATURES), dtype=np.float32, buffer=self.in_shm.buf)
+        self.out = np.ndarray((max_batch, _OUT_WIDTH), dtype=np.float32, buffer=self.out_shm.buf)
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.in_shm.name, self.out_shm.name, max_batch, load_kwargs, num_threads),
+            name="inference-worker",
+            daemon=True,
+        )
+        with _thread_env(num_threads):
+            self.process.start()
+        child_conn.close()
+
+    def wait_ready(self, timeout: float) -> dict[str, Any]:
+        """Wait for the worker's model load; returns {"model": describe(), "blas_threads"}."""
+        if not self.conn.poll(timeout):
+            raise TimeoutError("Inference worker did not start in time")
+        status, payload = self.conn.recv()
+        if status != "ready":
+            raise RuntimeError(f"Inference worker failed to start: {payload}")
+        return payload
+
+    def close(self) -> None:
+        try:
+            self.conn.send(_CMD_STOP)
+        except (OSError, EOFError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        del self.x, self.out
+        for shm in (self.in_shm, self.out_shm):
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class InferenceProcessPool:
+    """
+    Fixed pool of inference worker processes. run() splits a batch into chunks of
+    at most max_batch rows and scores them on idle workers in parallel.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        load_kwargs: dict[str, Any],
+        threads_per_worker: int = 1,
+        max_batch: int = 1024,
+        start_timeout_s: float = 120.0,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self._ctx = get_context("spawn")
+        self._size = size
+        self._load_kwargs = dict(load_kwargs)
+        self._threads = max(1, threads_per_worker)
+        self._max_batch = max_batch
+        self._start_timeout = start_timeout_s
+        self._workers: list[_Worker] = []
+        try:
+            for _ in range(size):
+                self._workers.append(self._spawn())
+            for w in self._workers:
+                ready = w.wait_ready(start_timeout_s)
+                # describe() of the model version the workers loaded (artifact, version, sha256, ...)
+                self.model = ready["model"]
+                self.blas_threads = ready["blas_threads"]
+        except BaseException:
+            for w in self._workers:
+                w.close()
+            raise
+        self._idle: queue.SimpleQueue[int] = queue.SimpleQueue()
+        for i in range(size):
+            self._idle.put(i)
+        self._dispatch = ThreadPoolExecutor(max_workers=size, thread_name_prefix="inference-dispatch")
+        self._closed = False
+        self.restarts = 0
+        self.batches = 0
+        self.rows = 0
+        self._stats_lock = threading.Lock()
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self._max_batch, self._load_kwargs, self._threads)
+
+    def _restart(self, idx: int) -> dict[str, Any]:
+        """Replace worker idx with a fresh process; return the model it loaded."""
+        self._workers[idx].close()
+        self._workers[idx] = self._spawn()
+        self.restarts += 1
+        return self._workers[idx].wait_ready(self._start_timeout)["model"]
+
+    def _run_chunk(self, x: np.ndarray) -> np.ndarray:
+        idx = self._idle.get()
+        worker = self._workers[idx]
+        try:
+            n = len(x)
+            worker.x[:n] = x
+            worker.conn.send(n)
+            status, payload = worker.conn.recv()
+            if status != "ok":
+                raise RuntimeError(f"Inference worker error: {payload}")
+            return worker.out[:n].copy()
+        except (EOFError, OSError, BrokenPipeError) as e:
+            # Worker died: replace it so the pool keeps its size, then surface the error.
+            self._restart(idx)
+            raise RuntimeError(f"Inference worker crashed and was restarted: {e}") from e
+        finally:
+            self._idle.put(idx)
+
+    def run(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Score a raw (n, 5) metric matrix; return (classes, probabilities)."""
+        if self._closed:
+            raise RuntimeError("Inference pool is closed")
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        chunks = [x[i:i + self._max_batch] for i in range(0, len(x), self._max_batch)]
+        if len(chunks) == 1:
+            out = self._run_chunk(chunks[0])
+        else:
+            out = np.concatenate(list(self._dispatch.map(self._run_chunk, chunks)))
+        with self._stats_lock:
+            self.batches += len(chunks)
+            self.rows += len(x)
+        return out[:, 0].astype(np.int64), out[:, 1:]
+
+    def reload(self) -> None:
+        """
+        Ask every worker to reload the model artifact (after a hot-swap in the API
+        process). Dead workers are restarted instead; they load the new artifact on start.
+        """
+        taken = [self._idle.get() for _ in range(self._size)]
+        errors: list[str] = []
+        try:
+            sent = []
+            for idx in taken:
+                try:
+                    self._workers[idx].conn.send(_CMD_RELOAD)
+                    sent.append(idx)
+                except (OSError, BrokenPipeError):
+                    self.model = self._restart(idx)
+            for idx in sent:
+                try:
+                    status, payload = self._workers[idx].conn.recv()
+                except (EOFError, OSError):
+                    self.model = self._restart(idx)
+                    continue
+                if status == "ok":
+                    self.model = payload
+                else:
+                    errors.append(payload)
+        finally:
+            for idx in taken:
+                self._idle.put(idx)
+        if errors:
+            raise RuntimeError(f"Inference worker reload failed: {errors[0]}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "workers": self._size,
+            "threads_per_worker": self._threads,
+            "max_batch": self._max_batch,
+            "batches": self.batches,
+            "rows": self.rows,
+            "restarts": self.restarts,
+            "blas_threads_per_worker": self.blas_threads,
+            "model": self.model,
+        }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._dispatch.shutdown(wait=True)
+        for w in self._workers:
+            w.close()
@@ -0,0 +1,179 @@
+"""
+Micro-batching inference scheduler: gathers concurrent single-row prediction
+requests into one batch, runs a single forward pass, and hands each caller
+its own result.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable
+
+import numpy as np
+
+# Upper bounds of the batch-size histogram buckets reported by stats()
+_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class _Pending:
+    __slots__ = ("row", "future", "enqueued_at")
+
+    def __init__(self, row: list[float]) -> None:
+        self.row = row
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatchScheduler:
+    """
+    Collects rows submitted from many threads and runs them through run_batch
+    in groups of at most max_batch_size. A batch is dispatched as soon as it
+    is full or max_wait_us has elapsed since its first row was queued.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[np.ndarray], list[dict[str, Any]]],
+        max_batch_size: int = 32,
+        max_wait_us: int = 2000,
+        stats_window: int = 4096,
+    ) -> None:
+        self._run_batch = run_batch
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0, max_wait_us) / 1_000_000
+        self._queue: queue.SimpleQueue[_Pending | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        # Guards _closed, worker start and queueing, so nothing is queued behind the stop sentinel
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._batch_size_hist = [0] * (len(_BATCH_SIZE_BUCKETS) + 1)
+        self._recent_waits_us: deque[float] = deque(maxlen=stats_window)
+        self._max_wait_seen_us = 0.0
+
+    def submit(self, row: list[float]) -> Future:
+        """Queue one feature row; the returned future resolves to its result dict."""
+        pending = _Pending(row)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Inference scheduler is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="inference-batcher", daemon=True
+                )
+                self._thread.start()
+            self._queue.put(pending)
+        return pending.future
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """
+        Stop the worker thread after it drains already queued requests. Requests
+        still queued when it exits (e.g. it did not finish within timeout) fail.
+        """
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join(timeout)
+            if not thread.is_alive():
+                self._fail_queued()
+
+    def after_fork(self) -> None:
+        """Reset queue, locks and worker thread in a forked child (threads do not survive fork)."""
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _fail_queued(self) -> None:
+        """Fail every request left in the queue (the worker has stopped)."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                item.future.set_exception(RuntimeError("Inference scheduler is closed"))
+
+    def _collect(self, first: _Pending) -> tuple[list[_Pending], bool]:
+        """Gather rows until the batch is full or the window closes; return (batch, stop)."""
+        batch = [first]
+        deadline = first.enqueued_at + self._max_wait
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _worker(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+            dispatched_at = time.perf_counter()
+            self._record(batch, dispatched_at)
+            try:
+                results = self._run_batch(np.array([p.row for p in batch], dtype=np.float32))
+            except Exception as e:
+                for p in batch:
+                    p.future.set_exception(e)
+                continue
+            for p, result in zip(batch, results):
+                p.future.set_result(result)
+
+    def _record(self, batch: list[_Pending], dispatched_at: float) -> None:
+        size = len(batch)
+        bucket = next(
+            (i for i, bound in enumerate(_BATCH_SIZE_BUCKETS) if size <= bound),
+            len(_BATCH_SIZE_BUCKETS),
+        )
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += size
+            self._batch_size_hist[bucket] += 1
+            for p in batch:
+                wait_us = (dispatched_at - p.enqueued_at) * 1_000_000
+                self._recent_waits_us.append(wait_us)
+                if wait_us > self._max_wait_seen_us:
+                    self._max_wait_seen_us = wait_us
+
+    def stats(self) -> dict[str, Any]:
+        """Batch-size distribution and queue-wait percentiles (recent window) in microseconds."""
+        with self._stats_lock:
+            waits = np.array(self._recent_waits_us, dtype=np.float64)
+            hist_labels = [f"<={b}" for b in _BATCH_SIZE_BUCKETS] + [f">{_BATCH_SIZE_BUCKETS[-1]}"]
+            out: dict[str, Any] = {
+                "enabled": True,
+                "max_batch_size": self._max_batch_size,
+                "max_wait_us": int(self._max_wait * 1_000_000),
+                "batches": self._batches,
+                "requests": self._requests,
+                "avg_batch_size": round(self._requests / self._batches, 3) if self._batches else 0.0,
+                "batch_size_histogram": dict(zip(hist_labels, self._batch_size_hist)),
+                "queue_wait_us": {
+                    "max": round(self._max_wait_seen_us, 1),
+                },
+            }
+        if waits.size:
+            p50, p90, p99 = np.percentile(waits, [50, 90, 99])
+            out["queue_wait_us"].update({
+                "mean": round(float(waits.mean()), 1),
+                "p50": round(float(p50), 1),
+                "p90": round(float(p90), 1),
+                "p99": round(float(p99), 1),
+            })
+        return out
@@ -0,0 +1,224 @@
+"""
+Async client for paginated job listing APIs (Settings.job_market_api_url).
+
+Expected contract: GET {url}?page=N&per_page=M returns
+    {"listings": [...], "page": N, "total_pages": T}
+("results"/"data" are accepted for the list and "total" for the count). Pages are
+fetched over one pooled connection set with bounded concurrency, retried with
+exponential backoff on transport errors, 429 and 5xx, and revalidated with
+If-None-Match / If-Modified-Since so pages that did not change come back as 304
+and are skipped.
+"""
+
+import asyncio
+import logging
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class ListingPage:
+    """One fetched page. listings is None when the server answered 304 Not Modified."""
+
+    page: int
+    total_pages: int
+    listing_ids: tuple[str, ...]
+    listings: list[dict[str, Any]] | None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.listings is None
+
+
+@dataclass(frozen=True)
+class _Validators:
+    etag: str | None
+    last_modified: str | None
+    total_pages: int
+    listing_ids: tuple[str, ...]
+
+
+class JobListingsClient:
+    """
+    Pooled, bounded-concurrency page fetcher. One instance keeps one
+    httpx.AsyncClient (created on first use, bound to that event loop) and the
+    per-page validators used for conditional requests.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        page_size: int = 100,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_s: float = 0.2,
+        timeout_s: float = 10.0,
+        max_pages: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._base_url = base_url
+        self._page_size = page_size
+        self._concurrency = max(1, concurrency)
+        self._max_retries = max(0, max_retries)
+        self._backoff = backoff_s
+        self._timeout = timeout_s
+        self._max_pages = max_pages
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._validators: dict[int, _Validators] = {}
+        self.requests = 0
+        self.pages_changed = 0
+        self.pages_not_modified = 0
+        self.retries = 0
+        self.failures = 0
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "JobListingsClient":
+        return cls(
+            settings.job_market_api_url,
+            page_size=settings.job_market_api_page_size,
+            concurrency=settings.job_market_api_concurrency,
+            max_retries=settings.job_market_api_max_retries,
+            backoff_s=settings.job_market_api_backoff_s,
+            timeout_s=settings.job_market_api_timeout_s,
+            max_pages=settings.job_market_api_max_pages,
+        )
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._concurrency,
+                    max_keepalive_connections=self._concurrency,
+                ),
+                transport=self._transport,
+                headers={"Accept": "application/json", "Accept-Encoding": "gzip"},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "JobListingsClient":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    def _retry_delay(self, attempt: int, response: httpx.Response | None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self._backoff * (2 ** attempt) * (0.5 + random.random())
+
+    async def fetch_page(self, page: int) -> ListingPage:
+        """Fetch one page, conditionally if it was seen before, retrying transient failures."""
+        cached = self._validators.get(page)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        params = {"page": page, "per_page": self._page_size}
+
+        attempt = 0
+        while True:
+            response: httpx.Response | None = None
+            try:
+                self.requests += 1
+                response = await self._http().get(self._base_url, params=params, headers=headers)
+                if response.status_code not in _RETRY_STATUSES:
+                    break
+                error: Exception = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            except httpx.TransportError as e:
+                error = e
+            if attempt >= self._max_retries:
+                self.failures += 1
+                raise error
+            delay = self._retry_delay(attempt, response)
+            attempt += 1
+            self.retries += 1
+            logger.debug("Listings page %d failed (%s); retry %d in %.2fs", page, error, attempt, delay)
+            await asyncio.sleep(delay)
+
+        if response.status_code == 304 and cached is not None:
+            self.pages_not_modified += 1
+            return ListingPage(page, cached.total_pages, cached.listing_ids, None)
+        response.raise_for_status()
+
+        body = response.json()
+        listings = body.get("listings") or body.get("results") or body.get("data") or []
+        total_pages = body.get("total_pages")
+        if total_pages is None:
+            total = body.get("total")
+            total_pages = math.ceil(total / self._page_size) if total is not None else page
+        ids = tuple(str(item.get("id")) for item in listings if item.get("id") is not None)
+        self._validators[page] = _Validators(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            total_pages=int(total_pages),
+            listing_ids=ids,
+        )
+        self.pages_changed += 1
+        return ListingPage(page, int(total_pages), ids, listings)
+
+    async def iter_pages(self) -> AsyncIterator[ListingPage]:
+        """
+        Yield every page as it arrives: page 1 first (it carries total_pages), then
+        the rest concurrently, at most `concurrency` in flight, in completion order.
+        """
+        first = await self.fetch_page(1)
+        yield first
+        last = first.total_pages
+        if self._max_pages is not None:
+            last = min(last, self._max_pages)
+        if last < 2:
+            return
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def bounded(page: int) -> ListingPage:
+            async with semaphore:
+                return await self.fetch_page(page)
+
+        tasks = [asyncio.ensure_future(bounded(page)) for page in range(2, last + 1)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_all(self) -> list[dict[str, Any]]:
+        """All listings of changed pages (unchanged pages are skipped)."""
+        out: list[dict[str, Any]] = []
+        async for page in self.iter_pages():
+            if page.listings is not None:
+                out.extend(page.listings)
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "base_url": self._base_url,
+            "requests": self.requests,
+            "pages_changed": self.pages_changed,
+            "pages_not_modified": self.pages_not_modified,
+            "retries": self.retries,
+            "failures": self.failures,
+            "cached_pages": len(self._validators),
+        }
@@ -1,18 +1,44 @@
 """
-Job market recommendation service: fetches (simulated) job listing data,
+Job market recommendation service: fetches job listing data (paginated API or simulated),
 runs skill demand analysis, and updates roadmap skill priority.
+
+Skill demand is served from an immutable MarketSnapshot that a background task
+rebuilds on an interval, so request handlers never fetch or rank listings. Each
+snapshot is also persisted (services.snapshot_store) so a restarted process maps
+the last one from disk instead of rebuilding it.
 """
 
+import asyncio
+import contextlib
+import logging
+import os
 import random
-from datetime import datetime, timedelta
-from typing import Any
+import threading
+import time
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
+from config import get_settings
+from services.market_snapshot import MarketSnapshot
+from services.learning_paths import load_learning_paths
 from services.skill_demand_analyzer import (
-    extract_skill_frequency,
+    SkillFrequencyIndex,
+    listing_skills,
     rank_skills_by_demand,
+    to_timestamp,
 )
+from services.skill_matcher import get_skill_matcher
+from services.topic_index import TopicSkillIndex
+
+if TYPE_CHECKING:
+    from services.job_listings_client import JobListingsClient
+    from services.skill_history import SkillDemandHistory
+    from services.step_skill_matrix import StepSkillMatrix
 from services.roadmap_service import RoadmapService
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 def fetch_job_listings_simulated(limit: int = 200) -> list[dict[str, Any]]:
     """
@@ -41,46 +67,514 @@ def fetch_job_listings_simulated(limit: int = 200) -> list[dict[str, Any]]:
     return out
 
 
+logger = logging.getLogger(__name__)
+
+
 class JobMarketService:
     """
     Fetches job market data, computes skill demand, and produces
     roadmap updates (skill priority) for the recommendation system.
+
+    The current MarketSnapshot is swapped in as a whole by refresh_snapshot();
+    readers take one reference and never see a half-built ranking.
     """
 
-    def __init__(self) -> None:
-        self._roadmap_service = RoadmapService()
+    def __init__(self, snapshot_listings: int | None = None) -> None:
+        settings = get_settings()
+        self._roadmap_service = RoadmapService(cache_size=0)
+        self._snapshot_listings = snapshot_listings or settings.market_snapshot_listings
+        self._api_url = settings.job_market_api_url
+        self._api_client: "JobListingsClient | None" = None
+        decay_days = settings.market_trend_decay_days or None
+        self._decay_days = decay_days
+        self._snapshot_path = self._resolve_path(settings.market_snapshot_path)
+        self._snapshot_max_age_s = settings.market_snapshot_max_age_s
+        self._index = SkillFrequencyIndex(decay_days=decay_days)
+        self._topics, self._step_skills = self._load_learning_path_indexes(
+            decay_days, settings.market_topic_min_score
+        )
+        from services.skill_history import SkillDemandHistory
+
+        self._history = SkillDemandHistory(days=settings.market_history_days)
+        self._snapshot: MarketSnapshot | None = None
+        self._refresh_lock = threading.Lock()
+        self._next_version = 1
+        self._persisted_sig: tuple[int, int, int] | None = None
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.last_error: str | None = None
+
+    @staticmethod
+    def _resolve_path(path: str | None) -> str | None:
+        if not path:
+            return None
+        return path if os.path.isabs(path) else os.path.normpath(os.path.join(BASE_DIR, path))
+
+    @staticmethod
+    def _load_learning_path_indexes(
+        decay_days: float | None,
+        topic_min_score: float,
+    ) -> "tuple[TopicSkillIndex | None, StepSkillMatrix | None]":
+        """Topic skill index and step x skill matrix from the learning path catalog (None if unavailable)."""
+        try:
+            learning_paths = load_learning_paths()
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning("Topic skill index and step scoring disabled: %s", e)
+            return None, None
+        from services.step_skill_matrix import StepSkillMatrix
+
+        return (
+            TopicSkillIndex.from_learning_paths(learning_paths, decay_days=decay_days, min_score=topic_min_score),
+            StepSkillMatrix.from_learning_paths(learning_paths),
+        )
+
+    @property
+    def index(self) -> SkillFrequencyIndex:
+        return self._index
 
-    def get_skill_demand_ranking(self, limit: int = 200, top_skills: int = 30) -> list[dict[str, Any]]:
+    @property
+    def topic_index(self) -> TopicSkillIndex | None:
+        return self._topics
+
+    @property
+    def history(self) -> "SkillDemandHistory":
+        return self._history
+
+    def _upsert(self, listing: dict[str, Any]) -> str:
+        listing_id = str(listing["id"])
+        skills = listing_skills(listing)
+        posted_at = to_timestamp(listing.get("posted_at"))
+        self._index.add(listing_id, skills, posted_at)
+        if self._topics is not None:
+            self._topics.add(listing_id, skills, posted_at)
+        self._history.add(listing_id, skills, posted_at)
+        return listing_id
+
+    def _retire_missing(self, seen: set[str]) -> int:
+        stale = [listing_id for listing_id in self._index.listing_ids() if listing_id not in seen]
+        for listing_id in stale:
+            self._index.remove(listing_id)
+            if self._topics is not None:
+                self._topics.remove(listing_id)
+        return len(stale)
+
+    def sync_listings(self, listings: list[dict[str, Any]]) -> tuple[int, int]:
         """
-        Fetch (simulated) job listings, extract skills, rank by demand.
-        Returns list of {"skill", "demand_score", "rank"}.
+        Make the skill (and topic) indexes match a full feed: upsert every listing
+        and retire ids no longer present. Returns (upserted, retired).
+        """
+        seen = {self._upsert(listing) for listing in listings}
+        return len(seen), self._retire_missing(seen)
+
+    async def _pull_api(self, client: "JobListingsClient", lock_pages: bool) -> tuple[set[str], int]:
+        """
+        Stream the listings API into the indexes page by page as pages arrive;
+        unchanged (304) pages are skipped. Returns (every listing id in the feed,
+        number of changed pages).
+        """
+        seen: set[str] = set()
+        changed = 0
+        async for page in client.iter_pages():
+            seen.update(page.listing_ids)
+            if page.listings is None:
+                continue
+            changed += 1
+            with self._refresh_lock if lock_pages else contextlib.nullcontext():
+                for listing in page.listings:
+                    if listing.get("id") is not None:
+                        self._upsert(listing)
+        return seen, changed
+
+    async def _pull_api_once(self) -> set[str]:
+        from services.job_listings_client import JobListingsClient
+
+        async with JobListingsClient.from_settings(get_settings()) as client:
+            seen, _ = await self._pull_api(client, lock_pages=False)
+            return seen
+
+    def build_snapshot(self, version: int) -> MarketSnapshot:
         """
-        listings = fetch_job_listings_simulated(limit=limit)
-        counts = extract_skill_frequency(listings)
-        return rank_skills_by_demand(
+        Rank the indexed (time-decayed) skill demand, overall and per topic, and
+        build the skill co-occurrence matrix and a copy of the daily demand
+        history into a new snapshot.
+        """
+        start = time.perf_counter()
+        counts = self._index.counts()
+        ranking = rank_skills_by_demand(
             counts,
-            listing_dates=None,
-            decay_days=None,
-            top_n=top_skills,
+            top_n=len(counts),
+            decayed=self._index.decayed,
         )
+        topic_rankings: dict[str, tuple[tuple[str, float], ...]] = {}
+        topic_listings: dict[str, int] = {}
+        if self._topics is not None:
+            for topic, topic_ranking in self._topics.rankings().items():
+                topic_rankings[topic] = tuple((r["skill"], r["demand_score"]) for r in topic_ranking)
+                topic_listings[topic] = self._topics.listings_count(topic)
+        from services.skill_matrix import SkillMatrix
 
-    def update_roadmap_based_on_market(
+        associations = SkillMatrix.from_index(self._index).associations()
+        decayed = self._index.decayed
+        return MarketSnapshot(
+            version=version,
+            created_at=datetime.utcnow(),
+            listings_count=len(self._index),
+            skill_counts=MappingProxyType(counts),
+            ranking=tuple((r["skill"], r["demand_score"]) for r in ranking),
+            topic_rankings=MappingProxyType(topic_rankings),
+            topic_listings=MappingProxyType(topic_listings),
+            decayed_scores=MappingProxyType(decayed.scores() if decayed is not None else {}),
+            decay_days=self._decay_days,
+            associations=associations,
+            history=self._history.snapshot(),
+            build_time_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def refresh_snapshot(self, if_missing: bool = False) -> MarketSnapshot:
+        """
+        Fetch listings, rebuild the snapshot and swap it in. Keeps the old one on failure.
+        With if_missing=True, only builds when no snapshot exists yet, and first tries
+        to map a fresh persisted snapshot from Settings.market_snapshot_path.
+
+        Blocking; with job_market_api_url set it runs a one-off API pull on its own
+        event loop (the background refresher uses refresh_snapshot_async instead).
+        """
+        with self._refresh_lock:
+            if if_missing and self._snapshot is not None:
+                return self._snapshot
+            if if_missing:
+                loaded = self._load_persisted()
+                if loaded is not None:
+                    return self._swap_in(loaded, persist=False)
+            try:
+                if self._api_url:
+                    self._retire_missing(asyncio.run(self._pull_api_once()))
+                else:
+                    self.sync_listings(fetch_job_listings_simulated(limit=self._snapshot_listings))
+                return self._swap_in(self.build_snapshot(version=self._next_version))
+            except Exception as e:
+                return self._refresh_failed(e)
+
+    async def refresh_snapshot_async(self) -> MarketSnapshot:
+        """
+        Refresh from the listings API with the service's pooled client, applying
+        pages as they arrive; the final retire-and-rank step runs in a thread.
+        If no page changed and no listing was retired, the current snapshot is kept.
+        Without an API URL this is refresh_snapshot() in a thread.
+        """
+        if not self._api_url:
+            return await asyncio.to_thread(self.refresh_snapshot)
+        if self._api_client is None:
+            from services.job_listings_client import JobListingsClient
+
+            self._api_client = JobListingsClient.from_settings(get_settings())
+        try:
+            seen, changed_pages = await self._pull_api(self._api_client, lock_pages=True)
+        except Exception as e:
+            with self._refresh_lock:
+                return self._refresh_failed(e)
+        return await asyncio.to_thread(self._complete_refresh, seen, changed_pages)
+
+    def _complete_refresh(self, seen: set[str], changed_pages: int) -> MarketSnapshot:
+        with self._refresh_lock:
+            try:
+                retired = self._retire_missing(seen)
+                if not changed_pages and not retired and self._snapshot is not None:
+                    return self._snapshot
+                return self._swap_in(self.build_snapshot(version=self._next_version))
+            except Exception as e:
+                return self._refresh_failed(e)
+
+    def _load_persisted(self) -> MarketSnapshot | None:
+        """The persisted snapshot if it exists and is intact, fresh and built with our decay settings."""
+        if not self._snapshot_path or not os.path.exists(self._snapshot_path):
+            return None
+        from services.snapshot_store import SnapshotLoadError, load_snapshot
+
+        try:
+            return load_snapshot(
+                self._snapshot_path,
+                max_age_s=self._snapshot_max_age_s,
+                decay_days=self._decay_days,
+            )
+        except SnapshotLoadError as e:
+            logger.warning("Ignoring persisted market snapshot: %s", e)
+            return None
+
+    def _persisted_signature(self) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(self._snapshot_path)  # type: ignore[arg-type]
+        except (OSError, TypeError):
+            return None
+        # write_snapshot replaces the file, so the inode changes with every write
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def load_persisted_if_newer(self) -> bool:
+        """
+        Swap in the persisted snapshot if the file changed and holds a newer version
+        than the current one (written by the process that runs the refresher).
+        Returns True on swap.
+        """
+        sig = self._persisted_signature()
+        if sig is None or sig == self._persisted_sig:
+            return False
+        loaded = self._load_persisted()
+        self._persisted_sig = sig
+        if loaded is None:
+            return False
+        with self._refresh_lock:
+            if self._snapshot is not None and loaded.version <= self._snapshot.version:
+                return False
+            self._swap_in(loaded, persist=False)
+        return True
+
+    def _persist(self, snapshot: MarketSnapshot) -> None:
+        if not self._snapshot_path:
+            return
+        from services.snapshot_store import write_snapshot
+
+        try:
+            size = write_snapshot(self._snapshot_path, snapshot)
+            self._persisted_sig = self._persisted_signature()
+            logger.debug("Persisted market snapshot v%d (%d bytes)", snapshot.version, size)
+        except OSError as e:
+            logger.warning("Could not persist market snapshot to %s: %s", self._snapshot_path, e)
+
+    def _swap_in(self, snapshot: MarketSnapshot, persist: bool = True) -> MarketSnapshot:
+        """Publish a new snapshot (caller holds the refresh lock) and persist it."""
+        if persist:
+            self._persist(snapshot)
+        self._next_version = snapshot.version + 1
+        self._snapshot = snapshot
+        self.refreshes += 1
+        self.last_error = None
+        logger.info(
+            "Market snapshot v%d: %d listings, %d skills (%.1f ms)",
+            snapshot.version,
+            snapshot.listings_count,
+            len(snapshot.skill_counts),
+            snapshot.build_time_ms,
+        )
+        return snapshot
+
+    def _refresh_failed(self, error: Exception) -> MarketSnapshot:
+        """Record a failed refresh and keep serving the current snapshot (raise if there is none)."""
+        self.failed_refreshes += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        if self._snapshot is None:
+            raise error
+        logger.error("Market snapshot refresh failed, keeping v%d: %s", self._snapshot.version, self.last_error)
+        return self._snapshot
+
+    @property
+    def snapshot(self) -> MarketSnapshot:
+        """Current snapshot; built synchronously only if nothing has built one yet."""
+        current = self._snapshot
+        return current if current is not None else self.refresh_snapshot(if_missing=True)
+
+    async def run_refresher(self, interval_s: float) -> None:
+        """
+        Rebuild the snapshot every interval_s seconds until cancelled. An existing
+        snapshot (e.g. loaded from disk) is rebuilt once it is interval_s old.
+        A newer persisted snapshot (from a previous refresher process) is adopted
+        first, so version numbers keep increasing across restarts.
+        """
+        try:
+            await asyncio.to_thread(self.load_persisted_if_newer)
+        except Exception:
+            logger.exception("Could not read the persisted market snapshot")
+        if self._snapshot is not None:
+            await asyncio.sleep(max(0.0, interval_s - self._snapshot.age_seconds()))
+        while True:
+            try:
+                await self.refresh_snapshot_async()
+            except Exception:
+                logger.exception("Market snapshot build failed")
+            await asyncio.sleep(interval_s)
+
+    async def run_follower(self, interval_s: float) -> None:
+        """
+        Instead of rebuilding, poll the persisted snapshot every interval_s seconds
+        and swap in newer versions written by the one process running run_refresher
+        (see serve.py), so all workers serve the same snapshot versions.
+        """
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await asyncio.to_thread(self.load_persisted_if_newer)
+            except Exception:
+                logger.exception("Could not load the persisted market snapshot")
+
+    async def aclose(self) -> None:
+        """Close the pooled listings API client (called on shutdown)."""
+        if self._api_client is not None:
+            await self._api_client.aclose()
+            self._api_client = None
+
+    def after_fork(self) -> None:
+        """
+        Re-create the refresh lock in a forked worker; the preloaded snapshot is kept
+        and the API client is re-created on the worker's own event loop.
+        """
+        self._refresh_lock = threading.Lock()
+        self._history.after_fork()
+        self._api_client = None
+
+    def stats(self) -> dict[str, Any]:
+        current = self._snapshot
+        return {
+            "snapshot": current.metadata() if current is not None else None,
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "last_error": self.last_error,
+            "listings_api": self._api_client.stats() if self._api_client is not None else None,
+        }
+
+    def market_topic(self, topic: str | None, snapshot: MarketSnapshot) -> str | None:
+        """
+        Catalog name of the learning path topic to rank within, or None to rank the
+        whole market (unknown topic, no catalog, or no listings for the topic).
+        """
+        resolved = self._topics.resolve(topic) if self._topics is not None else None
+        return resolved if resolved and snapshot.topic_rankings.get(resolved) else None
+
+    def get_skill_demand_ranking(
+        self,
+        top_skills: int = 30,
+        snapshot: MarketSnapshot | None = None,
+        topic: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Top skills by demand from the current market snapshot, restricted to a
+        learning path topic's listings when the topic is known and has any.
+        Returns list of {"skill", "demand_score", "rank"}.
+        """
+        snapshot = snapshot or self.snapshot
+        return snapshot.top(top_skills, topic=self.market_topic(topic, snapshot))
+
+    def get_related_skills(
+        self,
+        skill: str,
+        top_n: int = 10,
+        measure: str = "jaccard",
+        snapshot: MarketSnapshot | None = None,
+    ) -> list[dict[str, Any]]:
+        """Skills that co-occur with `skill` in the snapshot's listings (alias-aware)."""
+        snapshot = snapshot or self.snapshot
+        if snapshot.associations is None:
+            return []
+        name = get_skill_matcher().canonical(skill) or skill.strip().lower()
+        return snapshot.associations.related(name, top_n=top_n, measure=measure)
+
+    def get_skill_history(
+        self,
+        skill: str,
+        days: int = 90,
+        window: int = 7,
+        end: date | None = None,
+        snapshot: MarketSnapshot | None = None,
+    ) -> dict[str, Any]:
+        """
+        Daily demand for one skill (alias-aware) over `days` days ending at `end`:
+        the per-day series, its trailing `window`-day moving average, and growth
+        (last window vs the one before) and momentum. O(days + window).
+        """
+        snapshot = snapshot or self.snapshot
+        name = get_skill_matcher().canonical(skill) or skill.strip().lower()
+        history = snapshot.history
+        if history is None:
+            return {"skill": name, "known": False, "series": [], "moving_average": [], "growth": None}
+        return {
+            "skill": name,
+            "known": name in history,
+            "series": history.series(name, days, end),
+            "moving_average": history.moving_average(name, days, window, end),
+            "growth": history.growth(name, days, window, end),
+        }
+
+    def _demand_vector(self, snapshot: MarketSnapshot, market_topic: str | None) -> Any:
+        """Step-matrix demand vector of a snapshot's (topic) ranking, built once per snapshot."""
+        key = ("step_demand", market_topic)
+        demand = snapshot.derived.get(key)
+        if demand is None:
+            demand = self._step_skills.demand_vector(snapshot.ranking_for(market_topic))
+            # Concurrent first requests may each build it; setdefault keeps a single copy
+            demand = snapshot.derived.setdefault(key, demand)
+        return demand
+
+    def score_roadmap_steps(
+        self,
+        topic: str | None,
+        snapshot: MarketSnapshot | None = None,
+        top_skills: int = 25,
+        order: str = "catalog",
+    ) -> list[dict[str, Any]] | None:
+        """
+        A learning path topic's steps scored by market demand for the skills they
+        teach (see StepSkillMatrix.rank_steps), or None without a known topic.
+        """
+        if self._step_skills is None or self._step_skills.resolve(topic) is None:
+            return None
+        snapshot = snapshot or self.snapshot
+        market_topic = self.market_topic(topic, snapshot)
+        demand = self._demand_vector(snapshot, market_topic)
+        top = [s for s, _ in snapshot.ranking_for(market_topic)[:top_skills]]
+        return self._step_skills.rank_steps(topic, demand, top_skills=top, order=order)
+
+    def market_roadmap_fields(
         self,
-        roadmap_difficulty: int,
         topic: str | None = None,
-        job_listings_limit: int = 200,
         top_skills: int = 25,
+        snapshot: MarketSnapshot | None = None,
+        step_order: str = "catalog",
     ) -> dict[str, Any]:
         """
-        Combine current difficulty config with market-driven skill priority.
-        Returns full roadmap config JSON including skill_priority from job market.
+        The difficulty-independent part of a market-driven roadmap config:
+        skill_priority, scored roadmap_steps (catalog topics only) and snapshot
+        metadata. Merge into a difficulty config with apply_market_fields().
         """
-        ranking = self.get_skill_demand_ranking(limit=job_listings_limit, top_skills=top_skills)
+        snapshot = snapshot or self.snapshot
+        market_topic = self.market_topic(topic, snapshot)
+        ranking = snapshot.top(top_skills, topic=market_topic)
+        fields: dict[str, Any] = {"skill_priority": ranking}
+        steps = self.score_roadmap_steps(topic, snapshot, top_skills=top_skills, order=step_order)
+        if steps is not None:
+            fields["roadmap_steps"] = steps
+            fields["step_order"] = step_order
+        fields["market_topic"] = market_topic
+        fields["market_updated_at"] = snapshot.created_at.isoformat()
+        fields["market_snapshot_version"] = snapshot.version
+        fields["market_driven_skills_count"] = len(ranking)
+        return fields
+
+    def apply_market_fields(
+        self,
+        roadmap_difficulty: int,
+        fields: dict[str, Any],
+        topic: str | None = None,
+    ) -> dict[str, Any]:
+        """Roadmap config for a difficulty with market_roadmap_fields() merged in."""
         config = self._roadmap_service.generate_roadmap_config(
             roadmap_difficulty=roadmap_difficulty,
-            skill_priority_override=ranking,
+            skill_priority_override=fields["skill_priority"],
             topic=topic,
         )
-        config["market_updated_at"] = datetime.utcnow().isoformat()
-        config["market_driven_skills_count"] = len(ranking)
+        config.update((k, v) for k, v in fields.items() if k != "skill_priority")
         return config
+
+    def update_roadmap_based_on_market(
+        self,
+        roadmap_difficulty: int,
+        topic: str | None = None,
+        top_skills: int = 25,
+        snapshot: MarketSnapshot | None = None,
+        step_order: str = "catalog",
+    ) -> dict[str, Any]:
+        """
+        Combine current difficulty config with market-driven skill priority.
+        Returns full roadmap config JSON including skill_priority from job market
+        and, for a catalog topic, its steps scored (and with step_order="market",
+        sorted) by market demand.
+        """
+        fields = self.market_roadmap_fields(topic, top_skills, snapshot, step_order)
+        return self.apply_market_fields(roadmap_difficulty, fields, topic=topic)
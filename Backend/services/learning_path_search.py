@@ -0,0 +1,247 @@
+"""
+BM25 full-text search over learning path steps.
+
+Each roadmap step is one document made of its title, description and resource
+titles (title terms weighted higher). The inverted index maps every term to
+NumPy arrays of (document id, weighted term frequency); documents of a topic
+are contiguous, so a topic filter is a slice. A query scores only the postings
+of its terms into one dense score array and selects the top hits with
+argpartition. The last query term also matches as a prefix ("dock" -> docker).
+
+The index can be saved to / loaded from a prebuilt .npz file that records a
+fingerprint of the catalog it was built from.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import IO, Any
+
+import numpy as np
+
+from services.learning_paths import BASE_DIR, LearningPathCatalog
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+FIELD_WEIGHTS = {"title": 2.0, "description": 1.0, "resources": 1.0}
+SERIAL_VERSION = 1
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric terms; '+' and '#' stay attached (c++, c#)."""
+    return _TOKEN.findall(text.lower())
+
+
+def _step_fields(step: dict[str, Any]) -> dict[str, str]:
+    titles: list[str] = []
+    resources = step.get("resources") or {}
+    if isinstance(resources, dict):
+        for items in resources.values():
+            for item in items or []:
+                titles.append(item.get("title", "") if isinstance(item, dict) else str(item))
+    return {
+        "title": str(step.get("title") or ""),
+        "description": str(step.get("description") or ""),
+        "resources": "\n".join(titles),
+    }
+
+
+def catalog_fingerprint(catalog: LearningPathCatalog) -> str:
+    """Hash of every topic's steps; a prebuilt index is only used for the catalog it was built from."""
+    h = hashlib.blake2b(digest_size=16)
+    for topic in catalog.topics:
+        h.update(json.dumps([topic, catalog.get(topic).steps], sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+class LearningPathSearchIndex:
+    """
+    Inverted index with BM25 scoring (k1, b) over step documents; per-posting
+    score contributions are precomputed, so a query only gathers and adds them.
+
+    docs[i] = (topic, step number, title); postings[term] = (doc ids, weighted tf).
+    """
+
+    def __init__(
+        self,
+        docs: list[tuple[str, int, str]],
+        doc_lengths: np.ndarray,
+        postings: dict[str, tuple[np.ndarray, np.ndarray]],
+        fingerprint: str = "",
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.docs = docs
+        self.fingerprint = fingerprint
+        self.k1 = k1
+        self.b = b
+        self._postings = postings
+        self._terms = sorted(postings)
+        self._doc_lengths = doc_lengths.astype(np.float32)
+        self._topic_ranges: dict[str, tuple[int, int]] = {}
+        for i, (topic, _, _) in enumerate(docs):
+            start, _ = self._topic_ranges.get(topic, (i, i))
+            self._topic_ranges[topic] = (start, i + 1)
+        n = len(docs)
+        avg = float(self._doc_lengths.mean()) if n else 1.0
+        # Length normalisation k1 * (1 - b + b * len / avg) is per document; precompute it
+        self._norm = (k1 * (1 - b + b * self._doc_lengths / (avg or 1.0))).astype(np.float32)
+        # Scores do not depend on the query beyond which terms it has, so each
+        # posting's BM25 contribution idf * tf * (k1 + 1) / (tf + norm) is precomputed
+        self._impacts: dict[str, np.ndarray] = {}
+        for term, (ids, tf) in postings.items():
+            idf = np.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            self._impacts[term] = (idf * tf * (k1 + 1) / (tf + self._norm[ids])).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._terms)
+
+    @classmethod
+    def from_catalog(cls, catalog: LearningPathCatalog, k1: float = 1.2, b: float = 0.75) -> "LearningPathSearchIndex":
+        docs: list[tuple[str, int, str]] = []
+        lengths: list[float] = []
+        builder: dict[str, tuple[list[int], list[float]]] = {}
+        for topic in catalog.topics:
+            for position, step in enumerate(catalog.get(topic).steps, start=1):
+                doc_id = len(docs)
+                fields = _step_fields(step)
+                docs.append((topic, int(step.get("step") or position), fields["title"]))
+                tf: dict[str, float] = {}
+                length = 0.0
+                for name, text in fields.items():
+                    weight = FIELD_WEIGHTS[name]
+                    for term in tokenize(text):
+                        tf[term] = tf.get(term, 0.0) + weight
+                        length += weight
+                lengths.append(length)
+                for term, freq in tf.items():
+                    ids, freqs = builder.setdefault(term, ([], []))
+                    ids.append(doc_id)
+                    freqs.append(freq)
+        postings = {
+            term: (np.array(ids, dtype=np.int32), np.array(freqs, dtype=np.float32))
+            for term, (ids, freqs) in builder.items()
+        }
+        return cls(docs, np.array(lengths, dtype=np.float32), postings, catalog_fingerprint(catalog), k1, b)
+
+    def _expand(self, term: str, limit: int = 32) -> list[str]:
+        """Indexed terms starting with `term` (at most `limit`, shortest first)."""
+        i = bisect.bisect_left(self._terms, term)
+        found: list[str] = []
+        while i < len(self._terms) and self._terms[i].startswith(term) and len(found) < limit * 4:
+            found.append(self._terms[i])
+            i += 1
+        return sorted(found, key=len)[:limit]
+
+    def search(
+        self,
+        query: str,
+        topic: str | None = None,
+        limit: int = 10,
+        prefix: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Top steps for a query as {"topic", "step", "title", "score", "matched"}.
+        topic restricts results to one catalog topic (exact catalog name).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.docs:
+            return []
+        lo, hi = self._topic_ranges.get(topic, (0, 0)) if topic is not None else (0, len(self.docs))
+        if lo == hi:
+            return []
+        expanded: dict[str, None] = dict.fromkeys(t for t in terms if t in self._postings)
+        if prefix:
+            for term in self._expand(terms[-1]):
+                expanded[term] = None
+        scores = np.zeros(hi - lo, dtype=np.float32)
+        matched = np.zeros(hi - lo, dtype=np.int32)
+        for bit, term in enumerate(expanded):
+            ids, impact = self._postings[term][0], self._impacts[term]
+            if topic is not None:
+                a, z = np.searchsorted(ids, (lo, hi))
+                ids, impact = ids[a:z], impact[a:z]
+            scores[ids - lo] += impact
+            if bit < 31:
+                matched[ids - lo] |= 1 << bit
+        hits = np.flatnonzero(scores)
+        if hits.size > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        names = list(expanded)
+        results = []
+        for i in hits:
+            topic_name, step, title = self.docs[lo + i]
+            bits = int(matched[i])
+            results.append({
+                "topic": topic_name,
+                "step": step,
+                "title": title,
+                "score": round(float(scores[i]), 4),
+                "matched": [t for k, t in enumerate(names[:31]) if bits >> k & 1],
+            })
+        return results
+
+    def save(self, file: str | IO[bytes]) -> None:
+        """Write the index as .npz: concatenated postings plus a JSON header (docs, terms, offsets)."""
+        terms = self._terms
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(self._postings[t][0]) for t in terms], out=offsets[1:])
+        header = {
+            "version": SERIAL_VERSION,
+            "fingerprint": self.fingerprint,
+            "k1": self.k1,
+            "b": self.b,
+            "docs": self.docs,
+            "terms": terms,
+        }
+        empty_ids, empty_tf = np.empty(0, np.int32), np.empty(0, np.float32)
+        np.savez(
+            file,
+            header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+            offsets=offsets,
+            ids=np.concatenate([self._postings[t][0] for t in terms]) if terms else empty_ids,
+            tf=np.concatenate([self._postings[t][1] for t in terms]) if terms else empty_tf,
+            doc_lengths=self._doc_lengths,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LearningPathSearchIndex":
+        """Read an index written by save(). Raises ValueError for other versions or bad files."""
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(data["header"].tobytes())
+            if header.get("version") != SERIAL_VERSION:
+                raise ValueError(f"Unsupported search index version {header.get('version')} in {path}")
+            offsets, ids, tf = data["offsets"], data["ids"], data["tf"]
+            postings = {
+                term: (ids[offsets[i]:offsets[i + 1]], tf[offsets[i]:offsets[i + 1]])
+                for i, term in enumerate(header["terms"])
+            }
+            docs = [(topic, int(step), title) for topic, step, title in header["docs"]]
+            return cls(docs, data["doc_lengths"], postings, header["fingerprint"], header["k1"], header["b"])
+
+
+def load_or_build(catalog: LearningPathCatalog, path: str | None = None) -> LearningPathSearchIndex:
+    """
+    The prebuilt index at path (relative paths resolve from Backend/) if it was
+    built from this catalog, otherwise a fresh index built from the catalog.
+    """
+    if path:
+        path = path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+        try:
+            index = LearningPathSearchIndex.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Prebuilt search index %s not used: %s", path, e)
+        else:
+            if index.fingerprint == catalog_fingerprint(catalog):
+                return index
+            logger.warning("Prebuilt search index %s is for a different catalog; rebuilding", path)
+    return LearningPathSearchIndex.from_catalog(catalog)
@@ -0,0 +1,194 @@
+"""
+Learning path catalog shared with the frontend (Frontend/data/learningPath.json):
+a list of {"topic", "roadmap": [{"step", "title", "description", "resources"}]}.
+
+LearningPathCatalog indexes it by topic so the API can serve one topic, or a
+range of its steps, instead of the whole file.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from config import get_settings
+from services.response_cache import PrecompressedResponse, ResponseCache
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StepRangeError(IndexError):
+    """A requested step range starts past the last step of its topic."""
+
+    def __init__(self, topic: str, start: int, total: int) -> None:
+        super().__init__(f"Step {start} is out of range: {topic} has {total} steps")
+        self.topic = topic
+        self.start = start
+        self.total = total
+
+
+def topic_key(topic: str) -> str:
+    """Case- and whitespace-insensitive lookup key for a topic name."""
+    return " ".join(topic.lower().split())
+
+
+def learning_paths_file() -> str:
+    path = get_settings().learning_paths_path
+    return path if os.path.isabs(path) else os.path.normpath(os.path.join(BASE_DIR, path))
+
+
+def load_learning_paths(path: str | None = None) -> list[dict[str, Any]]:
+    """Read the learning path catalog. Raises FileNotFoundError if it is missing."""
+    path = path or learning_paths_file()
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Learning path catalog not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"Learning path catalog {path} must be a JSON list of topics")
+    return data
+
+
+def step_text(step: dict[str, Any]) -> str:
+    """Title, description and resource titles of one roadmap step, as one string."""
+    parts = [str(step.get("title") or ""), str(step.get("description") or "")]
+    resources = step.get("resources") or {}
+    if isinstance(resources, dict):
+        for items in resources.values():
+            for item in items or []:
+                parts.append(item.get("title", "") if isinstance(item, dict) else str(item))
+    return "\n".join(p for p in parts if p)
+
+
+def merge_topics(learning_paths: list[dict[str, Any]]) -> dict[str, tuple[dict[str, Any], ...]]:
+    """
+    Catalog name -> roadmap steps. Topics listed more than once (e.g. "Docker")
+    are merged under the first spelling, and renumbered 1..n if step numbers collide.
+    """
+    names: dict[str, str] = {}
+    steps: dict[str, list[dict[str, Any]]] = {}
+    for path in learning_paths:
+        topic = str(path.get("topic") or "").strip()
+        if not topic:
+            continue
+        name = names.setdefault(topic_key(topic), topic)
+        steps.setdefault(name, []).extend(s for s in path.get("roadmap") or [] if isinstance(s, dict))
+    merged: dict[str, tuple[dict[str, Any], ...]] = {}
+    for name, topic_steps in steps.items():
+        if len({s.get("step") for s in topic_steps}) != len(topic_steps):
+            topic_steps = [{**s, "step": i + 1} for i, s in enumerate(topic_steps)]
+        merged[name] = tuple(topic_steps)
+    return merged
+
+
+def _resource_count(step: dict[str, Any]) -> int:
+    resources = step.get("resources") or {}
+    if not isinstance(resources, dict):
+        return 0
+    return sum(len(items or []) for items in resources.values())
+
+
+@dataclass(frozen=True)
+class LearningPathTopic:
+    """One catalog topic: its roadmap steps in order (duplicate topics merged, steps renumbered)."""
+
+    name: str
+    steps: tuple[dict[str, Any], ...]
+
+    @property
+    def resources_count(self) -> int:
+        return sum(_resource_count(step) for step in self.steps)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "topic": self.name,
+            "steps": len(self.steps),
+            "resources": self.resources_count,
+            "step_titles": [step.get("title") for step in self.steps],
+        }
+
+
+class LearningPathCatalog:
+    """
+    The learning path catalog indexed by topic key (topic -> steps -> resources),
+    with encoded, precompressed responses for the topic list and every whole
+    topic built up front; step-range slices are encoded on first request and
+    kept in an LRU cache.
+    """
+
+    def __init__(self, learning_paths: list[dict[str, Any]], cache_size: int = 512) -> None:
+        merged = merge_topics(learning_paths)
+        self._names = {topic_key(name): name for name in merged}
+        self._topics = {name: LearningPathTopic(name, steps) for name, steps in merged.items()}
+        self._index_response = PrecompressedResponse.encode(self.index())
+        self._topic_responses = {
+            name: PrecompressedResponse.encode(self.topic_content(name)) for name in self._topics
+        }
+        self._slices = ResponseCache(max(1, cache_size), encode=PrecompressedResponse.encode)
+
+    @classmethod
+    def from_file(cls, path: str | None = None, cache_size: int | None = None) -> "LearningPathCatalog":
+        if cache_size is None:
+            cache_size = get_settings().learning_paths_response_cache_size
+        return cls(load_learning_paths(path), cache_size=cache_size)
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+    @property
+    def topics(self) -> list[str]:
+        return list(self._topics)
+
+    def resolve(self, topic: str | None) -> str | None:
+        """Catalog name of a topic (case/whitespace-insensitive), or None if unknown."""
+        return self._names.get(topic_key(topic)) if topic else None
+
+    def get(self, topic: str) -> LearningPathTopic | None:
+        name = self.resolve(topic)
+        return self._topics.get(name) if name else None
+
+    def index(self) -> dict[str, Any]:
+        topics = [topic.summary() for topic in self._topics.values()]
+        return {"success": True, "topics": topics, "count": len(topics)}
+
+    def topic_content(self, name: str, start: int = 1, end: int | None = None) -> dict[str, Any]:
+        """Response body for steps start..end (1-based, inclusive, clamped) of a catalog topic."""
+        topic = self._topics[name]
+        total = len(topic.steps)
+        end = total if end is None else min(end, total)
+        return {
+            "success": True,
+            "topic": name,
+            "total_steps": total,
+            "start": start,
+            "end": end,
+            "steps": list(topic.steps[start - 1:end]),
+        }
+
+    def index_response(self) -> PrecompressedResponse:
+        return self._index_response
+
+    def topic_response(self, topic: str, start: int = 1, end: int | None = None) -> PrecompressedResponse | None:
+        """
+        Encoded steps of a topic (optionally a step range), or None for an unknown
+        topic. Raises StepRangeError if start is past the last step.
+        """
+        name = self.resolve(topic)
+        if name is None:
+            return None
+        total = len(self._topics[name].steps)
+        end = total if end is None else min(end, total)
+        if start == 1 and end == total:
+            return self._topic_responses[name]
+        if start > total:
+            raise StepRangeError(name, start, total)
+        return self._slices.get_or_build((name, start, end), lambda: self.topic_content(name, start, end))  # type: ignore[return-value]
+
+    def record_not_modified(self) -> None:
+        self._slices.record_not_modified()
+
+    def stats(self) -> dict[str, Any]:
+        return {"topics": len(self._topics), "slice_cache": self._slices.stats()}
+
+    def after_fork(self) -> None:
+        self._slices.after_fork()
@@ -0,0 +1,205 @@
+"""
+Streaming ingestion of job listing dumps (newline-delimited JSON, optionally
+gzip-compressed) into the skill demand structures.
+
+Lines are read lazily and grouped into chunks; chunks are parsed and reduced to
+partial skill counts (and time-decayed partial scores) in a process pool, with a
+bounded number of chunks in flight, and the partials are merged in the parent.
+Memory stays bounded by chunk_size * in-flight chunks, not by file size.
+"""
+
+import gzip
+import json
+import math
+import multiprocessing as mp
+import os
+import resource
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterable, Iterator
+
+from services.skill_demand_analyzer import (
+    DecayedSkillCounter,
+    SkillFrequencyIndex,
+    listing_skills,
+    to_timestamp,
+)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_dump(path: str) -> IO[bytes]:
+    """Open a listing dump for binary line reading, transparently gunzipping."""
+    f = open(path, "rb")
+    if f.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    return f
+
+
+def iter_lines(paths: Iterable[str]) -> Iterator[bytes]:
+    """Yield non-empty raw lines from each dump in order."""
+    for path in paths:
+        with open_dump(path) as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def iter_chunks(lines: Iterable[bytes], chunk_size: int) -> Iterator[list[bytes]]:
+    chunk: list[bytes] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class ChunkResult:
+    """Partial aggregates of one chunk. decayed holds sum(exp(-(now - posted_at) / tau)) per skill."""
+
+    rows: int = 0
+    skipped: int = 0
+    counts: Counter = field(default_factory=Counter)
+    decayed: dict[str, float] = field(default_factory=dict)
+    listings: list[tuple[str, tuple[str, ...], float | None]] | None = None
+
+
+def process_chunk(
+    lines: list[bytes],
+    now: float,
+    decay_days: float | None,
+    keep_listings: bool,
+) -> ChunkResult:
+    """Parse one chunk of JSONL and reduce it to partial counts (runs in a pool worker)."""
+    result = ChunkResult(rows=len(lines), listings=[] if keep_listings else None)
+    tau = decay_days * 86400.0 if decay_days else None
+    counts = result.counts
+    decayed = result.decayed
+    for line in lines:
+        try:
+            listing = json.loads(line)
+        except ValueError:
+            result.skipped += 1
+            continue
+        if not isinstance(listing, dict):
+            result.skipped += 1
+            continue
+        skills = tuple(dict.fromkeys(listing_skills(listing)))
+        posted_at = to_timestamp(listing.get("posted_at"))
+        counts.update(skills)
+        if tau is not None:
+            weight = math.exp(((posted_at if posted_at is not None else now) - now) / tau)
+            for skill in skills:
+                decayed[skill] = decayed.get(skill, 0.0) + weight
+        if keep_listings and listing.get("id") is not None:
+            result.listings.append((str(listing["id"]), skills, posted_at))
+    return result
+
+
+@dataclass
+class IngestResult:
+    """Merged aggregates and run statistics of an ingestion."""
+
+    rows: int
+    skipped: int
+    counts: dict[str, int]
+    decayed: DecayedSkillCounter | None
+    elapsed_s: float
+    peak_rss_mb: float
+    peak_worker_rss_mb: float
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "skills": len(self.counts),
+            "elapsed_s": round(self.elapsed_s, 3),
+            "rows_per_s": round(self.rows_per_s, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "peak_worker_rss_mb": round(self.peak_worker_rss_mb, 1),
+        }
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in kB on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def ingest_listings(
+    paths: Iterable[str],
+    workers: int | None = None,
+    chunk_size: int = 5000,
+    decay_days: float | None = None,
+    index: SkillFrequencyIndex | None = None,
+    now: float | None = None,
+    max_in_flight: int | None = None,
+) -> IngestResult:
+    """
+    Stream JSONL listing dumps and merge their skill demand.
+
+    Args:
+        paths: dump files (.jsonl or gzip-compressed)
+        workers: pool processes; 0 parses in this process, None uses os.cpu_count()
+        chunk_size: lines per work unit
+        decay_days: also accumulate exp(-age/decay_days) decayed scores
+        index: optional SkillFrequencyIndex to upsert every listing into (needs ids;
+            memory then grows with the number of listings)
+        now: epoch seconds ages are measured from; current time if None
+        max_in_flight: chunks submitted but not yet merged; 2 * workers if None
+
+    Returns:
+        IngestResult with merged counts, decayed counter and rows/s and peak RSS.
+    """
+    start = time.perf_counter()
+    now = time.time() if now is None else now
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    keep_listings = index is not None
+    counts: Counter = Counter()
+    decayed = DecayedSkillCounter(decay_days) if decay_days else None
+    rows = skipped = 0
+
+    def merge(part: ChunkResult) -> None:
+        nonlocal rows, skipped
+        rows += part.rows
+        skipped += part.skipped
+        counts.update(part.counts)
+        if decayed is not None:
+            for skill, score in part.decayed.items():
+                decayed.add(skill, score, now)
+        if index is not None:
+            for listing_id, skills, posted_at in part.listings:
+                index.add(listing_id, skills, posted_at)
+
+    chunks = iter_chunks(iter_lines(paths), chunk_size)
+    if workers <= 0:
+        for chunk in chunks:
+            merge(process_chunk(chunk, now, decay_days, keep_listings))
+    else:
+        limit = max_in_flight or 2 * workers
+        pending: deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            for chunk in chunks:
+                pending.append(pool.submit(process_chunk, chunk, now, decay_days, keep_listings))
+                if len(pending) >= limit:
+                    merge(pending.popleft().result())
+            while pending:
+                merge(pending.popleft().result())
+
+    return IngestResult(
+        rows=rows,
+        skipped=skipped,
+        counts=dict(counts),
+        decayed=decayed,
+        elapsed_s=time.perf_counter() - start,
+        peak_rss_mb=_peak_rss_mb(resource.RUSAGE_SELF),
+        peak_worker_rss_mb=_peak_rss_mb(resource.RUSAGE_CHILDREN),
+    )
@@ -0,0 +1,75 @@
+"""
+Immutable, versioned snapshot of job market skill demand. Built off the request
+path (background refresh task) and read by request handlers in O(1) / O(k).
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping, Sequence
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """
+    Skill demand computed from one batch of job listings.
+
+    ranking holds (skill, demand_score) pairs sorted by demand descending;
+    readers slice it instead of re-sorting. topic_rankings holds the same per
+    learning path topic, over only that topic's listings. The containers may be
+    read-only views over a memory-mapped snapshot file (services.snapshot_store).
+    """
+
+    version: int
+    created_at: datetime
+    listings_count: int
+    skill_counts: Mapping[str, int]
+    ranking: Sequence[tuple[str, float]]
+    topic_rankings: Mapping[str, Sequence[tuple[str, float]]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    topic_listings: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    # Time-decayed per-skill scores (empty when decay is disabled)
+    decayed_scores: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+    decay_days: float | None = None
+    # SkillAssociations (skill co-occurrence) over the same listings, if built
+    associations: Any = None
+    # SkillHistoryView (per-day listing counts per skill), if built
+    history: Any = None
+    build_time_ms: float = 0.0
+    extra: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    # Values readers derive from this snapshot (e.g. step demand vectors), built on first
+    # use and dropped together with the snapshot; the snapshot's own fields never change
+    derived: dict[Any, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    def ranking_for(self, topic: str | None = None) -> Sequence[tuple[str, float]]:
+        """The topic's ranking if it has listings, otherwise the whole market's."""
+        return self.topic_rankings.get(topic or "") or self.ranking
+
+    def top(self, n: int, topic: str | None = None) -> list[dict[str, Any]]:
+        """
+        Top-n skills as {"skill", "demand_score", "rank"} dicts (O(n)); for a topic
+        with listings, ranked within that topic, otherwise across the market.
+        """
+        ranking = self.ranking_for(topic)
+        return [
+            {"skill": s, "demand_score": score, "rank": i + 1}
+            for i, (s, score) in enumerate(ranking[:n])
+        ]
+
+    def age_seconds(self, now: datetime | None = None) -> float:
+        return ((now or datetime.utcnow()) - self.created_at).total_seconds()
+
+    def metadata(self, include_age: bool = True) -> dict[str, Any]:
+        """
+        Version and freshness fields attached to API responses. Cached responses
+        leave out the age, which changes on every request.
+        """
+        meta: dict[str, Any] = {
+            "snapshot_version": self.version,
+            "snapshot_created_at": self.created_at.isoformat(),
+        }
+        if include_age:
+            meta["snapshot_age_seconds"] = round(self.age_seconds(), 3)
+        meta["listings_count"] = self.listings_count
+        return meta
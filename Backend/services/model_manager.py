@@ -0,0 +1,423 @@
+"""
+Model lifecycle management: loads versioned model artifacts, hot-swaps a new
+version in atomically when the artifact on disk changes, and optionally shadow
+scores a sampled fraction of traffic with a candidate model.
+
+Loading always happens off the request path (startup warm-up or the watcher
+thread); in-flight predictions keep using the LoadedModel they started with.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+import numpy as np
+
+from models.compiled_plan import CompiledInferencePlan
+from models.numpy_model import SCALER_EPS, NumpyRoadmapModel
+
+logger = logging.getLogger(__name__)
+
+NUM_FEATURES = 5
+INFERENCE_BACKENDS = ("torch", "numpy", "compiled")
+# Shadow comparisons queued beyond this are dropped rather than delaying anything
+_SHADOW_MAX_PENDING = 64
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_signature(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """An immutable, ready-to-run model version. Swapped as a whole, never mutated."""
+
+    backend: str
+    model: Any
+    scaler_mean: np.ndarray | None
+    scaler_scale: np.ndarray | None
+    device: Any
+    artifact_path: str
+    sha256: str
+    version: str
+    loaded_at: datetime
+    load_time_ms: float
+
+    def run(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Run the model over a raw (n, 5) metric matrix; return (classes, probabilities)."""
+        if self.backend == "compiled":
+            return self.model.run(x)
+        x = (x - self.scaler_mean) / (self.scaler_scale + SCALER_EPS)
+        if self.backend == "numpy":
+            x = x.astype(np.float32)
+            return self.model.predict_class(x), self.model.predict_proba(x)
+
+        import torch
+
+        t = torch.tensor(x, dtype=torch.float32, device=self.device)
+        with torch.no_grad():
+            probs = self.model.predict_proba(t)
+            pred = self.model.predict_class(t)
+        return pred.cpu().numpy(), probs.cpu().numpy()
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "version": self.version,
+            "artifact": os.path.basename(self.artifact_path),
+            "artifact_sha256": self.sha256,
+            "loaded_at": self.loaded_at.isoformat(),
+            "load_time_ms": round(self.load_time_ms, 3),
+        }
+
+
+def load_model(
+    backend: str,
+    model_path: str,
+    scaler_path: str,
+    weights_path: str,
+    int8_weights: bool = False,
+) -> LoadedModel:
+    """
+    Load one model version for the given backend.
+
+    "torch" reads model_path (+ scaler_path); "numpy" and "compiled" read the
+    .npz export at weights_path and never import torch.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}; expected one of {INFERENCE_BACKENDS}")
+    artifact_path = model_path if backend == "torch" else weights_path
+    start = time.perf_counter()
+    device = None
+    mean: np.ndarray | None = None
+    scale: np.ndarray | None = None
+    version: str | None = None
+
+    if backend == "torch":
+        import torch
+        from models.roadmap_model import RoadmapDifficultyModel
+
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(
+                f"Model file not found: {model_path}. Run training/train.py first."
+            )
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        checkpoint = torch.load(model_path, map_location=device, weights_only=True)
+        model = RoadmapDifficultyModel()
+        model.load_state_dict(checkpoint["model_state_dict"])
+        model.to(device)
+        model.eval()
+        version = (checkpoint.get("model_config") or {}).get("version")
+
+        if os.path.isfile(scaler_path):
+            scaler_data = torch.load(scaler_path, map_location="cpu", weights_only=False)
+            m = scaler_data["mean"]
+            s = scaler_data["scale"]
+            mean = m.numpy() if hasattr(m, "numpy") else np.array(m)
+            scale = s.numpy() if hasattr(s, "numpy") else np.array(s)
+    else:
+        if not os.path.isfile(weights_path):
+            raise FileNotFoundError(
+                f"NumPy weights not found: {weights_path}. Run training/export_numpy.py first."
+            )
+        if backend == "numpy":
+            model, mean, scale = NumpyRoadmapModel.from_npz(weights_path)
+        else:
+            model = CompiledInferencePlan.from_npz(weights_path, int8=int8_weights)
+        version = NumpyRoadmapModel.read_version(weights_path)
+
+    if backend != "compiled":
+        mean = mean if mean is not None else np.zeros(NUM_FEATURES)
+        scale = scale if scale is not None else np.ones(NUM_FEATURES)
+    load_time_ms = (time.perf_counter() - start) * 1000
+    sha256 = file_sha256(artifact_path)
+    return LoadedModel(
+        backend=backend,
+        model=model,
+        scaler_mean=mean,
+        scaler_scale=scale,
+        device=device,
+        artifact_path=artifact_path,
+        sha256=sha256,
+        version=version or sha256[:12],
+        loaded_at=datetime.utcnow(),
+        load_time_ms=load_time_ms,
+    )
+
+
+class ModelManager:
+    """
+    Owns the active LoadedModel. Readers take `current` (a single reference read)
+    and keep that version for the whole prediction, so a swap never blocks or
+    tears an in-flight request.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], LoadedModel],
+        watch_path: str,
+        poll_interval_s: float = 5.0,
+        shadow_loader: Callable[[], LoadedModel] | None = None,
+        shadow_sample_rate: float = 0.0,
+        shadow_watch_path: str | None = None,
+    ) -> None:
+        self._loader = loader
+        self._watch_path = watch_path
+        self._poll_interval = poll_interval_s
+        self._current: LoadedModel | None = None
+        self._load_lock = threading.Lock()
+        self._swap_listeners: list[Callable[[LoadedModel], None]] = []
+        self._watch_thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loaded_sig: tuple[int, int] | None = None
+        self.swaps = 0
+        self.failed_reloads = 0
+        self.last_error: str | None = None
+
+        self._shadow_loader = shadow_loader
+        self._shadow_rate = max(0.0, min(1.0, shadow_sample_rate))
+        self._shadow: LoadedModel | None = None
+        self._shadow_watch_path = shadow_watch_path
+        self._shadow_sig: tuple[int, int] | None = None
+        # Signature of a candidate file that failed to load; not retried until the file changes
+        self._shadow_failed_sig: tuple[int, int] | None = None
+        self._shadow_failed = False
+        self._shadow_executor: ThreadPoolExecutor | None = None
+        self._shadow_lock = threading.Lock()
+        self._shadow_pending = 0
+        self._shadow_sampled_rows = 0
+        self._shadow_disagreements = 0
+        self._shadow_dropped = 0
+        self._shadow_error: str | None = None
+        if shadow_loader is not None and self._shadow_rate > 0:
+            self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scorer")
+
+    @property
+    def current(self) -> LoadedModel | None:
+        return self._current
+
+    def add_swap_listener(self, callback: Callable[[LoadedModel], None]) -> None:
+        """Register a callback invoked after each successful swap (e.g. cache clear)."""
+        self._swap_listeners.append(callback)
+
+    def ensure_loaded(self) -> LoadedModel:
+        current = self._current
+        if current is not None:
+            return current
+        with self._load_lock:
+            if self._current is None:
+                sig = _file_signature(self._watch_path)
+                self._current = self._loader()
+                self._loaded_sig = sig
+            return self._current
+
+    def release(self) -> None:
+        """
+        Drop the local copy of the active model (e.g. once inference worker processes
+        hold their own); ensure_loaded() loads it again if it is needed.
+        """
+        with self._load_lock:
+            self._current = None
+
+    def reload(self) -> bool:
+        """
+        Load the artifact again and swap it in if its content changed.
+        Returns True if a new version was swapped in. On failure the current version stays.
+        """
+        with self._load_lock:
+            sig = _file_signature(self._watch_path)
+            try:
+                candidate = self._loader()
+            except Exception as e:
+                self.failed_reloads += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._loaded_sig = sig  # don't retry the same broken file every poll
+                logger.error("Model reload failed, keeping current version: %s", self.last_error)
+                return False
+            self._loaded_sig = sig
+            previous = self._current
+            if previous is not None and previous.sha256 == candidate.sha256:
+                return False
+            self._current = candidate
+            self.swaps += 1
+            self.last_error = None
+        logger.info(
+            "Model swapped: %s -> %s (load %.1f ms)",
+            previous.version if previous else None,
+            candidate.version,
+            candidate.load_time_ms,
+        )
+        for callback in self._swap_listeners:
+            callback(candidate)
+        return True
+
+    def reload_shadow(self) -> bool:
+        """
+        Load the shadow candidate again and swap it in if its content changed; its
+        comparison counters restart with the new candidate. Returns True on swap.
+        Runs on the shadow executor, so it never overlaps a shadow comparison.
+        """
+        sig = self._shadow_file_signature()
+        try:
+            candidate = self._shadow_loader()
+        except Exception as e:
+            self._shadow_sig = sig
+            self._shadow_failed_sig = sig
+            self._shadow_failed = True
+            self._shadow_error = f"{type(e).__name__}: {e}"
+            logger.error("Shadow model load failed: %s", self._shadow_error)
+            return False
+        self._shadow_sig = sig
+        self._shadow_failed = False
+        with self._shadow_lock:
+            previous = self._shadow
+            if previous is not None and previous.sha256 == candidate.sha256:
+                return False
+            self._shadow = candidate
+            self._shadow_sampled_rows = 0
+            self._shadow_disagreements = 0
+            self._shadow_error = None
+        if previous is not None:
+            logger.info("Shadow model swapped: %s -> %s", previous.version, candidate.version)
+        return True
+
+    def _shadow_file_signature(self) -> tuple[int, int] | None:
+        return _file_signature(self._shadow_watch_path) if self._shadow_watch_path else None
+
+    def start_watching(self) -> None:
+        """Start a daemon thread that polls the artifacts (active and shadow) and hot-swaps new versions."""
+        if self._watch_thread is not None:
+            return
+        self._stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+        self._watch_thread.start()
+
+    def after_fork(self) -> None:
+        """
+        Re-create locks and background threads in a forked child. The loaded model
+        itself is kept, so forked workers share its pages copy-on-write.
+        """
+        was_watching = self._watch_thread is not None
+        self._load_lock = threading.Lock()
+        self._shadow_lock = threading.Lock()
+        self._shadow_pending = 0
+        self._watch_thread = None
+        self._stop = threading.Event()
+        if self._shadow_executor is not None:
+            self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scorer")
+        if was_watching:
+            self.start_watching()
+
+    def _watch(self) -> None:
+        pending: dict[str, tuple[int, int] | None] = {}
+
+        def changed(path: str, loaded_sig: tuple[int, int] | None) -> bool:
+            sig = _file_signature(path)
+            if sig is None or sig == loaded_sig:
+                pending[path] = None
+                return False
+            # Require the same signature on two consecutive polls so a file that
+            # is still being written is not loaded half-way through.
+            if sig != pending.get(path):
+                pending[path] = sig
+                return False
+            pending[path] = None
+            return True
+
+        while not self._stop.wait(self._poll_interval):
+            if changed(self._watch_path, self._loaded_sig):
+                self.reload()
+            # The shadow candidate is loaded on its first sampled batch; after that it is watched too
+            shadow_executor = self._shadow_executor
+            if (
+                shadow_executor is not None
+                and self._shadow_watch_path
+                and self._shadow is not None
+                and changed(self._shadow_watch_path, self._shadow_sig)
+            ):
+                self._shadow_sig = _file_signature(self._shadow_watch_path)
+                shadow_executor.submit(self.reload_shadow)
+
+    def observe(self, x: np.ndarray, pred: np.ndarray) -> None:
+        """Maybe queue a shadow comparison of the candidate model on this batch."""
+        if self._shadow_executor is None or random.random() >= self._shadow_rate:
+            return
+        with self._shadow_lock:
+            if self._shadow_pending >= _SHADOW_MAX_PENDING:
+                self._shadow_dropped += 1
+                return
+            self._shadow_pending += 1
+        self._shadow_executor.submit(self._shadow_score, x.copy(), np.asarray(pred).copy())
+
+    def _shadow_score(self, x: np.ndarray, pred: np.ndarray) -> None:
+        try:
+            if self._shadow is None:
+                if self._shadow_failed and self._shadow_failed_sig == self._shadow_file_signature():
+                    return
+                if not self.reload_shadow():
+                    return
+            shadow_pred, _ = self._shadow.run(x)
+            disagreements = int((np.asarray(shadow_pred) != pred).sum())
+            with self._shadow_lock:
+                self._shadow_sampled_rows += len(pred)
+                self._shadow_disagreements += disagreements
+        except Exception as e:
+            self._shadow_error = f"{type(e).__name__}: {e}"
+        finally:
+            with self._shadow_lock:
+                self._shadow_pending -= 1
+
+    def shadow_stats(self) -> dict[str, Any]:
+        if self._shadow_executor is None:
+            return {"enabled": False}
+        with self._shadow_lock:
+            rows = self._shadow_sampled_rows
+            return {
+                "enabled": True,
+                "sample_rate": self._shadow_rate,
+                "candidate": self._shadow.describe() if self._shadow is not None else None,
+                "sampled_rows": rows,
+                "disagreements": self._shadow_disagreements,
+                "disagreement_rate": round(self._shadow_disagreements / rows, 6) if rows else 0.0,
+                "dropped_batches": self._shadow_dropped,
+                "last_error": self._shadow_error,
+            }
+
+    def stats(self) -> dict[str, Any]:
+        current = self._current
+        return {
+            "current": current.describe() if current is not None else None,
+            "watching": self._watch_thread is not None,
+            "swaps": self.swaps,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+            "shadow": self.shadow_stats(),
+        }
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=self._poll_interval + 1)
+            self._watch_thread = None
+        if self._shadow_executor is not None:
+            self._shadow_executor.shutdown(wait=False, cancel_futures=True)
@@ -1,61 +1,252 @@
 """
-Personalization engine: loads the PyTorch roadmap difficulty model and runs inference.
+Personalization engine: loads the roadmap difficulty model and runs inference.
+
+Inference backends (Settings.inference_backend):
+    "torch": PyTorch RoadmapDifficultyModel loaded from roadmap_model.pt
+    "numpy": NumpyRoadmapModel loaded from roadmap_model.npz; never imports torch
+    "compiled": CompiledInferencePlan built from roadmap_model.npz (scaler folded into
+                fc1, one logits pass, optional int8 weights); never imports torch
 """
 
+import logging
 import os
-from typing import Any
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Sequence
 
 import numpy as np
-import torch
 
 from config import get_settings
-from models.roadmap_model import RoadmapDifficultyModel
+from services.inference_pool import InferenceProcessPool
+from services.inference_scheduler import MicroBatchScheduler
+from services.model_manager import (
+    INFERENCE_BACKENDS,
+    NUM_FEATURES,
+    LoadedModel,
+    ModelManager,
+    load_model,
+)
+from services.prediction_cache import PredictionCache
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTY_LABELS = ["beginner", "intermediate", "advanced"]
 
 
 class PersonalizationService:
     """
     Production service for predicting roadmap difficulty from user metrics.
-    Uses a loaded PyTorch model and scaler; lazy-loads on first prediction if needed.
+    Uses a loaded model (PyTorch or NumPy backend) and scaler; lazy-loads on first prediction if needed.
+    The model version is owned by a ModelManager, which can hot-swap new artifacts
+    and shadow score a candidate model (see services/model_manager.py).
     """
 
-    def __init__(self, model_path: str | None = None, scaler_path: str | None = None) -> None:
+    def __init__(
+        self,
+        model_path: str | None = None,
+        scaler_path: str | None = None,
+        weights_path: str | None = None,
+        backend: str | None = None,
+        int8_weights: bool | None = None,
+        cache_size: int | None = None,
+    ) -> None:
         self._settings = get_settings()
-        self._model_path = model_path or os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            self._settings.model_path,
+        base_dir = os.path.dirname(os.path.dirname(__file__))
+        self._model_path = model_path or os.path.join(base_dir, self._settings.model_path)
+        self._scaler_path = scaler_path or os.path.join(base_dir, self._settings.scaler_path)
+        self._weights_path = weights_path or os.path.join(base_dir, self._settings.numpy_weights_path)
+        self._backend = backend or self._settings.inference_backend
+        if self._backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend {self._backend!r}; expected one of {INFERENCE_BACKENDS}")
+        self._int8_weights = (
+            self._settings.inference_int8_weights if int8_weights is None else int8_weights
         )
-        self._scaler_path = scaler_path or os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            self._settings.scaler_path,
+        self._warmup_time_ms: float | None = None
+        self._manager = ModelManager(
+            loader=lambda: load_model(
+                self._backend,
+                self._model_path,
+                self._scaler_path,
+                self._weights_path,
+                self._int8_weights,
+            ),
+            watch_path=self.artifact_path,
+            poll_interval_s=self._settings.model_watch_interval_s,
+            shadow_loader=self._shadow_loader(),
+            shadow_watch_path=self._shadow_artifact(),
+            shadow_sample_rate=self._settings.shadow_sample_rate,
         )
-        self._model: RoadmapDifficultyModel | None = None
-        self._scaler_mean: np.ndarray | None = None
-        self._scaler_scale: np.ndarray | None = None
-        self._device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-    def _ensure_loaded(self) -> None:
-        """Load model and scaler from disk if not already loaded."""
-        if self._model is not None:
-            return
-        if not os.path.isfile(self._model_path):
-            raise FileNotFoundError(
-                f"Model file not found: {self._model_path}. Run training/train.py first."
+        self._scheduler: MicroBatchScheduler | None = None
+        if self._settings.inference_batching_enabled:
+            self._scheduler = MicroBatchScheduler(
+                self._predict_matrix,
+                max_batch_size=self._settings.inference_batch_max_size,
+                max_wait_us=self._settings.inference_batch_max_wait_us,
             )
-        checkpoint = torch.load(self._model_path, map_location=self._device, weights_only=True)
-        self._model = RoadmapDifficultyModel()
-        self._model.load_state_dict(checkpoint["model_state_dict"])
-        self._model.to(self._device)
-        self._model.eval()
-
-        if os.path.isfile(self._scaler_path):
-            scaler_data = torch.load(self._scaler_path, map_location="cpu", weights_only=False)
-            mean = scaler_data["mean"]
-            scale = scaler_data["scale"]
-            self._scaler_mean = mean.numpy() if hasattr(mean, "numpy") else np.array(mean)
-            self._scaler_scale = scale.numpy() if hasattr(scale, "numpy") else np.array(scale)
-        else:
-            self._scaler_mean = np.zeros(5)
-            self._scaler_scale = np.ones(5)
+        cache_size = self._settings.prediction_cache_size if cache_size is None else cache_size
+        self._cache: PredictionCache | None = None
+        if cache_size > 0:
+            self._cache = PredictionCache(
+                max_size=cache_size,
+                quantum=self._settings.prediction_cache_quantum,
+                watch_path=self.artifact_path,
+            )
+            self._manager.add_swap_listener(lambda _model: self._cache.clear())
+        self._pool: InferenceProcessPool | None = None
+        self._pool_lock = threading.Lock()
+        self._pool_error: str | None = None
+        if self._settings.inference_pool_size > 0:
+            self._manager.add_swap_listener(self._reload_pool)
+        if self._settings.model_watch_enabled:
+            self._manager.start_watching()
+
+    def _resolve(self, path: str) -> str:
+        return path if os.path.isabs(path) else os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
+
+    def _shadow_artifact(self) -> str | None:
+        """Candidate model file scored in shadow mode, if one is configured."""
+        path = self._settings.shadow_model_path
+        return self._resolve(path) if path else None
+
+    def _shadow_loader(self):
+        """Loader for the shadow candidate model, if one is configured."""
+        path = self._shadow_artifact()
+        if path is None:
+            return None
+        if self._backend == "torch":
+            configured = self._settings.shadow_scaler_path
+
+            def load_torch() -> LoadedModel:
+                # A retrained candidate comes with its own fitted scaler (training/train.py writes it alongside)
+                if configured:
+                    scaler_path = self._resolve(configured)
+                else:
+                    sibling = os.path.join(os.path.dirname(path), os.path.basename(self._scaler_path))
+                    scaler_path = sibling if os.path.isfile(sibling) else self._scaler_path
+                return load_model("torch", path, scaler_path, self._weights_path)
+
+            return load_torch
+        return lambda: load_model(self._backend, self._model_path, self._scaler_path, path, self._int8_weights)
+
+    def _ensure_pool(self) -> InferenceProcessPool | None:
+        """
+        Start the inference process pool on first use when inference_pool_size > 0.
+        Returns None (predictions then run in this process) if it is disabled or
+        failed to start; a failed start is not retried.
+        """
+        if self._settings.inference_pool_size <= 0 or self._pool is not None or self._pool_error:
+            return self._pool
+        with self._pool_lock:
+            if self._pool is None and self._pool_error is None:
+                try:
+                    self._pool = self._start_pool()
+                except Exception as e:
+                    self._pool_error = f"{type(e).__name__}: {e}"
+                    logger.error("Inference pool failed to start, predicting in-process: %s", self._pool_error)
+        return self._pool
+
+    def _start_pool(self) -> InferenceProcessPool:
+        return InferenceProcessPool(
+            size=self._settings.inference_pool_size,
+            load_kwargs={
+                "backend": self._backend,
+                "model_path": self._model_path,
+                "scaler_path": self._scaler_path,
+                "weights_path": self._weights_path,
+                "int8_weights": self._int8_weights,
+            },
+            threads_per_worker=self._settings.inference_pool_threads_per_worker,
+            max_batch=self._settings.inference_pool_max_batch,
+        )
+
+    def _reload_pool(self, _model: LoadedModel) -> None:
+        """
+        Swap listener: move the pool workers to the new version, then drop the local
+        copy (loaded only to check the new artifact); a pool started later loads it itself.
+        """
+        pool = self._pool
+        try:
+            if pool is not None:
+                pool.reload()
+        finally:
+            self._manager.release()
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def artifact_path(self) -> str:
+        """Model file the active backend loads from."""
+        return self._model_path if self._backend == "torch" else self._weights_path
+
+    def _ensure_loaded(self) -> LoadedModel:
+        """Load model and scaler from disk if not already loaded; return the active version."""
+        return self._manager.ensure_loaded()
+
+    def reload_model(self) -> bool:
+        """Reload the artifact now and swap it in if it changed. Returns True on swap."""
+        return self._manager.reload()
+
+    def warm_up(self, batch_size: int = 32) -> dict[str, float]:
+        """
+        Load model and scaler and run one inference batch so the first real request
+        does not pay load or first-call costs. Returns timings in milliseconds.
+        """
+        start = time.perf_counter()
+        # With a process pool the workers load the model; this process keeps no copy
+        if self._ensure_pool() is None:
+            self._ensure_loaded()
+        loaded = time.perf_counter()
+        rng = np.random.default_rng(0)
+        x = np.column_stack((
+            rng.uniform(0, 100, size=(batch_size, NUM_FEATURES - 1)),
+            rng.integers(0, 3, size=batch_size),
+        )).astype(np.float32)
+        self._predict_matrix(x)
+        self._predict_matrix(x[:1])
+        done = time.perf_counter()
+        self._warmup_time_ms = (done - loaded) * 1000
+        return {
+            "load_ms": round((loaded - start) * 1000, 3),
+            "warmup_ms": round(self._warmup_time_ms, 3),
+            "total_ms": round((done - start) * 1000, 3),
+        }
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._pool is not None or self._manager.current is not None
+
+    def _model_info(self) -> dict[str, Any] | None:
+        """describe() of the model predictions run on: the pool workers' copy or the local one."""
+        if self._pool is not None:
+            return self._pool.model
+        current = self._manager.current
+        return current.describe() if current is not None else None
+
+    def status(self) -> dict[str, Any]:
+        """Model load status, version, load time and artifact file name and hash (for readiness checks)."""
+        info = self._model_info() or {}
+        return {
+            "loaded": bool(info),
+            "backend": self._backend,
+            "version": info.get("version"),
+            "artifact": os.path.basename(self.artifact_path),
+            "artifact_sha256": info.get("artifact_sha256"),
+            "loaded_at": info.get("loaded_at"),
+            "load_time_ms": info.get("load_time_ms"),
+            "warmup_time_ms": round(self._warmup_time_ms, 3) if self._warmup_time_ms is not None else None,
+        }
+
+    @staticmethod
+    def _format_result(idx: int, probabilities: list[float]) -> dict[str, Any]:
+        return {
+            "roadmap_difficulty": idx,
+            "difficulty": idx,
+            "probabilities": probabilities,
+            "label": DIFFICULTY_LABELS[idx],
+        }
 
     def predict(
         self,
@@ -74,25 +265,87 @@ class PersonalizationService:
             probabilities: list of 3 floats
             label: "beginner" | "intermediate" | "advanced"
         """
-        self._ensure_loaded()
-        x = np.array(
-            [[engagement, velocity, mastery, credibility, float(experience_level)]],
-            dtype=np.float32,
-        )
-        x = (x - self._scaler_mean) / (self._scaler_scale + 1e-8)
-        t = torch.tensor(x, dtype=torch.float32, device=self._device)
+        row = [engagement, velocity, mastery, credibility, float(experience_level)]
+        if self._cache is None:
+            return self._predict_row(row)
+        key = self._cache.key(row)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return {**cached, "probabilities": list(cached["probabilities"])}
+        result = self._predict_row(self._cache.representative(key))
+        self._cache.put(key, result)
+        return {**result, "probabilities": list(result["probabilities"])}
 
-        with torch.no_grad():
-            probs = self._model.predict_proba(t)
-            pred = self._model.predict_class(t)
+    def _predict_row(self, row: list[float]) -> dict[str, Any]:
+        if self._scheduler is not None:
+            timeout = self._settings.inference_batch_result_timeout_s
+            try:
+                return self._scheduler.submit(row).result(timeout=timeout)
+            except FuturesTimeoutError:
+                raise TimeoutError(f"Inference batch did not complete within {timeout:g} s") from None
+        return self._predict_matrix(np.array([row], dtype=np.float32))[0]
 
-        idx = int(pred.item())
-        labels = ["beginner", "intermediate", "advanced"]
-        prob_list = probs.cpu().numpy().ravel().tolist()
+    def _predict_matrix(self, x: np.ndarray) -> list[dict[str, Any]]:
+        """
+        Score an already validated (n, 5) float32 matrix with the active model version,
+        in this thread or on the inference process pool when one is configured.
+        """
+        pool = self._ensure_pool()
+        # The local model is loaded only when there is no pool to run on
+        pred, probs = pool.run(x) if pool is not None else self._ensure_loaded().run(x)
+        self._manager.observe(x, pred)
+        return [
+            self._format_result(int(idx), p)
+            for idx, p in zip(pred.tolist(), probs.tolist())
+        ]
+
+    def predict_batch(self, rows: Sequence[Sequence[float]] | np.ndarray) -> list[dict[str, Any]]:
+        """
+        Predict roadmap difficulty for many users with a single forward pass.
+
+        Args:
+            rows: (n, 5) matrix of [engagement, velocity, mastery, credibility, experience_level]
+
+        Returns:
+            One result dict per row (same shape as predict()), in input order.
+        """
+        x = np.asarray(rows, dtype=np.float32)
+        if x.ndim in (1, 2) and x.shape[0] == 0:
+            return []
+        if x.ndim != 2 or x.shape[1] != NUM_FEATURES:
+            raise ValueError(f"Expected an (n, {NUM_FEATURES}) matrix, got shape {x.shape}")
+        return self._predict_matrix(x)
 
+    def inference_stats(self) -> dict[str, Any]:
+        """Runtime inference statistics (backend, model versions, micro-batching, prediction cache)."""
         return {
-            "roadmap_difficulty": idx,
-            "difficulty": idx,
-            "probabilities": prob_list,
-            "label": labels[idx],
+            "backend": self._backend,
+            "int8_weights": self._backend == "compiled" and self._int8_weights,
+            "model": self._manager.stats(),
+            "process_pool": self._pool.stats() if self._pool is not None else {"enabled": False, "error": self._pool_error},
+            "batching": self._scheduler.stats() if self._scheduler is not None else {"enabled": False},
+            "cache": self._cache.stats() if self._cache is not None else {"enabled": False},
         }
+
+    def after_fork(self) -> None:
+        """
+        Reset per-process runtime state in a forked server worker: locks and
+        background threads are re-created and the inference process pool (owned
+        by the parent) is dropped so this worker starts its own on first use.
+        """
+        self._pool = None
+        self._pool_error = None
+        self._pool_lock = threading.Lock()
+        self._manager.after_fork()
+        if self._scheduler is not None:
+            self._scheduler.after_fork()
+        if self._cache is not None:
+            self._cache.after_fork()
+
+    def close(self) -> None:
+        """Stop background inference workers, worker processes and the model watcher."""
+        if self._scheduler is not None:
+            self._scheduler.close()
+        if self._pool is not None:
+            self._pool.close()
+        self._manager.stop()
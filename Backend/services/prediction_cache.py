@@ -0,0 +1,134 @@
+"""
+Bounded LRU cache for difficulty predictions, keyed on the exact user metrics
+or, when a quantum is configured, on metrics snapped to a grid.
+Cleared automatically when the watched model artifact changes on disk.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+CacheKey = tuple[float, float, float, float, int]
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU mapping (engagement, velocity, mastery, credibility,
+    experience_level) -> prediction result.
+
+    With quantum=None (the default) keys are the exact metric values, so cached
+    answers are identical to uncached ones. With a quantum, scores are snapped to
+    the nearest multiple of it (halves round up; experience_level is kept exact)
+    and callers should predict on representative(key), so every row that maps to
+    a key gets the same answer regardless of which one arrived first.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        quantum: float | None = None,
+        watch_path: str | None = None,
+        check_interval_s: float = 1.0,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if quantum is not None and quantum <= 0:
+            raise ValueError("quantum must be > 0")
+        self._max_size = max_size
+        self._quantum = quantum
+        self._watch_path = watch_path
+        self._check_interval = check_interval_s
+        self._entries: OrderedDict[CacheKey, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._artifact_sig = self._stat_signature()
+        self._next_check = time.monotonic() + check_interval_s
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def key(self, row: list[float]) -> CacheKey:
+        q = self._quantum
+        if q is None:
+            return (float(row[0]), float(row[1]), float(row[2]), float(row[3]), int(row[4]))
+        # floor(x + 0.5) rather than round(): banker's rounding would snap 42.5 down but 43.5 up
+        return (
+            math.floor(row[0] / q + 0.5) * q,
+            math.floor(row[1] / q + 0.5) * q,
+            math.floor(row[2] / q + 0.5) * q,
+            math.floor(row[3] / q + 0.5) * q,
+            int(row[4]),
+        )
+
+    def representative(self, key: CacheKey) -> list[float]:
+        """Metric row a key stands for: the row itself, or the centre of its quantization cell."""
+        return [key[0], key[1], key[2], key[3], float(key[4])]
+
+    def get(self, key: CacheKey) -> dict[str, Any] | None:
+        self._check_artifact()
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: CacheKey, result: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def after_fork(self) -> None:
+        """Replace the lock in a forked child; cached entries stay valid."""
+        self._lock = threading.Lock()
+
+    def _stat_signature(self) -> tuple[int, int] | None:
+        if not self._watch_path:
+            return None
+        try:
+            st = os.stat(self._watch_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _check_artifact(self) -> None:
+        """Clear the cache if the model file changed (checked at most once per interval)."""
+        if self._watch_path is None:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self._check_interval
+        sig = self._stat_signature()
+        if sig != self._artifact_sig:
+            with self._lock:
+                self._entries.clear()
+                self._artifact_sig = sig
+                self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "quantum": self._quantum,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,195 @@
+"""
+Bounded LRU cache of ready-encoded JSON response bodies with strong ETags.
+Entries tagged with a generation (e.g. the market snapshot version) are dropped
+as soon as a newer generation is looked up.
+
+PrecompressedResponse additionally holds gzip and (if the optional `brotli`
+package is installed) brotli variants, each with its own strong ETag.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Callable, Hashable, Mapping
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """UTF-8 JSON body and its strong ETag (quoted, as sent in the header)."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def encode(cls, content: Any) -> "EncodedResponse":
+        # Same encoding as fastapi.responses.JSONResponse
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        return cls(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """True if an If-None-Match header value names this entity (weak comparison, per RFC 9110)."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+
+@lru_cache
+def _brotli() -> ModuleType | None:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding value allows coding (listed or via "*", with q > 0)."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            weights[name.strip().lower()] = float(q) if q else 1.0
+        except ValueError:
+            weights[name.strip().lower()] = 1.0
+    return weights.get(coding, weights.get("*", 0.0)) > 0
+
+
+@dataclass(frozen=True)
+class PrecompressedResponse(EncodedResponse):
+    """
+    EncodedResponse plus content-coded variants: coding -> (body, etag). Bodies
+    smaller than MIN_SIZE bytes are not compressed.
+    """
+
+    variants: Mapping[str, tuple[bytes, str]] = field(default_factory=dict)
+
+    MIN_SIZE = 256
+
+    @classmethod
+    def encode(cls, content: Any) -> "PrecompressedResponse":
+        plain = EncodedResponse.encode(content)
+        variants: dict[str, tuple[bytes, str]] = {}
+        if len(plain.body) >= cls.MIN_SIZE:
+            tag = plain.etag.strip('"')
+            brotli = _brotli()
+            if brotli is not None:
+                variants["br"] = (brotli.compress(plain.body, quality=11), f'"{tag}-br"')
+            # mtime=0 keeps the gzip bytes (and so the ETag) reproducible
+            variants["gzip"] = (gzip.compress(plain.body, compresslevel=9, mtime=0), f'"{tag}-gzip"')
+        return cls(plain.body, plain.etag, variants)
+
+    def negotiate(self, accept_encoding: str | None) -> tuple[str | None, bytes, str]:
+        """(content coding or None, body, etag) of the best variant the client accepts (br > gzip > identity)."""
+        if accept_encoding:
+            for coding, (body, etag) in self.variants.items():
+                if _accepts(accept_encoding, coding):
+                    return coding, body, etag
+        return None, self.body, self.etag
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """True if If-None-Match names this entity in any of its encodings."""
+        if super().matches(if_none_match):
+            return True
+        return any(EncodedResponse(body, etag).matches(if_none_match) for body, etag in self.variants.values())
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU key -> EncodedResponse. Keys used with a generation are
+    invalidated together when get_or_build sees a newer generation; keys without
+    one (generation=None) are only evicted by size.
+    """
+
+    def __init__(self, max_size: int, encode: Callable[[Any], EncodedResponse] = EncodedResponse.encode) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._max_size = max_size
+        self._encode = encode
+        self._entries: OrderedDict[Hashable, tuple[int | None, EncodedResponse]] = OrderedDict()
+        self._generation: int | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _advance(self, generation: int) -> None:
+        """Drop entries of older generations (caller holds the lock)."""
+        if self._generation is not None and generation <= self._generation:
+            return
+        stale = [k for k, (g, _) in self._entries.items() if g is not None]
+        for k in stale:
+            del self._entries[k]
+        if self._generation is not None:
+            self.invalidations += 1
+        self._generation = generation
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        build: Callable[[], Any],
+        generation: int | None = None,
+    ) -> EncodedResponse:
+        """
+        Cached entry for key, or encode build()'s content and store it. Content
+        built for an older generation than the newest seen is returned uncached.
+        """
+        with self._lock:
+            if generation is not None:
+                self._advance(generation)
+            cached = self._entries.get((key, generation))
+            if cached is not None:
+                self._entries.move_to_end((key, generation))
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        entry = self._encode(build())
+        with self._lock:
+            if generation is None or generation == self._generation:
+                self._entries[(key, generation)] = (generation, entry)
+                self._entries.move_to_end((key, generation))
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return entry
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def after_fork(self) -> None:
+        """Replace the lock in a forked child; cached entries stay valid."""
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -3,7 +3,10 @@ Roadmap adaptation logic: produces roadmap config JSON based on predicted diffic
 and optional market trend weights.
 """
 
-from typing import Any
+from typing import Any, Callable, Hashable
+
+from config import get_settings
+from services.response_cache import EncodedResponse, ResponseCache
 
 # Difficulty levels: 0=beginner, 1=intermediate, 2=advanced
 DIFFICULTY_CONFIG = {
@@ -41,8 +44,40 @@ class RoadmapService:
     """
     Generates roadmap configuration JSON from predicted difficulty and optional
     skill priority overrides (e.g. from job market).
+
+    Complete /generate-roadmap responses are cached as encoded JSON with ETags,
+    since they depend only on (difficulty, topic, market snapshot version).
     """
 
+    def __init__(self, cache_size: int | None = None) -> None:
+        cache_size = get_settings().roadmap_response_cache_size if cache_size is None else cache_size
+        self._cache = ResponseCache(cache_size) if cache_size > 0 else None
+
+    def encoded_response(
+        self,
+        key: Hashable,
+        build: Callable[[], dict[str, Any]],
+        snapshot_version: int | None = None,
+    ) -> EncodedResponse:
+        """
+        Encoded response body for key, built by build() on a miss. Entries with a
+        snapshot_version are invalidated once a newer version is requested.
+        """
+        if self._cache is None:
+            return EncodedResponse.encode(build())
+        return self._cache.get_or_build(key, build, generation=snapshot_version)
+
+    def record_not_modified(self) -> None:
+        if self._cache is not None:
+            self._cache.record_not_modified()
+
+    def cache_stats(self) -> dict[str, Any]:
+        return self._cache.stats() if self._cache is not None else {"enabled": False}
+
+    def after_fork(self) -> None:
+        if self._cache is not None:
+            self._cache.after_fork()
+
     def generate_roadmap_config(
         self,
         roadmap_difficulty: int,
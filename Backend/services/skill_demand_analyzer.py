@@ -3,17 +3,104 @@ Job market skill demand analyzer: extracts skill frequency from job listings,
 ranks skills by demand, and applies trend weighting.
 """
 
+import heapq
+import json
+import math
+import time
+import zlib
 from collections import Counter
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator
 
 from config import get_settings
+from services.skill_matcher import get_skill_matcher
+
+
+def to_timestamp(value: datetime | str | float | int | None) -> float | None:
+    """
+    Epoch seconds for a listing date (datetime, ISO string or number).
+    Naive datetimes are taken as UTC. Returns None if missing or unparseable.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class DecayedSkillCounter:
+    """
+    Exponentially time-decayed demand per skill:
+    score(skill, t) = sum over listings of weight * exp(-(t - posted_at) / decay_days).
+
+    Each skill stores [score, last_update]; add() folds the elapsed decay into the
+    score in O(1), and reads decay lazily to the query time. Negative weights retire
+    a listing's earlier contribution exactly.
+    """
+
+    def __init__(self, decay_days: float) -> None:
+        if decay_days <= 0:
+            raise ValueError("decay_days must be positive")
+        self.decay_days = float(decay_days)
+        self._tau = self.decay_days * 86400.0
+        self._state: dict[str, list[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def add(self, skill: str, weight: float = 1.0, at: float | None = None) -> None:
+        """Add weight for skill as of epoch time `at` (now if None)."""
+        at = time.time() if at is None else at
+        entry = self._state.get(skill)
+        if entry is None:
+            self._state[skill] = [weight, at]
+        elif at >= entry[1]:
+            entry[0] = entry[0] * math.exp((entry[1] - at) / self._tau) + weight
+            entry[1] = at
+        else:
+            # Late (older) listing: decay its weight forward to the stored timestamp
+            entry[0] += weight * math.exp((at - entry[1]) / self._tau)
+
+    def score(self, skill: str, now: float | None = None) -> float:
+        entry = self._state.get(skill)
+        if entry is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return max(0.0, entry[0] * math.exp((entry[1] - now) / self._tau))
+
+    def scores(self, now: float | None = None) -> dict[str, float]:
+        """All skills' scores decayed to `now` (O(vocabulary))."""
+        now = time.time() if now is None else now
+        tau = self._tau
+        return {
+            skill: max(0.0, value * math.exp((updated - now) / tau))
+            for skill, (value, updated) in self._state.items()
+        }
+
+    def normalized(self, now: float | None = None) -> dict[str, float]:
+        """Decayed scores as shares of the total decayed demand."""
+        scores = self.scores(now)
+        total = sum(scores.values()) or 1.0
+        return {k: v / total for k, v in scores.items()}
+
+    def top_k(self, k: int, now: float | None = None) -> list[tuple[str, float]]:
+        """k highest decayed scores as (skill, score), ties broken by name."""
+        return heapq.nsmallest(k, self.scores(now).items(), key=lambda kv: (-kv[1], kv[0]))
 
 
 def trend_weighting(
     skill_counts: dict[str, int],
-    listing_dates: list[datetime] | None = None,
-    decay_days: int | None = None,
+    listing_dates: list[datetime | str | float] | None = None,
+    decay_days: float | None = None,
+    listing_skills: list[list[str]] | None = None,
+    now: float | None = None,
 ) -> dict[str, float]:
     """
     Apply time-decay weighting so recent listings count more.
@@ -22,23 +109,55 @@ def trend_weighting(
     Otherwise each listing's contribution is weighted by exp(-age_days / decay_days).
 
     Args:
-        skill_counts: mapping skill_name -> raw count (or pass per-skill dates via listing_dates)
-        listing_dates: optional list of datetime for each listing (order must match skills per listing)
-        decay_days: half-life in days for decay; from settings if None
+        skill_counts: mapping skill_name -> raw count (used when no dates are given)
+        listing_dates: optional posted date of each listing
+        decay_days: decay time constant in days; from settings if None
+        listing_skills: skills of each listing, same order as listing_dates (required with dates)
+        now: epoch seconds to measure listing age from; current time if None
 
     Returns:
-        Dict skill -> weighted demand score (float).
+        Dict skill -> weighted demand score (float), normalized to sum to 1.
     """
-    settings = get_settings()
-    decay = decay_days or settings.market_trend_decay_days
-    if not listing_dates:
+    decay = decay_days or get_settings().market_trend_decay_days
+    if not listing_dates or not decay:
         total = sum(skill_counts.values()) or 1
         return {k: v / total for k, v in skill_counts.items()}
+    if listing_skills is None or len(listing_skills) != len(listing_dates):
+        raise ValueError("listing_skills must give the skills of each entry in listing_dates")
 
-    # If we had per-listing skills and dates we'd weight each; here we simplify:
-    # assume skill_counts are raw and we only have decay_days for normalization
-    total = sum(skill_counts.values()) or 1
-    return {k: v / total for k, v in skill_counts.items()}
+    counter = DecayedSkillCounter(decay)
+    for skills, posted in zip(listing_skills, listing_dates):
+        at = to_timestamp(posted)
+        for skill in skills:
+            counter.add(skill, 1.0, at)
+    return counter.normalized(now)
+
+
+def listing_skills(listing: dict[str, Any]) -> list[str]:
+    """
+    Canonical skills of one job listing.
+
+    Uses the "skills" key (list of str, or comma-separated str) when present,
+    mapping known aliases to canonical names (e.g. "NodeJS" -> "node.js") and
+    keeping unknown ones lowercased. Otherwise extracts dictionary skills from
+    "description" (or "title") with the shared SkillMatcher.
+    """
+    matcher = get_skill_matcher()
+    raw: list[str] = []
+    skills = listing.get("skills")
+    if isinstance(skills, list):
+        raw = [s for s in skills if isinstance(s, str)]
+    elif isinstance(skills, str):
+        raw = skills.split(",")
+    out: list[str] = []
+    for s in raw:
+        s = s.strip().lower()
+        if s:
+            out.append(matcher.canonical(s) or s)
+    desc = listing.get("description") or listing.get("title") or ""
+    if isinstance(desc, str) and not listing.get("skills"):
+        out.extend(matcher.extract(desc))
+    return out
 
 
 def extract_skill_frequency(job_listings: list[dict[str, Any]]) -> dict[str, int]:
@@ -46,36 +165,171 @@ def extract_skill_frequency(job_listings: list[dict[str, Any]]) -> dict[str, int
     Extract skill frequency from a list of job listing objects.
 
     Expects each listing to have a "skills" key (list of str) or "description" (str)
-    to be tokenized naively. Prefer "skills" when available.
+    to be matched against the skill dictionary. Prefer "skills" when available.
 
     Returns:
         Dict skill_name -> count across all listings.
     """
     counter: Counter = Counter()
     for listing in job_listings:
-        skills = listing.get("skills")
-        if isinstance(skills, list):
-            for s in skills:
-                if isinstance(s, str) and s.strip():
-                    counter[s.strip().lower()] += 1
-        elif isinstance(skills, str):
-            for s in skills.split(","):
-                if s.strip():
-                    counter[s.strip().lower()] += 1
-        desc = listing.get("description") or listing.get("title") or ""
-        if isinstance(desc, str) and not listing.get("skills"):
-            for token in desc.replace(",", " ").split():
-                t = token.strip().lower()
-                if len(t) > 2 and t.isalpha():
-                    counter[t] += 1
+        counter.update(listing_skills(listing))
     return dict(counter)
 
 
+class SkillFrequencyIndex:
+    """
+    Incrementally maintained skill -> listing count, keyed by listing id.
+
+    add/remove/update cost O(skills in the listing); each skill counts once per
+    listing. top_k selects with a bounded heap instead of sorting the vocabulary.
+    With decay_days set, the index also maintains a DecayedSkillCounter from each
+    listing's posted_at, and retiring a listing subtracts its decayed contribution.
+    """
+
+    SERIAL_VERSION = 1
+
+    def __init__(self, decay_days: float | None = None) -> None:
+        self._listings: dict[str, tuple[str, ...]] = {}
+        self._counts: dict[str, int] = {}
+        self._posted: dict[str, float] = {}
+        self.decayed = DecayedSkillCounter(decay_days) if decay_days else None
+
+    def __len__(self) -> int:
+        return len(self._listings)
+
+    def __contains__(self, listing_id: object) -> bool:
+        return listing_id in self._listings
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._counts)
+
+    def add(self, listing_id: str, skills: Iterable[str], posted_at: float | None = None) -> None:
+        """
+        Index a listing's (normalized) skills; replaces the listing if the id exists.
+        posted_at (epoch seconds) feeds the decayed counter; defaults to now.
+        """
+        new = tuple(dict.fromkeys(skills))
+        old = self._listings.get(listing_id)
+        if self.decayed is not None and posted_at is None:
+            posted_at = self._posted.get(listing_id) if old == new else time.time()
+        if old is not None:
+            if old == new and posted_at == self._posted.get(listing_id):
+                return
+            self._retire(listing_id, old)
+        self._listings[listing_id] = new
+        counts = self._counts
+        for skill in new:
+            counts[skill] = counts.get(skill, 0) + 1
+        if self.decayed is not None:
+            self._posted[listing_id] = posted_at
+            for skill in new:
+                self.decayed.add(skill, 1.0, posted_at)
+
+    def add_listing(self, listing: dict[str, Any]) -> None:
+        """Index a raw job listing dict by its "id", extracting skills like extract_skill_frequency."""
+        self.add(str(listing["id"]), listing_skills(listing), to_timestamp(listing.get("posted_at")))
+
+    update = add
+
+    def remove(self, listing_id: str) -> bool:
+        """Retire a listing. Returns False if the id was not indexed."""
+        old = self._listings.pop(listing_id, None)
+        if old is None:
+            return False
+        self._retire(listing_id, old)
+        return True
+
+    def _retire(self, listing_id: str, skills: tuple[str, ...]) -> None:
+        counts = self._counts
+        for skill in skills:
+            n = counts[skill] - 1
+            if n:
+                counts[skill] = n
+            else:
+                del counts[skill]
+        posted_at = self._posted.pop(listing_id, None)
+        if self.decayed is not None and posted_at is not None:
+            for skill in skills:
+                self.decayed.add(skill, -1.0, posted_at)
+
+    def listing_ids(self) -> list[str]:
+        return list(self._listings)
+
+    def items(self) -> Iterator[tuple[str, tuple[str, ...], float | None]]:
+        """(listing_id, skills, posted_at) for every indexed listing."""
+        for listing_id, skills in self._listings.items():
+            yield listing_id, skills, self._posted.get(listing_id)
+
+    def count(self, skill: str) -> int:
+        return self._counts.get(skill.strip().lower(), 0)
+
+    def counts(self) -> dict[str, int]:
+        """Copy of skill -> listing count."""
+        return dict(self._counts)
+
+    def top_k(self, k: int) -> list[tuple[str, int]]:
+        """k most frequent skills as (skill, count), ties broken by name. O(V log k)."""
+        return heapq.nsmallest(k, self._counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def decayed_top_k(self, k: int, now: float | None = None) -> list[tuple[str, float]]:
+        """k skills with the highest time-decayed demand (requires decay_days)."""
+        if self.decayed is None:
+            raise ValueError("Index was created without decay_days")
+        return self.decayed.top_k(k, now)
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact checkpoint: zlib-compressed JSON with a shared vocabulary and one
+        list of vocabulary indices per listing (plus posted_at when decaying).
+        Counts and decayed scores are rebuilt on restore.
+        """
+        vocab = list(self._counts)
+        position = {skill: i for i, skill in enumerate(vocab)}
+        payload = {
+            "version": self.SERIAL_VERSION,
+            "decay_days": self.decayed.decay_days if self.decayed is not None else None,
+            "vocab": vocab,
+            "ids": list(self._listings),
+            "skills": [[position[s] for s in skills] for skills in self._listings.values()],
+        }
+        if self.decayed is not None:
+            payload["posted"] = [self._posted[i] for i in self._listings]
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SkillFrequencyIndex":
+        """Restore an index written by to_bytes(). Raises ValueError on a bad checkpoint."""
+        try:
+            payload = json.loads(zlib.decompress(data))
+        except (zlib.error, ValueError) as e:
+            raise ValueError(f"Invalid skill index checkpoint: {e}") from e
+        if payload.get("version") != cls.SERIAL_VERSION:
+            raise ValueError(f"Unsupported skill index checkpoint version: {payload.get('version')!r}")
+        vocab = payload["vocab"]
+        index = cls(decay_days=payload.get("decay_days"))
+        counts = index._counts
+        for listing_id, positions in zip(payload["ids"], payload["skills"]):
+            skills = tuple(vocab[i] for i in positions)
+            index._listings[listing_id] = skills
+            for skill in skills:
+                counts[skill] = counts.get(skill, 0) + 1
+        if index.decayed is not None:
+            for listing_id, posted_at in zip(payload["ids"], payload["posted"]):
+                index._posted[listing_id] = posted_at
+                for skill in index._listings[listing_id]:
+                    index.decayed.add(skill, 1.0, posted_at)
+        return index
+
+
 def rank_skills_by_demand(
     skill_counts: dict[str, int],
-    listing_dates: list[datetime] | None = None,
-    decay_days: int | None = None,
+    listing_dates: list[datetime | str | float] | None = None,
+    decay_days: float | None = None,
     top_n: int = 50,
+    listing_skills: list[list[str]] | None = None,
+    decayed: DecayedSkillCounter | None = None,
+    now: float | None = None,
 ) -> list[dict[str, Any]]:
     """
     Rank skills by demand and return top_n with demand_score.
@@ -83,18 +337,22 @@ def rank_skills_by_demand(
     Args:
         skill_counts: skill -> raw count
         listing_dates: optional for trend weighting
-        decay_days: optional decay half-life
+        decay_days: optional decay time constant in days
         top_n: max number of skills to return
+        listing_skills: skills per listing, paired with listing_dates
+        decayed: maintained DecayedSkillCounter; ranks its scores (decayed to `now`)
+            instead of re-weighting listings, so cost is O(vocabulary) not O(listings)
+        now: epoch seconds for decay; current time if None
 
     Returns:
         List of {"skill": str, "demand_score": float, "rank": int}, sorted by demand descending.
     """
-    weighted = trend_weighting(skill_counts, listing_dates, decay_days)
-    sorted_skills = sorted(
-        weighted.items(),
-        key=lambda x: -x[1],
-    )[:top_n]
+    if decayed is not None:
+        weighted = decayed.normalized(now)
+    else:
+        weighted = trend_weighting(skill_counts, listing_dates, decay_days, listing_skills, now)
+    top = heapq.nsmallest(top_n, weighted.items(), key=lambda x: (-x[1], x[0]))
     return [
         {"skill": s, "demand_score": round(score, 6), "rank": i + 1}
-        for i, (s, score) in enumerate(sorted_skills)
+        for i, (s, score) in enumerate(top)
     ]
@@ -0,0 +1,203 @@
+"""
+Per-day skill demand time series: how many listings posted on each day require
+each skill, over a fixed window of days.
+
+SkillDemandHistory is the live store fed from listing upserts: one int32 ring
+buffer of `days` slots per skill (rows of one matrix), indexed by epoch day
+modulo `days`. SkillHistoryView is its immutable, chronologically ordered copy
+taken into each MarketSnapshot; range, moving-average and growth queries on it
+cost O(days queried), independent of the number of listings.
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+_DAY_S = 86400
+_EPOCH = date(1970, 1, 1)
+
+
+def epoch_day(ts: float) -> int:
+    return int(ts // _DAY_S)
+
+
+def day_to_date(day: int) -> date:
+    return _EPOCH + timedelta(days=day)
+
+
+def date_to_day(d: date) -> int:
+    return (d - _EPOCH).days
+
+
+class SkillHistoryView:
+    """
+    Read-only per-day counts: counts[i, j] is the number of listings requiring
+    vocabulary[i] posted on day (end_day - days + 1 + j). Arrays may be
+    memory-mapped (see services.snapshot_store).
+    """
+
+    def __init__(self, vocabulary: Sequence[str], counts: np.ndarray, end_day: int) -> None:
+        if counts.ndim != 2 or counts.shape[0] != len(vocabulary):
+            raise ValueError("counts must be a (skills x days) matrix matching the vocabulary")
+        self.vocabulary = vocabulary
+        self.counts = counts
+        self.end_day = end_day
+        self._ids: dict[str, int] | None = None
+
+    @property
+    def days(self) -> int:
+        return self.counts.shape[1]
+
+    @property
+    def start_day(self) -> int:
+        return self.end_day - self.days + 1
+
+    def __contains__(self, skill: object) -> bool:
+        return self._id(skill) is not None  # type: ignore[arg-type]
+
+    def _id(self, skill: str) -> int | None:
+        if self._ids is None:
+            self._ids = {s: i for i, s in enumerate(self.vocabulary)}
+        return self._ids.get(skill)
+
+    def _slice(self, skill: str, first_day: int, last_day: int) -> np.ndarray:
+        """Daily counts for first_day..last_day inclusive; days outside the window read as 0."""
+        out = np.zeros(max(0, last_day - first_day + 1), dtype=np.int64)
+        i = self._id(skill)
+        lo, hi = max(first_day, self.start_day), min(last_day, self.end_day)
+        if i is not None and lo <= hi:
+            out[lo - first_day:hi - first_day + 1] = self.counts[i, lo - self.start_day:hi - self.start_day + 1]
+        return out
+
+    def series(self, skill: str, days: int, end: date | None = None) -> list[dict[str, Any]]:
+        """[{"date", "count"}] for the `days` days ending at `end` (default: the last stored day)."""
+        last = date_to_day(end) if end is not None else self.end_day
+        values = self._slice(skill, last - days + 1, last)
+        return [
+            {"date": day_to_date(last - days + 1 + k).isoformat(), "count": int(v)}
+            for k, v in enumerate(values)
+        ]
+
+    def moving_average(self, skill: str, days: int, window: int, end: date | None = None) -> list[dict[str, Any]]:
+        """Trailing `window`-day mean for each of the `days` days ending at `end`."""
+        last = date_to_day(end) if end is not None else self.end_day
+        values = self._slice(skill, last - days - window + 2, last)
+        sums = np.convolve(values, np.ones(window, dtype=np.int64), mode="valid")
+        return [
+            {"date": day_to_date(last - days + 1 + k).isoformat(), "value": round(float(s) / window, 4)}
+            for k, s in enumerate(sums)
+        ]
+
+    def growth(self, skill: str, days: int, window: int, end: date | None = None) -> dict[str, Any]:
+        """
+        Demand change at the end of the range: listings in the last `window` days
+        vs the `window` days before (growth_rate, None when the earlier period is
+        empty), and momentum as the least-squares slope of daily counts over the
+        `days`-day range (listings/day per day).
+        """
+        last = date_to_day(end) if end is not None else self.end_day
+        recent = int(self._slice(skill, last - window + 1, last).sum())
+        previous = int(self._slice(skill, last - 2 * window + 1, last - window).sum())
+        values = self._slice(skill, last - days + 1, last).astype(np.float64)
+        momentum = 0.0
+        if values.size > 1:
+            x = np.arange(values.size, dtype=np.float64)
+            x -= x.mean()
+            momentum = float((x @ (values - values.mean())) / (x @ x))
+        return {
+            "recent": recent,
+            "previous": previous,
+            "growth_rate": round((recent - previous) / previous, 6) if previous else None,
+            "momentum": round(momentum, 6),
+        }
+
+
+class SkillDemandHistory:
+    """
+    Live per-day counts in per-skill ring buffers over the last `days` days.
+
+    add() records a listing under its posting day and moves it if its skills or
+    day change; listings are remembered only while their day is in the window.
+    Retired listings are not subtracted: a posting stays part of the day it was
+    posted on. Thread-safe; snapshot() copies the buffers in chronological order.
+    """
+
+    def __init__(self, days: int = 365) -> None:
+        if days < 1:
+            raise ValueError("days must be at least 1")
+        self.days = days
+        self._ids: dict[str, int] = {}
+        self._vocab: list[str] = []
+        self._counts = np.zeros((16, days), dtype=np.int32)
+        self._head = epoch_day(time.time())
+        self._listings: dict[str, tuple[int, tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Listings currently tracked (posted within the window)."""
+        return len(self._listings)
+
+    def _row(self, skill: str) -> int:
+        i = self._ids.get(skill)
+        if i is None:
+            i = self._ids[skill] = len(self._vocab)
+            self._vocab.append(skill)
+            if i >= self._counts.shape[0]:
+                grown = np.zeros((2 * self._counts.shape[0], self.days), dtype=np.int32)
+                grown[:i] = self._counts
+                self._counts = grown
+        return i
+
+    def _advance(self, day: int) -> None:
+        """Move the head to `day`, zeroing the slots of days that fall out of the window."""
+        cleared = min(day - self._head, self.days)
+        slots = [(self._head + k) % self.days for k in range(1, cleared + 1)]
+        self._counts[:, slots] = 0
+        self._head = day
+        first = day - self.days + 1
+        self._listings = {k: v for k, v in self._listings.items() if v[0] >= first}
+
+    def _apply(self, day: int, skills: Iterable[str], delta: int) -> None:
+        if day <= self._head - self.days:
+            return
+        slot = day % self.days
+        for skill in skills:
+            row = self._row(skill)
+            self._counts[row, slot] += delta
+
+    def add(self, listing_id: str, skills: Iterable[str], posted_at: float | None = None) -> None:
+        """Record a listing (posted_at in epoch seconds, now if None; future dates count as today)."""
+        now = time.time()
+        day = epoch_day(min(posted_at if posted_at is not None else now, now))
+        skills = tuple(dict.fromkeys(skills))
+        with self._lock:
+            today = epoch_day(now)
+            if today > self._head:
+                self._advance(today)
+            old = self._listings.get(listing_id)
+            if old == (day, skills):
+                return
+            if old is not None:
+                self._apply(old[0], old[1], -1)
+            if day > self._head - self.days:
+                self._listings[listing_id] = (day, skills)
+                self._apply(day, skills, 1)
+            elif old is not None:
+                del self._listings[listing_id]
+
+    def snapshot(self) -> SkillHistoryView:
+        """Immutable copy with column 0 = oldest day of the window and the last column = today."""
+        with self._lock:
+            today = epoch_day(time.time())
+            if today > self._head:
+                self._advance(today)
+            n = len(self._vocab)
+            # Oldest slot is the one after the head; roll it to column 0
+            counts = np.roll(self._counts[:n], -((self._head + 1) % self.days), axis=1)
+            return SkillHistoryView(tuple(self._vocab), counts, self._head)
+
+    def after_fork(self) -> None:
+        self._lock = threading.Lock()
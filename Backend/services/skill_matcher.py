@@ -0,0 +1,320 @@
+"""
+Dictionary-based skill extraction: canonical skill names and their aliases are
+compiled into an Aho-Corasick automaton that finds every known skill in a text
+in one pass, independent of dictionary size.
+
+Matches must start and end on word boundaries. Every dictionary entry found is
+reported, including entries adjacent to or inside a longer one ("react native"
+also yields "react"); an entry inside a longer entry for the same skill ("rest"
+in "rest api") is reported once.
+
+Aliases are kept unambiguous in ordinary prose (no "node", "cloud", "spark",
+...). Skill names that are also common words ("go", "rust", ...) are only
+accepted in a technical context; see SkillMatcher._in_context.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, Mapping
+
+from config import get_settings
+
+# canonical name -> aliases (the canonical name always matches itself)
+SKILL_ALIASES: dict[str, tuple[str, ...]] = {
+    "python": ("python3",),
+    "javascript": ("js", "ecmascript", "es6"),
+    "react": ("react.js", "reactjs"),
+    "node.js": ("nodejs", "node js"),
+    "sql": (),
+    "aws": ("amazon web services",),
+    "docker": (),
+    "kubernetes": ("k8s",),
+    "machine learning": ("ml engineer", "ml engineering", "ml models"),
+    "data analysis": ("data analytics",),
+    "rest api": ("rest apis", "restful api", "restful apis", "restful services"),
+    "graphql": (),
+    "typescript": (),
+    "java": (),
+    "go": ("golang",),
+    "rust": (),
+    "postgresql": ("postgres", "psql"),
+    "mongodb": ("mongo",),
+    "redis": (),
+    "ci/cd": (
+        "ci cd",
+        "cicd",
+        "continuous integration",
+        "continuous delivery",
+        "continuous deployment",
+    ),
+    "terraform": (),
+    "system design": ("systems design",),
+    "algorithms": ("algorithm",),
+    "communication": ("communication skills",),
+    "leadership": (),
+    "agile": (),
+    "scrum": (),
+    "testing": ("unit testing", "test automation", "automated testing"),
+    "security": ("cybersecurity", "application security"),
+    "devops": ("dev ops",),
+    "html": ("html5",),
+    "css": ("css3", "flexbox", "tailwind css", "tailwindcss"),
+    "angular": ("angularjs",),
+    "vue.js": ("vue", "vuejs"),
+    "react native": (),
+    "django": (),
+    "flask": (),
+    "spring": ("spring boot", "spring framework"),
+    "asp.net": (".net", "dotnet"),
+    "c programming": ("c language",),
+    "c++": ("cpp",),
+    "c#": ("csharp",),
+    "kotlin": (),
+    "swift": ("swiftui",),
+    "flutter": ("dart language", "dart programming"),
+    "ruby": ("ruby on rails", "rails framework"),
+    "r programming": ("r language",),
+    "matlab": (),
+    "solidity": (),
+    "blockchain": ("ethereum", "smart contracts", "web3"),
+    "linux": ("unix", "bash scripting", "shell scripting"),
+    "git": ("github", "version control"),
+    "azure": ("microsoft azure",),
+    "cloud computing": (
+        "cloud platforms",
+        "cloud services",
+        "cloud providers",
+        "cloud infrastructure",
+        "cloud architecture",
+    ),
+    "deep learning": ("neural networks", "neural network"),
+    "tensorflow": ("keras",),
+    "pytorch": (),
+    "nlp": ("natural language processing",),
+    "generative ai": ("llm", "llms", "large language models"),
+    "data structures": (),
+    "statistics": (),
+    "excel": ("microsoft excel", "spreadsheets"),
+    "power bi": ("powerbi",),
+    "big data": ("hadoop", "apache spark", "pyspark"),
+    "nosql": (),
+    "networking": ("computer networks", "tcp/ip"),
+    "operating systems": (),
+    "object oriented programming": ("oop", "object-oriented programming"),
+    "ui/ux design": ("ui design", "ux design", "figma"),
+    "product management": (),
+    "embedded systems": ("microcontrollers", "arduino"),
+    "iot": ("internet of things",),
+    "ar/vr": ("augmented reality", "virtual reality", "extended reality", "xr"),
+    "game development": ("unity3d", "unity engine", "unreal engine"),
+    "android": (),
+    "ios": (),
+    "mlops": (),
+    "penetration testing": ("ethical hacking", "pentesting"),
+}
+
+# Names that are also everyday words: matched only in a technical context
+CONTEXT_REQUIRED: frozenset[str] = frozenset({"go", "rust", "swift", "spring"})
+
+_SEPARATORS = re.compile(r"[\s\-_]+")
+# What may separate two items of a skill list ("python, go", "c/rust", "java and spring")
+_LIST_GAP = re.compile(r" ?(?:[,/&|+;]|and|or)? ?")
+# Words that mark the preceding name as a technology ("go programming", "rust developer")
+_TECH_CUE = re.compile(
+    r" (?:programming|language|lang|developers?|engineers?|engineering|code|coding|modules?|runtime|framework)\b"
+)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace, hyphens and underscores to single spaces."""
+    return _SEPARATORS.sub(" ", text.lower()).strip()
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over normalized alias strings.
+
+    Nodes are integers; _goto[node] maps a character to the next node, _fail is
+    the suffix link, and _out[node] lists (pattern_length, canonical_id) of every
+    pattern ending at that node (own plus inherited through suffix links).
+    Patterns in context_required are dropped unless _in_context accepts them.
+    """
+
+    def __init__(
+        self,
+        aliases: Mapping[str, Iterable[str]],
+        context_required: Iterable[str] = CONTEXT_REQUIRED,
+    ) -> None:
+        self._context_required = frozenset(normalize_text(name) for name in context_required)
+        self._canonical: list[str] = []
+        self._canonical_ids: dict[str, int] = {}
+        self._lookup: dict[str, int] = {}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, int]]] = [[]]
+        for canonical, names in aliases.items():
+            cid = self._canonical_id(normalize_text(canonical))
+            for name in (canonical, *names):
+                self._insert(normalize_text(name), cid)
+        self._build_links()
+
+    def _canonical_id(self, canonical: str) -> int:
+        cid = self._canonical_ids.get(canonical)
+        if cid is None:
+            cid = self._canonical_ids[canonical] = len(self._canonical)
+            self._canonical.append(canonical)
+        return cid
+
+    def _insert(self, pattern: str, cid: int) -> None:
+        if not pattern or pattern in self._lookup:
+            return
+        self._lookup[pattern] = cid
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), cid))
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def __len__(self) -> int:
+        """Number of distinct patterns (canonical names plus aliases)."""
+        return len(self._lookup)
+
+    @property
+    def skills(self) -> list[str]:
+        """Canonical skill names."""
+        return list(self._canonical)
+
+    def canonical(self, name: str) -> str | None:
+        """Canonical name for an exact skill name or alias, or None if unknown."""
+        cid = self._lookup.get(normalize_text(name))
+        return self._canonical[cid] if cid is not None else None
+
+    def find(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        (start, end, canonical) matches in normalized text, ordered by start with
+        longer matches first. Offsets refer to normalize_text(text).
+        """
+        original = text
+        text = normalize_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        candidates: list[tuple[int, int, int]] = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            if end < n and _is_word_char(text[end]) and _is_word_char(ch):
+                continue
+            for length, cid in out[node]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                candidates.append((start, end, cid))
+
+        matches: list[tuple[int, int, str]] = []
+        covered: dict[int, int] = {}  # skill id -> furthest end of its matches so far
+        for start, end, cid in sorted(set(candidates), key=lambda c: (c[0], -c[1])):
+            if covered.get(cid, -1) >= end:
+                continue  # inside a longer match for the same skill
+            covered[cid] = end
+            matches.append((start, end, self._canonical[cid]))
+        if self._context_required and any(text[s:e] in self._context_required for s, e, _ in matches):
+            cased = _SEPARATORS.sub(" ", original).strip()
+            if len(cased) != len(text):  # lowercasing changed the length; offsets would not line up
+                cased = None
+            matches = self._in_context(text, cased, matches)
+        return matches
+
+    def _in_context(
+        self,
+        text: str,
+        cased: str | None,
+        matches: list[tuple[int, int, str]],
+    ) -> list[tuple[int, int, str]]:
+        """
+        Drop everyday-word matches (e.g. "go") not used as a skill name. One is kept
+        when written capitalized mid-sentence ("Learn Go"), followed by a cue word
+        ("go developer"), or listed next to another kept skill ("Python, Go, Rust").
+        """
+        kept = [text[s:e] not in self._context_required for s, e, _ in matches]
+        for i, (start, end, _) in enumerate(matches):
+            if kept[i]:
+                continue
+            if cased is not None and cased[start].isupper():
+                before = cased[:start].rstrip()
+                kept[i] = bool(before) and before[-1] not in ".!?:"
+            kept[i] = kept[i] or _TECH_CUE.match(text, end) is not None
+
+        def listed_next_to_kept(i: int) -> bool:
+            start, end, _ = matches[i]
+            for j, (other_start, other_end, _) in enumerate(matches):
+                if not kept[j] or j == i:
+                    continue
+                if other_end <= start and _LIST_GAP.fullmatch(text[other_end:start]):
+                    return True
+                if end <= other_start and _LIST_GAP.fullmatch(text[end:other_start]):
+                    return True
+            return False
+
+        # A kept neighbour vouches for the next one along a list, so repeat until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(matches)):
+                if not kept[i] and listed_next_to_kept(i):
+                    kept[i] = changed = True
+        return [m for m, keep in zip(matches, kept) if keep]
+
+    def extract(self, text: str) -> list[str]:
+        """Distinct canonical skills mentioned in text, in order of first appearance."""
+        return list(dict.fromkeys(skill for _, _, skill in self.find(text)))
+
+
+def load_skill_dictionary(path: str) -> dict[str, list[str]]:
+    """Read a JSON skill dictionary: {"canonical": ["alias", ...], ...}."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Skill dictionary {path} must be a JSON object of canonical -> aliases")
+    return {str(k): [str(a) for a in (v or [])] for k, v in data.items()}
+
+
+@lru_cache
+def get_skill_matcher() -> SkillMatcher:
+    """Process-wide matcher over SKILL_ALIASES plus Settings.skill_dictionary_path, if set."""
+    aliases: dict[str, list[str]] = {k: list(v) for k, v in SKILL_ALIASES.items()}
+    path = get_settings().skill_dictionary_path
+    if path and os.path.isfile(path):
+        for canonical, names in load_skill_dictionary(path).items():
+            aliases.setdefault(canonical, []).extend(names)
+    return SkillMatcher(aliases)
@@ -0,0 +1,204 @@
+"""
+Sparse listing x skill matrix engine: encodes listings as a binary CSR matrix
+over a skill vocabulary, computes (optionally time-decayed) demand as vectorized
+column sums, and derives a skill co-occurrence / association matrix for
+"skills that appear together with X" queries.
+"""
+
+import time
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from services.skill_demand_analyzer import SkillFrequencyIndex, listing_skills, to_timestamp
+
+ASSOCIATION_MEASURES = ("count", "conditional", "jaccard", "lift")
+
+
+class SkillAssociations:
+    """
+    Skill co-occurrence counts C = X^T X (C[i, j] = listings with both skills i and j)
+    plus per-skill listing counts, with association scores computed per query row.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], cooccurrence: sparse.csr_matrix, n_listings: int) -> None:
+        self.vocabulary = list(vocabulary)
+        self._ids = {skill: i for i, skill in enumerate(self.vocabulary)}
+        self.cooccurrence = cooccurrence
+        self.skill_counts = np.asarray(cooccurrence.diagonal(), dtype=np.float64)
+        self.n_listings = n_listings
+
+    def related(self, skill: str, top_n: int = 10, measure: str = "jaccard") -> list[dict[str, Any]]:
+        """
+        Skills most associated with `skill`, as {"skill", "cooccurrence", "score"}.
+
+        measure: "count" (shared listings), "conditional" P(other | skill),
+        "jaccard" (shared / either) or "lift" (observed / expected co-occurrence).
+        """
+        if measure not in ASSOCIATION_MEASURES:
+            raise ValueError(f"Unknown association measure {measure!r}; expected one of {ASSOCIATION_MEASURES}")
+        i = self._ids.get(skill)
+        if i is None:
+            return []
+        row = self.cooccurrence.getrow(i)
+        cols = row.indices
+        co = row.data.astype(np.float64)
+        keep = cols != i
+        cols, co = cols[keep], co[keep]
+        if cols.size == 0:
+            return []
+        c_i = self.skill_counts[i]
+        c_j = self.skill_counts[cols]
+        if measure == "count":
+            scores = co
+        elif measure == "conditional":
+            scores = co / c_i
+        elif measure == "jaccard":
+            scores = co / (c_i + c_j - co)
+        else:
+            scores = co * self.n_listings / (c_i * c_j)
+        top = _top_indices(scores, top_n)
+        return [
+            {
+                "skill": self.vocabulary[cols[k]],
+                "cooccurrence": int(co[k]),
+                "score": round(float(scores[k]), 6),
+            }
+            for k in top
+        ]
+
+
+def _top_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, sorted descending, via argpartition (O(n + k log k))."""
+    if k <= 0 or values.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < values.size:
+        part = np.argpartition(-values, k - 1)[:k]
+    else:
+        part = np.arange(values.size)
+    return part[np.argsort(-values[part], kind="stable")]
+
+
+class SkillMatrix:
+    """
+    Binary CSR matrix X (listings x skills) with optional per-listing posted_at
+    timestamps. Rows are listings, columns index `vocabulary`.
+    """
+
+    def __init__(
+        self,
+        matrix: sparse.csr_matrix,
+        vocabulary: Sequence[str],
+        posted_at: np.ndarray | None = None,
+    ) -> None:
+        if matrix.shape[1] != len(vocabulary):
+            raise ValueError("Matrix columns must match the vocabulary size")
+        if posted_at is not None and len(posted_at) != matrix.shape[0]:
+            raise ValueError("posted_at must have one entry per listing")
+        self.matrix = matrix
+        self.vocabulary = list(vocabulary)
+        self.posted_at = posted_at
+        self._associations: SkillAssociations | None = None
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.matrix.shape
+
+    @classmethod
+    def from_skill_lists(
+        cls,
+        skill_lists: Iterable[Iterable[str]],
+        posted_at: Iterable[float | None] | None = None,
+        vocabulary: Sequence[str] | None = None,
+    ) -> "SkillMatrix":
+        """
+        Encode listings given as skill lists. With a fixed vocabulary, unknown
+        skills are dropped; otherwise the vocabulary grows in first-seen order.
+        Missing posted_at values become NaN (treated as "now" when decaying).
+        """
+        ids: dict[str, int] = {s: i for i, s in enumerate(vocabulary or ())}
+        grow = vocabulary is None
+        indptr = [0]
+        indices: list[int] = []
+        for skills in skill_lists:
+            row = set()
+            for skill in skills:
+                j = ids.get(skill)
+                if j is None:
+                    if not grow:
+                        continue
+                    j = ids[skill] = len(ids)
+                row.add(j)
+            indices.extend(sorted(row))
+            indptr.append(len(indices))
+        n_rows = len(indptr) - 1
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(n_rows, len(ids)),
+        )
+        times = None
+        if posted_at is not None:
+            times = np.array([np.nan if t is None else t for t in posted_at], dtype=np.float64)
+        return cls(matrix, list(ids), times)
+
+    @classmethod
+    def from_listings(cls, listings: Iterable[dict[str, Any]], vocabulary: Sequence[str] | None = None) -> "SkillMatrix":
+        """Encode raw job listing dicts (skills extracted like extract_skill_frequency)."""
+        listings = list(listings)
+        return cls.from_skill_lists(
+            (listing_skills(listing) for listing in listings),
+            posted_at=[to_timestamp(listing.get("posted_at")) for listing in listings],
+            vocabulary=vocabulary,
+        )
+
+    @classmethod
+    def from_index(cls, index: SkillFrequencyIndex) -> "SkillMatrix":
+        """Encode the listings currently held by a SkillFrequencyIndex."""
+        rows = list(index.items())
+        return cls.from_skill_lists(
+            (skills for _, skills, _ in rows),
+            posted_at=[posted for _, _, posted in rows],
+        )
+
+    def listing_weights(self, decay_days: float | None = None, now: float | None = None) -> np.ndarray | None:
+        """exp(-age / decay_days) per listing, or None for unweighted counts."""
+        if not decay_days or self.posted_at is None:
+            return None
+        now = time.time() if now is None else now
+        ages = now - np.where(np.isnan(self.posted_at), now, self.posted_at)
+        return np.exp(-ages / (decay_days * 86400.0))
+
+    def demand(self, decay_days: float | None = None, now: float | None = None) -> np.ndarray:
+        """Per-skill demand: column sums of X, or X^T w with decay weights w."""
+        w = self.listing_weights(decay_days, now)
+        if w is None:
+            return np.asarray(self.matrix.sum(axis=0), dtype=np.float64).ravel()
+        return np.asarray(self.matrix.T @ w, dtype=np.float64).ravel()
+
+    def ranking(
+        self,
+        top_n: int = 50,
+        decay_days: float | None = None,
+        now: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Top skills in the rank_skills_by_demand format (demand share of the total)."""
+        scores = self.demand(decay_days, now)
+        total = scores.sum() or 1.0
+        return [
+            {"skill": self.vocabulary[j], "demand_score": round(float(scores[j] / total), 6), "rank": r + 1}
+            for r, j in enumerate(_top_indices(scores, top_n))
+        ]
+
+    def associations(self) -> SkillAssociations:
+        """Co-occurrence matrix X^T X (computed once and cached)."""
+        if self._associations is None:
+            x = self.matrix
+            cooccurrence = (x.T @ x).tocsr()
+            cooccurrence.sort_indices()
+            self._associations = SkillAssociations(self.vocabulary, cooccurrence, x.shape[0])
+        return self._associations
+
+    def related(self, skill: str, top_n: int = 10, measure: str = "jaccard") -> list[dict[str, Any]]:
+        """Top skills co-occurring with `skill`; see SkillAssociations.related."""
+        return self.associations().related(skill, top_n=top_n, measure=measure)
@@ -0,0 +1,361 @@
+"""
+Versioned binary on-disk format for MarketSnapshot, loaded with mmap.
+
+Layout (little-endian):
+    magic b"PWMS" | format u32 | header length u32 | crc32 u32 | header JSON | padding | sections
+
+The JSON header holds scalar fields, the topic table and, per section, its
+(offset, dtype, length). Sections are raw NumPy arrays aligned to 8 bytes:
+the vocabulary (UTF-8 blob plus offsets), counts, decayed scores, the market
+ranking, concatenated per-topic rankings, the skill co-occurrence CSR arrays and
+the per-day demand history matrix.
+A CRC32 over the whole file, computed with its own field zeroed, detects
+corruption of the header as well as the sections.
+
+Loading maps the file read-only and wraps the arrays in lazy views (skill names
+are decoded, and the co-occurrence matrix is wrapped, only when queried), so
+every process that loads the same file shares its pages and startup cost barely
+grows with the vocabulary; only the CRC32 pass touches every page. Writes go to
+a temporary file that is fsynced and then renamed over the target.
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from services.market_snapshot import MarketSnapshot
+
+MAGIC = b"PWMS"
+FORMAT_VERSION = 2
+_PREFIX = struct.Struct("<4sIII")
+_ALIGN = 8
+
+
+class _Vocabulary(Sequence[str]):
+    """Skill names decoded on access from a UTF-8 blob + offsets."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray) -> None:
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+
+class RankingView(Sequence[tuple[str, float]]):
+    """(skill, demand_score) pairs backed by mapped id/score arrays; slicing is O(k)."""
+
+    def __init__(self, vocab: _Vocabulary, ids: np.ndarray, scores: np.ndarray) -> None:
+        self._vocab = vocab
+        self._ids = ids
+        self._scores = scores
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return (self._vocab[int(self._ids[i])], float(self._scores[i]))
+
+
+class _ArrayMapping(Mapping[str, Any]):
+    """skill -> value over a vocabulary-aligned array; the name index is built on first lookup."""
+
+    def __init__(self, vocab: _Vocabulary, values: np.ndarray, cast: type) -> None:
+        self._vocab = vocab
+        self._values = values
+        self._cast = cast
+        self._index: dict[str, int] | None = None
+
+    def _ids(self) -> dict[str, int]:
+        if self._index is None:
+            self._index = {skill: i for i, skill in enumerate(self._vocab)}
+        return self._index
+
+    def __getitem__(self, skill: str) -> Any:
+        return self._cast(self._values[self._ids()[skill]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._vocab)
+
+    def __len__(self) -> int:
+        return len(self._vocab)
+
+
+class _MappedAssociations:
+    """SkillAssociations over the mapped co-occurrence arrays, built on the first query."""
+
+    def __init__(self, vocab: _Vocabulary, arrays: tuple[np.ndarray, np.ndarray, np.ndarray], n_listings: int) -> None:
+        self._vocab = vocab
+        self._arrays = arrays
+        self.n_listings = n_listings
+        self._associations: Any = None
+
+    def _load(self) -> Any:
+        if self._associations is None:
+            from scipy import sparse
+
+            from services.skill_matrix import SkillAssociations
+
+            n = len(self._vocab)
+            matrix = sparse.csr_matrix(self._arrays, shape=(n, n), copy=False)
+            self._associations = SkillAssociations(self._vocab, matrix, self.n_listings)
+        return self._associations
+
+    @property
+    def vocabulary(self) -> list[str]:
+        return self._load().vocabulary
+
+    @property
+    def cooccurrence(self) -> Any:
+        return self._load().cooccurrence
+
+    def related(self, skill: str, top_n: int = 10, measure: str = "jaccard") -> list[dict[str, Any]]:
+        return self._load().related(skill, top_n=top_n, measure=measure)
+
+
+def _section_layout(arrays: dict[str, np.ndarray], start: int) -> tuple[dict[str, list], int]:
+    layout: dict[str, list] = {}
+    offset = start
+    for name, arr in arrays.items():
+        offset = -(-offset // _ALIGN) * _ALIGN
+        layout[name] = [offset, arr.dtype.str, int(arr.size)]
+        offset += arr.nbytes
+    return layout, offset
+
+
+def _encode_vocabulary(names: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def write_snapshot(path: str, snapshot: MarketSnapshot) -> int:
+    """Serialize a snapshot atomically; returns the file size in bytes."""
+    vocab = list(snapshot.skill_counts)
+    ids = {skill: i for i, skill in enumerate(vocab)}
+    blob, offsets = _encode_vocabulary(vocab)
+    decayed = snapshot.decayed_scores
+
+    arrays: dict[str, np.ndarray] = {
+        "vocab_blob": blob,
+        "vocab_offsets": offsets,
+        "counts": np.array([snapshot.skill_counts[s] for s in vocab], dtype=np.int64),
+        "decayed": np.array([decayed.get(s, 0.0) for s in vocab], dtype=np.float64),
+        "ranking_ids": np.array([ids[s] for s, _ in snapshot.ranking], dtype=np.int32),
+        "ranking_scores": np.array([score for _, score in snapshot.ranking], dtype=np.float64),
+    }
+    topics: list[list[Any]] = []
+    topic_ids: list[int] = []
+    topic_scores: list[float] = []
+    for topic, ranking in snapshot.topic_rankings.items():
+        start = len(topic_ids)
+        topic_ids.extend(ids[s] for s, _ in ranking)
+        topic_scores.extend(score for _, score in ranking)
+        topics.append([topic, start, len(topic_ids), int(snapshot.topic_listings.get(topic, 0))])
+    arrays["topic_ids"] = np.array(topic_ids, dtype=np.int32)
+    arrays["topic_scores"] = np.array(topic_scores, dtype=np.float64)
+
+    n_listings = None
+    assoc = snapshot.associations
+    if assoc is not None:
+        # Co-occurrence columns are re-indexed from the association vocabulary to ours
+        remap = np.array([ids.get(s, -1) for s in assoc.vocabulary], dtype=np.int64)
+        coo = assoc.cooccurrence.tocoo()
+        keep = (remap[coo.row] >= 0) & (remap[coo.col] >= 0)
+        rows, cols = remap[coo.row[keep]], remap[coo.col[keep]]
+        order = np.lexsort((cols, rows))
+        # int32 throughout (while nnz fits) so scipy wraps the mapped arrays without copying
+        index_dtype = np.int32 if rows.size < 2**31 else np.int64
+        indptr = np.zeros(len(vocab) + 1, dtype=index_dtype)
+        np.cumsum(np.bincount(rows, minlength=len(vocab)), out=indptr[1:])
+        arrays["cooc_indptr"] = indptr
+        arrays["cooc_indices"] = cols[order].astype(index_dtype)
+        arrays["cooc_data"] = coo.data[keep][order].astype(np.float32)
+        n_listings = assoc.n_listings
+
+    history = None
+    if snapshot.history is not None:
+        hist = snapshot.history
+        arrays["history_vocab_blob"], arrays["history_vocab_offsets"] = _encode_vocabulary(hist.vocabulary)
+        arrays["history_counts"] = np.ascontiguousarray(hist.counts, dtype=np.int32).ravel()
+        history = {"days": hist.days, "end_day": hist.end_day}
+
+    header: dict[str, Any] = {
+        "version": snapshot.version,
+        "created_at": snapshot.created_at.isoformat(),
+        "listings_count": snapshot.listings_count,
+        "decay_days": snapshot.decay_days,
+        "build_time_ms": snapshot.build_time_ms,
+        "topics": topics,
+        "cooc_n_listings": n_listings,
+        "history": history,
+    }
+    # The header encodes the section offsets, which depend on the header length:
+    # lay out once with a placeholder, then pad the header to the reserved size.
+    header["sections"], _ = _section_layout(arrays, 0)
+    reserved = len(json.dumps(header).encode("utf-8")) + 256
+    data_start = -(-(_PREFIX.size + reserved) // _ALIGN) * _ALIGN
+    header["sections"], end = _section_layout(arrays, data_start)
+
+    payload = bytearray(end - data_start)
+    for name, arr in arrays.items():
+        offset = header["sections"][name][0] - data_start
+        payload[offset:offset + arr.nbytes] = arr.tobytes()
+    header_bytes = json.dumps(header).encode("utf-8").ljust(reserved)
+    padding = b"\0" * (data_start - _PREFIX.size - reserved)
+    crc = zlib.crc32(payload, zlib.crc32(_PREFIX.pack(MAGIC, FORMAT_VERSION, reserved, 0) + header_bytes + padding))
+
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, reserved, crc))
+        f.write(header_bytes)
+        f.write(padding)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return end
+
+
+class SnapshotLoadError(ValueError):
+    """The snapshot file is missing, corrupt, from another format version, or stale."""
+
+
+def load_snapshot(
+    path: str,
+    max_age_s: float | None = None,
+    decay_days: float | None = None,
+    verify_checksum: bool = True,
+) -> MarketSnapshot:
+    """
+    Map a snapshot file and return a MarketSnapshot backed by its pages.
+
+    Raises SnapshotLoadError if the file is unreadable, fails validation, is older
+    than max_age_s, or was built with a different decay_days.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError as e:
+        raise SnapshotLoadError(f"Cannot open market snapshot {path}: {e}") from e
+    try:
+        size = os.fstat(fd).st_size
+        if size < _PREFIX.size:
+            raise SnapshotLoadError(f"Market snapshot {path} is truncated")
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+    try:
+        return _read_snapshot(mm, path, size, max_age_s, decay_days, verify_checksum)
+    except SnapshotLoadError as e:
+        error = e
+    except (KeyError, TypeError, IndexError, ValueError, AttributeError) as e:
+        error = SnapshotLoadError(f"Market snapshot {path} has a corrupt header: {e!r}")
+        error.__cause__ = e
+    # The failed frames may hold array views of the map; drop them so it can be closed
+    error.with_traceback(None)
+    if error.__cause__ is not None:
+        error.__cause__.with_traceback(None)
+    try:
+        mm.close()
+    except BufferError:  # a view is still referenced elsewhere; the map is freed along with it
+        pass
+    raise error
+
+
+def _read_snapshot(
+    mm: mmap.mmap,
+    path: str,
+    size: int,
+    max_age_s: float | None,
+    decay_days: float | None,
+    verify_checksum: bool,
+) -> MarketSnapshot:
+    magic, fmt, header_len, crc = _PREFIX.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise SnapshotLoadError(f"{path} is not a market snapshot")
+    if fmt != FORMAT_VERSION:
+        raise SnapshotLoadError(f"Market snapshot {path} has format {fmt}, expected {FORMAT_VERSION}")
+    if verify_checksum:
+        with memoryview(mm) as view:
+            actual = zlib.crc32(view[_PREFIX.size:], zlib.crc32(_PREFIX.pack(magic, fmt, header_len, 0)))
+        if actual != crc:
+            raise SnapshotLoadError(f"Market snapshot {path} failed its checksum")
+    header = json.loads(bytes(mm[_PREFIX.size:_PREFIX.size + header_len]))
+    created_at = datetime.fromisoformat(header["created_at"])
+    sections = header["sections"]
+
+    age = (datetime.utcnow() - created_at).total_seconds()
+    if max_age_s is not None and age > max_age_s:
+        raise SnapshotLoadError(f"Market snapshot {path} is stale ({age:.0f}s old, max {max_age_s:.0f}s)")
+    if (header.get("decay_days") or None) != (decay_days or None):
+        raise SnapshotLoadError(
+            f"Market snapshot {path} was built with decay_days={header.get('decay_days')}, expected {decay_days}"
+        )
+
+    end = max((s[0] + np.dtype(s[1]).itemsize * s[2] for s in sections.values()), default=0)
+    if end > size:
+        raise SnapshotLoadError(f"Market snapshot {path} is truncated ({size} of {end} bytes)")
+
+    def section(name: str) -> np.ndarray:
+        offset, dtype, count = sections[name]
+        return np.frombuffer(mm, dtype=np.dtype(dtype), count=count, offset=offset)
+
+    vocab = _Vocabulary(section("vocab_blob"), section("vocab_offsets"))
+    topic_ids, topic_scores = section("topic_ids"), section("topic_scores")
+    topic_rankings = {
+        topic: RankingView(vocab, topic_ids[start:stop], topic_scores[start:stop])
+        for topic, start, stop, _ in header["topics"]
+    }
+    topic_listings = {topic: n for topic, _, _, n in header["topics"]}
+
+    associations = None
+    if "cooc_indptr" in sections:
+        associations = _MappedAssociations(
+            vocab,
+            (section("cooc_data"), section("cooc_indices"), section("cooc_indptr")),
+            header["cooc_n_listings"],
+        )
+
+    history = None
+    if header.get("history"):
+        from services.skill_history import SkillHistoryView
+
+        days = int(header["history"]["days"])
+        history = SkillHistoryView(
+            _Vocabulary(section("history_vocab_blob"), section("history_vocab_offsets")),
+            section("history_counts").reshape(-1, days),
+            int(header["history"]["end_day"]),
+        )
+
+    return MarketSnapshot(
+        version=int(header["version"]),
+        created_at=created_at,
+        listings_count=int(header["listings_count"]),
+        skill_counts=_ArrayMapping(vocab, section("counts"), int),
+        ranking=RankingView(vocab, section("ranking_ids"), section("ranking_scores")),
+        topic_rankings=MappingProxyType(topic_rankings),
+        topic_listings=MappingProxyType(topic_listings),
+        decayed_scores=_ArrayMapping(vocab, section("decayed"), float),
+        decay_days=header.get("decay_days"),
+        associations=associations,
+        history=history,
+        build_time_ms=float(header.get("build_time_ms") or 0.0),
+        extra=MappingProxyType({"source": path, "size_bytes": size}),
+    )
@@ -0,0 +1,123 @@
+"""
+Sparse learning path step x skill matrix: which dictionary skills each roadmap
+step teaches (matched in its title and description). Scoring a topic's steps
+against market demand is one sparse matrix-vector product over that topic's
+rows, so it runs on every roadmap request.
+"""
+
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from services.learning_paths import merge_topics, topic_key
+from services.skill_matcher import SkillMatcher, get_skill_matcher
+
+STEP_ORDERS = ("catalog", "market")
+
+
+class StepSkillMatrix:
+    """
+    Binary CSR matrix S (steps x skills) over the matcher's canonical skills.
+    Steps of a topic are contiguous rows, in catalog order.
+    """
+
+    def __init__(
+        self,
+        topics: Mapping[str, Sequence[dict[str, Any]]],
+        matcher: SkillMatcher | None = None,
+    ) -> None:
+        matcher = matcher or get_skill_matcher()
+        self.vocabulary = matcher.skills
+        self._ids = {skill: j for j, skill in enumerate(self.vocabulary)}
+        self._names: dict[str, str] = {}
+        self._ranges: dict[str, tuple[int, int]] = {}
+        self._steps: list[tuple[int, str, tuple[str, ...]]] = []
+        indptr = [0]
+        indices: list[int] = []
+        for name, steps in topics.items():
+            self._names[topic_key(name)] = name
+            start = len(self._steps)
+            for position, step in enumerate(steps, start=1):
+                title = str(step.get("title") or "")
+                skills = tuple(matcher.extract(f"{title}\n{step.get('description') or ''}"))
+                self._steps.append((int(step.get("step") or position), title, skills))
+                indices.extend(sorted(self._ids[s] for s in skills))
+                indptr.append(len(indices))
+            self._ranges[name] = (start, len(self._steps))
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(self._steps), len(self.vocabulary)),
+        )
+
+    @classmethod
+    def from_learning_paths(
+        cls,
+        learning_paths: list[dict[str, Any]],
+        matcher: SkillMatcher | None = None,
+    ) -> "StepSkillMatrix":
+        return cls(merge_topics(learning_paths), matcher)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.matrix.shape
+
+    def resolve(self, topic: str | None) -> str | None:
+        """Catalog name of a topic (case/whitespace-insensitive), or None if unknown."""
+        return self._names.get(topic_key(topic)) if topic else None
+
+    def demand_vector(self, ranking: Iterable[tuple[str, float]]) -> np.ndarray:
+        """Dense demand over the vocabulary from (skill, demand_score) pairs; unknown skills are ignored."""
+        demand = np.zeros(len(self.vocabulary), dtype=np.float64)
+        ids = self._ids
+        for skill, score in ranking:
+            j = ids.get(skill)
+            if j is not None:
+                demand[j] = score
+        return demand
+
+    def score(self, topic: str, demand: np.ndarray) -> np.ndarray | None:
+        """Market score of each step of a topic (sum of its skills' demand), or None if unknown."""
+        name = self.resolve(topic)
+        if name is None:
+            return None
+        start, end = self._ranges[name]
+        return self.matrix[start:end] @ demand
+
+    def rank_steps(
+        self,
+        topic: str,
+        demand: np.ndarray,
+        top_skills: Iterable[str] = (),
+        order: str = "catalog",
+    ) -> list[dict[str, Any]] | None:
+        """
+        A topic's steps as {"step", "title", "market_score", "market_skills", "high_demand"}.
+
+        market_skills lists the step's skills with nonzero demand, highest first;
+        high_demand flags steps teaching any of top_skills. order="market" sorts
+        steps by market_score (stable, so ties keep catalog order).
+        """
+        if order not in STEP_ORDERS:
+            raise ValueError(f"Unknown step order {order!r}; expected one of {STEP_ORDERS}")
+        scores = self.score(topic, demand)
+        if scores is None:
+            return None
+        start, _ = self._ranges[self.resolve(topic)]
+        top = set(top_skills)
+        positions = np.argsort(-scores, kind="stable") if order == "market" else range(len(scores))
+        out = []
+        for k in positions:
+            step, title, skills = self._steps[start + k]
+            weighted = sorted(
+                ((s, float(demand[self._ids[s]])) for s in skills if demand[self._ids[s]] > 0),
+                key=lambda sw: -sw[1],
+            )
+            out.append({
+                "step": step,
+                "title": title,
+                "market_score": round(float(scores[k]), 6),
+                "market_skills": [s for s, _ in weighted],
+                "high_demand": any(s in top for s in skills),
+            })
+        return out
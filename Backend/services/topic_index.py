@@ -0,0 +1,143 @@
+"""
+Topic-partitioned skill demand: maps each learning path topic to the skills its
+roadmap teaches (its profile), and maintains per-topic skill counts over the job
+listings that belong to the topic, so topic rankings never scan the whole market.
+
+Broad skills ("python", "security") appear in many profiles and say little about
+which topic a listing is for, so each profile skill is weighted by its inverse
+document frequency across topics, scaled so a skill in exactly one profile (or
+named in the topic itself, like "docker" for Docker) weighs 1. A listing joins a
+topic when the weights of the profile skills it requires add up to min_score.
+"""
+
+import math
+from collections import Counter
+from typing import Any, Iterable, Mapping
+
+from services.learning_paths import step_text, topic_key
+from services.skill_demand_analyzer import SkillFrequencyIndex, rank_skills_by_demand
+from services.skill_matcher import SkillMatcher, get_skill_matcher
+
+
+class TopicSkillIndex:
+    """
+    Inverted index skill -> (topic, weight) built from topic profiles, plus one
+    SkillFrequencyIndex per topic. A listing joins every topic whose matching
+    profile skills weigh at least min_score in total; add/remove cost
+    O(skills * topics per skill).
+    """
+
+    def __init__(
+        self,
+        profiles: Mapping[str, Iterable[str]],
+        decay_days: float | None = None,
+        named: Mapping[str, Iterable[str]] | None = None,
+        min_score: float = 1.0,
+    ) -> None:
+        self._names: dict[str, str] = {}
+        self._profiles: dict[str, frozenset[str]] = {}
+        self._named: dict[str, frozenset[str]] = {}
+        for topic, skills in profiles.items():
+            # Topics listed more than once (e.g. "Docker") share one profile
+            name = self._names.setdefault(topic_key(topic), topic)
+            self._profiles[name] = self._profiles.get(name, frozenset()) | frozenset(skills)
+        for topic, skills in (named or {}).items():
+            name = self._names.get(topic_key(topic))
+            if name is not None:
+                self._named[name] = self._named.get(name, frozenset()) | frozenset(skills)
+        self._min_score = min_score
+        n_topics = len(self._profiles)
+        topic_freq = Counter(skill for skills in self._profiles.values() for skill in skills)
+        skill_topics: dict[str, list[tuple[str, float]]] = {}
+        for topic, skills in self._profiles.items():
+            named_skills = self._named.get(topic, frozenset())
+            for skill in skills:
+                if skill in named_skills or n_topics < 2:
+                    weight = 1.0
+                else:
+                    weight = math.log(n_topics / topic_freq[skill]) / math.log(n_topics)
+                skill_topics.setdefault(skill, []).append((topic, weight))
+        self._skill_topics = {k: tuple(v) for k, v in skill_topics.items()}
+        self._indexes = {topic: SkillFrequencyIndex(decay_days) for topic in self._profiles}
+        self._listing_topics: dict[str, tuple[str, ...]] = {}
+
+    @classmethod
+    def from_learning_paths(
+        cls,
+        learning_paths: list[dict[str, Any]],
+        matcher: SkillMatcher | None = None,
+        decay_days: float | None = None,
+        min_score: float = 1.0,
+    ) -> "TopicSkillIndex":
+        """Build topic profiles by matching dictionary skills in each topic's name and roadmap steps."""
+        matcher = matcher or get_skill_matcher()
+        profiles: dict[str, set[str]] = {}
+        named: dict[str, set[str]] = {}
+        for path in learning_paths:
+            topic = str(path.get("topic") or "").strip()
+            if not topic:
+                continue
+            text = "\n".join([topic, *(step_text(step) for step in path.get("roadmap") or [])])
+            profiles.setdefault(topic, set()).update(matcher.extract(text))
+            named.setdefault(topic, set()).update(matcher.extract(topic))
+        return cls(profiles, decay_days=decay_days, named=named, min_score=min_score)
+
+    @property
+    def topics(self) -> list[str]:
+        return list(self._profiles)
+
+    def resolve(self, topic: str | None) -> str | None:
+        """Catalog name of a topic (case/whitespace-insensitive), or None if unknown."""
+        return self._names.get(topic_key(topic)) if topic else None
+
+    def profile(self, topic: str) -> frozenset[str]:
+        return self._profiles.get(self.resolve(topic) or "", frozenset())
+
+    def topics_for(self, skills: Iterable[str]) -> tuple[str, ...]:
+        """Topics whose profile skills among the given ones weigh at least min_score."""
+        scores: dict[str, float] = {}
+        for skill in dict.fromkeys(skills):
+            for topic, weight in self._skill_topics.get(skill, ()):
+                scores[topic] = scores.get(topic, 0.0) + weight
+        # Tolerance so a single weight-1 skill always meets min_score=1 despite rounding
+        return tuple(topic for topic, score in scores.items() if score >= self._min_score - 1e-9)
+
+    def add(self, listing_id: str, skills: Iterable[str], posted_at: float | None = None) -> None:
+        """Index a listing under its topics; re-adding an id moves it between topics as needed."""
+        skills = tuple(dict.fromkeys(skills))
+        topics = self.topics_for(skills)
+        for topic in self._listing_topics.get(listing_id, ()):
+            if topic not in topics:
+                self._indexes[topic].remove(listing_id)
+        for topic in topics:
+            self._indexes[topic].add(listing_id, skills, posted_at)
+        if topics:
+            self._listing_topics[listing_id] = topics
+        else:
+            self._listing_topics.pop(listing_id, None)
+
+    def remove(self, listing_id: str) -> bool:
+        topics = self._listing_topics.pop(listing_id, None)
+        if topics is None:
+            return False
+        for topic in topics:
+            self._indexes[topic].remove(listing_id)
+        return True
+
+    def listings_count(self, topic: str) -> int:
+        index = self._indexes.get(self.resolve(topic) or "")
+        return len(index) if index is not None else 0
+
+    def rank(self, topic: str, top_n: int = 50, now: float | None = None) -> list[dict[str, Any]]:
+        """Skill demand ranking among the listings of one topic."""
+        index = self._indexes.get(self.resolve(topic) or "")
+        if index is None:
+            return []
+        return rank_skills_by_demand(index.counts(), top_n=top_n, decayed=index.decayed, now=now)
+
+    def rankings(self, now: float | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Full ranking for every topic (O(topics * vocabulary)); used to precompute snapshots."""
+        return {
+            topic: self.rank(topic, top_n=index.vocabulary_size, now=now)
+            for topic, index in self._indexes.items()
+        }
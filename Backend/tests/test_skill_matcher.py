@@ -0,0 +1,39 @@
+import pytest
+
+from services.skill_matcher import SKILL_ALIASES, SkillMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher() -> SkillMatcher:
+    return SkillMatcher(SKILL_ALIASES)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        # adjacent entries are all emitted, including everyday-word skills listed together
+        ("python go rust", ["python", "go", "rust"]),
+        ("Python, Go, Rust", ["python", "go", "rust"]),
+        # overlapping entries are all emitted
+        ("Data Structures and Algorithms", ["data structures", "algorithms"]),
+        ("React Native and REST APIs", ["react native", "react", "rest api"]),
+        # an entry inside a longer one for the same skill is reported once
+        ("Spring Boot microservices", ["spring"]),
+        ("RESTful APIs, unit testing", ["rest api", "testing"]),
+    ],
+)
+def test_extract_emits_every_entry(matcher, text, expected):
+    assert matcher.extract(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("We will go to the park", []),
+        ("Rust on the car. Spring is here.", []),
+        ("Learn Go for backend services", ["go"]),
+        ("a rust developer", ["rust"]),
+    ],
+)
+def test_everyday_words_need_technical_context(matcher, text, expected):
+    assert matcher.extract(text) == expected
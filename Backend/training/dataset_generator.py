@@ -4,9 +4,13 @@ Produces (engagement, velocity, mastery, credibility, experience_level) -> diffi
 Difficulty: 0=beginner, 1=intermediate, 2=advanced.
 """
 
+from typing import TYPE_CHECKING
+
 import numpy as np
-from torch import Tensor
-import torch
+
+if TYPE_CHECKING:
+    import torch
+    from torch import Tensor
 
 
 def generate_synthetic_dataset(
@@ -59,9 +63,11 @@ def generate_synthetic_dataset(
 
 
 def to_tensor(
-    X: np.ndarray, y: np.ndarray, device: torch.device
-) -> tuple[Tensor, Tensor]:
+    X: np.ndarray, y: np.ndarray, device: "torch.device"
+) -> tuple["Tensor", "Tensor"]:
     """Convert numpy arrays to PyTorch tensors on given device."""
+    import torch
+
     X_t = torch.tensor(X, dtype=torch.float32, device=device)
     y_t = torch.tensor(y, dtype=torch.int64, device=device)
     return X_t, y_t
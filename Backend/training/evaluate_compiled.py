@@ -0,0 +1,102 @@
+"""
+Compare the compiled inference plan (fp32 and int8) against the current torch
+inference path on the synthetic validation split used by training/train.py.
+
+Reports accuracy, agreement with the torch path, max probability difference,
+single-row latency and batch throughput for each variant.
+
+Usage:
+    python training/evaluate_compiled.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.personalization_service import PersonalizationService
+from training.dataset_generator import generate_synthetic_dataset
+
+
+def validation_split(samples: int, seed: int, val_ratio: float = 0.15) -> tuple[np.ndarray, np.ndarray]:
+    """Reproduce the train/val split of training/train.py and return (X_val, y_val) unscaled."""
+    from sklearn.model_selection import train_test_split
+
+    X, y = generate_synthetic_dataset(n_samples=samples, seed=seed)
+    _, X_val, _, y_val = train_test_split(
+        X, y, test_size=val_ratio, random_state=seed, stratify=y
+    )
+    return X_val.astype(np.float32), y_val
+
+
+def time_single_row(svc: PersonalizationService, X: np.ndarray, repeats: int) -> float:
+    """Mean predict() latency in microseconds over repeats passes of X."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for row in X:
+            svc.predict(*row[:4], int(row[4]))
+    return (time.perf_counter() - start) / (repeats * len(X)) * 1e6
+
+
+def time_batch(svc: PersonalizationService, X: np.ndarray, repeats: int) -> float:
+    """predict_batch() throughput in rows per second."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        svc.predict_batch(X)
+    return repeats * len(X) / (time.perf_counter() - start)
+
+
+def evaluate_variant(svc: PersonalizationService, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    results = svc.predict_batch(X)
+    pred = np.array([r["roadmap_difficulty"] for r in results])
+    probs = np.array([r["probabilities"] for r in results])
+    return pred, probs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate compiled inference against the torch path")
+    parser.add_argument("--samples", type=int, default=2000, help="Must match the training run")
+    parser.add_argument("--seed", type=int, default=42, help="Must match the training run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--batch-repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    X_val, y_val = validation_split(args.samples, args.seed)
+    variants = {
+        "torch": PersonalizationService(backend="torch", cache_size=0),
+        "compiled_fp32": PersonalizationService(backend="compiled", int8_weights=False, cache_size=0),
+        "compiled_int8": PersonalizationService(backend="compiled", int8_weights=True, cache_size=0),
+    }
+
+    baseline_pred, baseline_probs = evaluate_variant(variants["torch"], X_val)
+    baseline_acc = float((baseline_pred == y_val).mean())
+    baseline_latency = time_single_row(variants["torch"], X_val, args.repeats)
+    baseline_tput = time_batch(variants["torch"], X_val, args.batch_repeats)
+
+    print(f"Validation rows: {len(X_val)}")
+    header = f"{'variant':<15}{'accuracy':>10}{'d_acc':>9}{'agree':>8}{'max_dp':>10}{'us/row':>9}{'d_lat':>9}{'rows/s':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, svc in variants.items():
+        if name == "torch":
+            pred, probs, latency, tput = baseline_pred, baseline_probs, baseline_latency, baseline_tput
+        else:
+            pred, probs = evaluate_variant(svc, X_val)
+            latency = time_single_row(svc, X_val, args.repeats)
+            tput = time_batch(svc, X_val, args.batch_repeats)
+        acc = float((pred == y_val).mean())
+        agree = float((pred == baseline_pred).mean())
+        max_dp = float(np.abs(probs - baseline_probs).max())
+        print(
+            f"{name:<15}{acc:>10.4f}{acc - baseline_acc:>+9.4f}{agree:>8.4f}{max_dp:>10.2e}"
+            f"{latency:>9.1f}{(latency - baseline_latency) / baseline_latency:>+9.1%}{tput:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
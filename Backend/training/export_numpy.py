@@ -0,0 +1,115 @@
+"""
+Export the PyTorch roadmap model checkpoint (and scaler) to a NumPy .npz archive
+for the torch-free inference backend, and check output parity against torch.
+
+Usage:
+    python training/export_numpy.py                 # export roadmap_model.npz
+    python training/export_numpy.py --check-only    # parity check of an existing export
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import torch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.numpy_model import (
+    LAYER_NAMES,
+    SCALER_EPS,
+    SCALER_MEAN_KEY,
+    SCALER_SCALE_KEY,
+    VERSION_KEY,
+    NumpyRoadmapModel,
+)
+from models.roadmap_model import RoadmapDifficultyModel
+from training.dataset_generator import generate_synthetic_dataset
+
+
+def export_numpy_weights(model_path: str, scaler_path: str, out_path: str) -> None:
+    """Write fc1/fc2/fc3 weights and biases, scaler mean/scale and model version to out_path (.npz)."""
+    checkpoint = torch.load(model_path, map_location="cpu", weights_only=True)
+    state = checkpoint["model_state_dict"]
+    arrays: dict[str, np.ndarray] = {}
+    version = (checkpoint.get("model_config") or {}).get("version")
+    if version:
+        arrays[VERSION_KEY] = np.array(str(version))
+    for name in LAYER_NAMES:
+        arrays[f"{name}.weight"] = state[f"{name}.weight"].numpy().astype(np.float32)
+        arrays[f"{name}.bias"] = state[f"{name}.bias"].numpy().astype(np.float32)
+    if os.path.isfile(scaler_path):
+        scaler_data = torch.load(scaler_path, map_location="cpu", weights_only=False)
+        arrays[SCALER_MEAN_KEY] = np.asarray(scaler_data["mean"], dtype=np.float64)
+        arrays[SCALER_SCALE_KEY] = np.asarray(scaler_data["scale"], dtype=np.float64)
+
+    tmp_path = out_path + ".tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, out_path)
+
+
+def check_parity(
+    model_path: str,
+    npz_path: str,
+    n_samples: int = 5000,
+    seed: int = 7,
+    atol: float = 1e-5,
+) -> dict[str, float]:
+    """
+    Compare torch and NumPy probabilities/classes on a synthetic dataset.
+
+    Returns dict with max_abs_diff and class_agreement; raises AssertionError on mismatch.
+    """
+    checkpoint = torch.load(model_path, map_location="cpu", weights_only=True)
+    torch_model = RoadmapDifficultyModel()
+    torch_model.load_state_dict(checkpoint["model_state_dict"])
+    torch_model.eval()
+    np_model, mean, scale = NumpyRoadmapModel.from_npz(npz_path)
+    if mean is None or scale is None:
+        mean, scale = np.zeros(5), np.ones(5)
+
+    X, _ = generate_synthetic_dataset(n_samples=n_samples, seed=seed)
+    x = ((X - mean) / (scale + SCALER_EPS)).astype(np.float32)
+    with torch.no_grad():
+        t = torch.tensor(x, dtype=torch.float32)
+        torch_probs = torch_model.predict_proba(t).numpy()
+        torch_pred = torch_model.predict_class(t).numpy()
+    np_probs = np_model.predict_proba(x)
+    np_pred = np_model.predict_class(x)
+
+    max_abs_diff = float(np.abs(torch_probs - np_probs).max())
+    agreement = float((torch_pred == np_pred).mean())
+    assert max_abs_diff <= atol, f"Probability mismatch: max abs diff {max_abs_diff:.2e} > {atol:.0e}"
+    assert agreement == 1.0, f"Class mismatch: agreement {agreement:.4%}"
+    return {"max_abs_diff": max_abs_diff, "class_agreement": agreement}
+
+
+def main() -> None:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Export roadmap model weights for NumPy inference")
+    parser.add_argument("--model", type=str, default=os.path.join(root, "roadmap_model.pt"))
+    parser.add_argument("--scaler", type=str, default=os.path.join(root, "scaler.pt"))
+    parser.add_argument("--out", type=str, default=os.path.join(root, "roadmap_model.npz"))
+    parser.add_argument("--samples", type=int, default=5000, help="Parity check sample count")
+    parser.add_argument("--atol", type=float, default=1e-5)
+    parser.add_argument("--check-only", action="store_true", help="Skip export, only run parity check")
+    args = parser.parse_args()
+
+    if not args.check_only:
+        export_numpy_weights(args.model, args.scaler, args.out)
+        print(f"NumPy weights saved to {args.out}")
+    try:
+        result = check_parity(args.model, args.out, n_samples=args.samples, atol=args.atol)
+    except AssertionError as e:
+        print(f"Parity check FAILED: {e}")
+        sys.exit(1)
+    print(
+        f"Parity check passed: max_abs_diff={result['max_abs_diff']:.2e} "
+        f"class_agreement={result['class_agreement']:.4f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
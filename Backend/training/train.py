@@ -1,12 +1,14 @@
 """
 Training script for the roadmap difficulty neural network.
-Saves model (roadmap_model.pt) and scaler state (scaler.pt).
+Saves model (roadmap_model.pt), scaler state (scaler.pt) and the NumPy-backend
+export (roadmap_model.npz).
 """
 
 import argparse
 import json
 import os
 import sys
+from datetime import datetime
 
 import numpy as np
 import torch
@@ -18,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.roadmap_model import RoadmapDifficultyModel
 from training.dataset_generator import generate_synthetic_dataset, to_tensor
+from training.export_numpy import export_numpy_weights
 
 
 def get_device() -> torch.device:
@@ -117,7 +120,14 @@ def main() -> None:
     parser.add_argument("--lr", type=float, default=1e-3)
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--out-dir", type=str, default=None)
+    parser.add_argument(
+        "--version",
+        type=str,
+        default=None,
+        help="Model version recorded in the checkpoint (default: UTC timestamp)",
+    )
     args = parser.parse_args()
+    version = args.version or datetime.utcnow().strftime("%Y%m%d%H%M%S")
 
     out_dir = args.out_dir or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     os.makedirs(out_dir, exist_ok=True)
@@ -150,17 +160,21 @@ def main() -> None:
     scaler_path = os.path.join(out_dir, "scaler.pt")
     scaler_meta_path = os.path.join(out_dir, "scaler_meta.json")
 
+    # Write to temp files and rename so a running API's model watcher never sees a
+    # partially written artifact. The scaler goes first: the model file is the swap trigger.
+    torch.save(
+        {"mean": scaler_mean, "scale": scaler_scale},
+        scaler_path + ".tmp",
+    )
+    os.replace(scaler_path + ".tmp", scaler_path)
     torch.save(
         {
             "model_state_dict": model.cpu().state_dict(),
-            "model_config": {},
+            "model_config": {"version": version},
         },
-        model_path,
-    )
-    torch.save(
-        {"mean": scaler_mean, "scale": scaler_scale},
-        scaler_path,
+        model_path + ".tmp",
     )
+    os.replace(model_path + ".tmp", model_path)
     with open(scaler_meta_path, "w") as f:
         json.dump(
             {"mean": scaler_mean.tolist(), "scale": scaler_scale.tolist()},
@@ -168,8 +182,12 @@ def main() -> None:
             indent=2,
         )
 
-    print(f"Model saved to {model_path}")
+    numpy_weights_path = os.path.join(out_dir, "roadmap_model.npz")
+    export_numpy_weights(model_path, scaler_path, numpy_weights_path)
+
+    print(f"Model version {version} saved to {model_path}")
     print(f"Scaler saved to {scaler_path}")
+    print(f"NumPy weights saved to {numpy_weights_path}")
     print(f"Best validation accuracy: {best_val_acc:.4f}")
 
 